@@ -19,6 +19,11 @@ from app.models.category import Category
 from app.models.budget import Budget
 from app.models.income import Income
 from app.models.expense import Expense  # Import models for metadata
+from app.models.snapshot import PeriodSnapshot
+from app.models.sync import SyncTombstone
+from app.models.archive import ExpenseArchive
+from app.db.backfill import PROGRESS_TABLE
+from app.db.partitioning import is_partition_name
 
 config = context.config
 
@@ -27,12 +32,20 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Backfill checkpoints and date partitions live in the database but not in the models
+    if type_ == "table" and reflected and compare_to is None:
+        return name != PROGRESS_TABLE and not is_partition_name(name)
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = settings.DATABASE_URL
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -60,7 +73,7 @@ async def run_async_migrations() -> None:
     await connectable.dispose()
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
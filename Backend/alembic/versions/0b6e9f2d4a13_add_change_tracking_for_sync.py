@@ -0,0 +1,56 @@
+"""Add change tracking for delta sync
+
+Revision ID: 0b6e9f2d4a13
+Revises: f3a8d2c61b97
+Create Date: 2026-10-19 11:20:51.337092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e9f2d4a13'
+down_revision: Union[str, Sequence[str], None] = 'f3a8d2c61b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['expenses', 'incomes', 'categories', 'budgets']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ['expenses', 'categories', 'budgets']:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    # Existing rows keep change_seq = 0 and are delivered by the initial sync
+    for table in TABLES:
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(f'ix_{table}_user_change_seq', table, ['user_id', 'change_seq'], unique=False)
+
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.String(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_user_change_seq', 'sync_tombstones', ['user_id', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_tombstones_user_change_seq', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_user_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
+
+    for table in ['expenses', 'categories', 'budgets']:
+        op.drop_column(table, 'updated_at')
@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.db.backfill import backfill
+
 
 # revision identifiers, used by Alembic.
 revision: str = '34910275cc25'
@@ -18,6 +20,22 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def link_income_categories(conn, lower, upper) -> None:
+    params = {"lower": lower, "upper": upper}
+    conn.execute(sa.text(
+        "INSERT INTO categories (name, user_id, type) "
+        "SELECT DISTINCT i.source, i.user_id, 'income' FROM incomes i "
+        "WHERE i.id BETWEEN :lower AND :upper AND i.category_id IS NULL AND NOT EXISTS ("
+        "SELECT 1 FROM categories c WHERE c.user_id = i.user_id AND c.name = i.source AND c.type = 'income')"
+    ), params)
+    conn.execute(sa.text(
+        "UPDATE incomes SET category_id = ("
+        "SELECT min(c.id) FROM categories c "
+        "WHERE c.user_id = incomes.user_id AND c.name = incomes.source AND c.type = 'income') "
+        "WHERE id BETWEEN :lower AND :upper AND category_id IS NULL"
+    ), params)
+
+
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
@@ -28,57 +46,10 @@ def upgrade() -> None:
     op.add_column('incomes', sa.Column('category_id', sa.Integer(), nullable=True))
     op.create_foreign_key(None, 'incomes', 'categories', ['category_id'], ['id'])
     
-    # Data Migration: Create categories from income sources
-    bind = op.get_bind()
-    session = sa.orm.Session(bind=bind)
-    
-    # We need to reflect the tables to work with them
-    metadata = sa.MetaData()
-    metadata.reflect(bind=bind)
-    incomes_table = metadata.tables['incomes']
-    categories_table = metadata.tables['categories']
-    users_table = metadata.tables['users']
-    
-    # Get all incomes
-    incomes = session.execute(sa.select(incomes_table)).fetchall()
-    
-    # Process each income to link/create category
-    for income in incomes:
-        source = income.source
-        user_id = income.user_id
-        
-        # Check if category exists for this user and source (as 'income' type)
-        # Note: We query directly using SQL to be safe
-        existing_cat = session.execute(
-            sa.select(categories_table).where(
-                categories_table.c.name == source,
-                categories_table.c.user_id == user_id,
-                categories_table.c.type == 'income'
-            )
-        ).first()
-        
-        cat_id = None
-        if existing_cat:
-            cat_id = existing_cat.id
-        else:
-            # Create new category
-            result = session.execute(
-                categories_table.insert().values(
-                    name=source,
-                    user_id=user_id,
-                    type='income'
-                )
-            )
-            cat_id = result.inserted_primary_key[0]
-            
-        # Update income with category_id
-        session.execute(
-            incomes_table.update().where(
-                incomes_table.c.id == income.id
-            ).values(category_id=cat_id)
-        )
-            
-    session.commit()
+    # Data Migration: link every income to an income category named after its
+    # source, creating the missing ones, one batch of incomes at a time
+    backfill("incomes", process=link_income_categories, where="category_id IS NULL",
+             name="34910275cc25_income_categories")
     # ### end Alembic commands ###
 
 
@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.db.backfill import backfill
+
 
 # revision identifiers, used by Alembic.
 revision: str = '4f4eaea9a679'
@@ -35,7 +37,7 @@ def upgrade() -> None:
     )
     op.create_index(op.f('ix_incomes_user_id'), 'incomes', ['user_id'], unique=False)
     op.add_column('expenses', sa.Column('date', sa.DateTime(timezone=True), nullable=True))
-    op.execute("UPDATE expenses SET date = created_at")
+    backfill("expenses", "date = created_at", where="date IS NULL", name="4f4eaea9a679_expenses_date")
     op.alter_column('expenses', 'date', nullable=False)
     # ### end Alembic commands ###
 
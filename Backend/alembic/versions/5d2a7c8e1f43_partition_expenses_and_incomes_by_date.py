@@ -0,0 +1,40 @@
+"""Partition expenses and incomes by date
+
+Revision ID: 5d2a7c8e1f43
+Revises: 9c4e1f7b2a58
+Create Date: 2026-10-19 15:32:40.106214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+from app.db.partitioning import PARTITIONED_TABLES, convert_to_partitioned, convert_to_plain
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7c8e1f43'
+down_revision: Union[str, Sequence[str], None] = '9c4e1f7b2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL only. Both tables are rewritten under an exclusive lock, so
+    # run this in a maintenance window on large databases.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED_TABLES:
+        convert_to_partitioned(bind, table, settings.PARTITION_INTERVAL, settings.PARTITION_PREMAKE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED_TABLES:
+        convert_to_plain(bind, table)
@@ -0,0 +1,41 @@
+"""Add covering indexes for list endpoints
+
+Revision ID: 9c4e1f7b2a58
+Revises: 0b6e9f2d4a13
+Create Date: 2026-10-19 14:05:12.418530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.backfill import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1f7b2a58'
+down_revision: Union[str, Sequence[str], None] = '0b6e9f2d4a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lists filtered by user and ordered by date that ask for fields=id,date,amount,category_id
+    # can be answered with index-only scans
+    create_index_concurrently(
+        'ix_expenses_user_date_covering', 'expenses', ['user_id', 'date'], unique=False,
+        postgresql_include=['amount', 'category_id', 'id'],
+        postgresql_where=sa.text('is_deleted = false'),
+    )
+    create_index_concurrently(
+        'ix_incomes_user_date_covering', 'incomes', ['user_id', 'date'], unique=False,
+        postgresql_include=['amount', 'category_id', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_incomes_user_date_covering', 'incomes')
+    drop_index_concurrently('ix_expenses_user_date_covering', 'expenses')
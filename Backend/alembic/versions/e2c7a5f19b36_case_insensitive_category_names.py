@@ -0,0 +1,47 @@
+"""Case-insensitive unique category names
+
+Revision ID: e2c7a5f19b36
+Revises: b8f3e6a1d274
+Create Date: 2026-10-19 18:22:40.716204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.backfill import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a5f19b36'
+down_revision: Union[str, Sequence[str], None] = 'b8f3e6a1d274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Names that only differ in case were allowed by the old constraint (racing
+    # the API's ilike check). Keep the oldest and suffix the others with their id.
+    op.execute("""
+        UPDATE categories SET name = name || ' (' || id || ')'
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY user_id, type, lower(name) ORDER BY id) AS n
+                FROM categories
+            ) ranked
+            WHERE n > 1
+        )
+    """)
+    create_index_concurrently(
+        'uq_categories_user_type_lower_name', 'categories', ['user_id', 'type', sa.text('lower(name)')], unique=True
+    )
+    # Implied by the new index
+    op.drop_constraint('uq_category_name_type_user', 'categories', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('uq_category_name_type_user', 'categories', ['name', 'type', 'user_id'])
+    drop_index_concurrently('uq_categories_user_type_lower_name', 'categories')
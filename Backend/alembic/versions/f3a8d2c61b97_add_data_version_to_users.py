@@ -0,0 +1,28 @@
+"""Add data_version to users
+
+Revision ID: f3a8d2c61b97
+Revises: e7b1c4a9d052
+Create Date: 2026-10-19 10:03:27.904416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d2c61b97'
+down_revision: Union[str, Sequence[str], None] = 'e7b1c4a9d052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'data_version')
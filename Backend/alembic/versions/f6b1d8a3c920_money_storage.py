@@ -0,0 +1,47 @@
+"""Store amounts as integer cents when MONEY_STORAGE=cents
+
+Revision ID: f6b1d8a3c920
+Revises: e2c7a5f19b36
+Create Date: 2026-10-19 19:41:07.285316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.db.money import MONEY_COLUMNS, convert_money_storage
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b1d8a3c920'
+down_revision: Union[str, Sequence[str], None] = 'e2c7a5f19b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Opt-in: with the default MONEY_STORAGE=numeric nothing changes
+    if settings.MONEY_STORAGE != "cents" or op.get_context().dialect.name != "postgresql":
+        return
+    if op.get_context().as_sql:
+        for table in MONEY_COLUMNS:
+            op.execute(f'ALTER TABLE "{table}" ALTER COLUMN amount TYPE BIGINT USING round(amount * 100)::bigint')
+        return
+    convert_money_storage(op.get_bind(), "cents")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    if op.get_context().as_sql:
+        if settings.MONEY_STORAGE == "cents":
+            for table, precision in MONEY_COLUMNS.items():
+                op.execute(
+                    f'ALTER TABLE "{table}" ALTER COLUMN amount TYPE NUMERIC({precision}, 2) USING (amount / 100.0)::numeric'
+                )
+        return
+    convert_money_storage(op.get_bind(), "numeric")
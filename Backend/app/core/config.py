@@ -11,6 +11,39 @@ class Settings(BaseSettings):
     RESEND_API_KEY: str = ""
     RESEND_FROM_EMAIL: str = "Expense Manager <onboarding@resend.dev>"
     GOOGLE_CLIENT_ID: str = ""
+    SNAPSHOT_MAX_AGE_SECONDS: int = 86400
+    N_PLUS_ONE_THRESHOLD: int = 5
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    SLOW_QUERY_EXPLAIN: bool = False  # EXPLAIN (ANALYZE, BUFFERS) slow SELECTs on PostgreSQL
+    METRICS_ENABLED: bool = False
+    METRICS_ALLOWED_IPS: list[str] = ["127.0.0.1", "::1"]
+    BCRYPT_WORKERS: int = 4
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL_MS: float = 100
+    LOOP_LAG_THRESHOLD_MS: float = 250
+    PROFILING_SECRET: str = ""  # empty disables on-demand profiling
+    PROFILING_INTERVAL_MS: float = 1
+    STREAM_YIELD_PER: int = 500  # rows per server-side cursor fetch in NDJSON list streams
+    PARTITION_INTERVAL: str = "year"  # "year" or "month"; ranges for partitioned expenses/incomes
+    PARTITION_PREMAKE: int = 2  # future partitions kept ready ahead of the current one
+    ARCHIVE_DELETED_AFTER_DAYS: int = 30  # soft-deleted expenses move to expenses_archive after this
+    ARCHIVE_HISTORY_AFTER_YEARS: int = 0  # also archive live expenses older than this many years; 0 = never
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_BATCH_PAUSE_MS: float = 200
+    CATEGORY_CACHE_TTL_SECONDS: float = 300  # entries are checked against data_version; this bounds writes made outside the API
+    CATEGORY_CACHE_MAX_USERS: int = 10000
+    LEDGER_CACHE_ENABLED: bool = False  # needs NumPy: dashboard aggregates from per-user arrays, see ledger_service
+    LEDGER_CACHE_TTL_SECONDS: float = 600  # full reload at least this often; changes in between are applied as deltas
+    LEDGER_CACHE_MAX_USERS: int = 1000
+    LEDGER_CACHE_MAX_ROWS: int = 2_000_000  # expenses + incomes across all users, ~30 bytes each
+    # Categories every new account starts with, by type
+    DEFAULT_CATEGORIES: dict[str, list[str]] = {
+        "expense": ["Food", "Transport", "Bills", "Entertainment", "Shopping"],
+        "income": [],
+    }
+    MONEY_STORAGE: str = "numeric"  # or "cents": amounts as BIGINT minor units, see app/db/money.py
+    PROVISION_BATCH_SIZE: int = 1000  # accounts per transaction in bulk provisioning
+    RATE_LIMIT_ENABLED: bool = True  # switch off only for local load tests
 
     class Config:
         env_file = ".env"
@@ -40,3 +40,12 @@ class BadRequestException(CustomException):
             status_code=400,
             details=details
         )
+
+class ConflictException(CustomException):
+    def __init__(self, message: str = "Conflict", details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            error_code="CONFLICT",
+            status_code=409,
+            details=details
+        )
@@ -0,0 +1,22 @@
+from typing import List, Optional, Sequence
+
+from app.core.exceptions import BadRequestException
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields=` parameter into the requested subset of
+    `allowed`, in `allowed` order. None means every field. Unknown names are
+    rejected before any query runs.
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown or not requested:
+        raise BadRequestException(
+            message=f"Unknown fields: {', '.join(unknown) or '(none given)'}",
+            details={"allowed": list(allowed)}
+        )
+    return [name for name in allowed if name in requested]
@@ -1,6 +1,7 @@
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.exceptions import CustomException
 from app.core.logging import logger
@@ -49,7 +50,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={
             "message": message,
             "error_code": "VALIDATION_ERROR",
-            "details": {"errors": details}
+            # Validator errors carry the raised exception in their ctx
+            "details": {"errors": jsonable_encoder(details)}
         }
     )
 
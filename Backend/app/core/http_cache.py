@@ -0,0 +1,64 @@
+import hashlib
+from datetime import date
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.core.responses import wants_ndjson
+from app.models.snapshot import PeriodSnapshot
+from app.models.user import User
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def snapshot_response(request: Request, snapshot: PeriodSnapshot) -> Response:
+    """Serve a closed-period snapshot with long-lived caching headers."""
+    headers = {
+        "ETag": f'"{snapshot.etag}"',
+        "Cache-Control": f"private, max-age={settings.SNAPSHOT_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request, headers["ETag"]):
+        record_cache("conditional_get", hit=True)
+        return Response(status_code=304, headers=headers)
+    record_cache("conditional_get", hit=False)
+    return JSONResponse(content=snapshot.payload, headers=headers)
+
+
+def version_etag(request: Request, user: User) -> str:
+    """
+    ETag for a read endpoint derived from the user's data version.
+    The URL covers the query parameters, today's date covers endpoints
+    whose output depends on the current day (e.g. the daily series), and
+    NDJSON streams get their own tag since they share URLs with the pages.
+    """
+    media = "ndjson" if wants_ndjson(request) else "json"
+    key = f"{request.url.path}?{request.url.query}|{media}|{user.id}|{user.data_version or 0}|{date.today()}"
+    return f'W/"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def not_modified(request: Request, response: Response, user: User) -> Optional[Response]:
+    """
+    Conditional GET for per-user data. Returns a 304 response when the
+    client's copy is current, otherwise sets the ETag on the outgoing
+    response and returns None so the endpoint builds the body.
+    """
+    etag = version_etag(request, user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept"}
+    if etag_matches(request, etag):
+        record_cache("conditional_get", hit=True)
+        return Response(status_code=304, headers=headers)
+    record_cache("conditional_get", hit=False)
+    response.headers.update(headers)
+    return None
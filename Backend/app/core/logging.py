@@ -9,6 +9,7 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Log file path
 LOG_FILE = os.path.join(LOGS_DIR, "app.log")
+SLOW_QUERY_LOG_FILE = os.path.join(LOGS_DIR, "slow_queries.log")
 
 def setup_logging():
     """
@@ -46,5 +47,26 @@ def setup_logging():
 
     return logger
 
+def setup_slow_query_logging():
+    """
+    Slow queries go to their own rotating file, one JSON record per line,
+    so scripts/slow_queries.py can aggregate them.
+    """
+    slow_logger = logging.getLogger("expense_app.slow_queries")
+    slow_logger.setLevel(logging.INFO)
+    slow_logger.propagate = False
+
+    if slow_logger.handlers:
+        return slow_logger
+
+    file_handler = RotatingFileHandler(
+        SLOW_QUERY_LOG_FILE, maxBytes=5*1024*1024, backupCount=3, delay=True
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    slow_logger.addHandler(file_handler)
+
+    return slow_logger
+
 # Create a global logger instance
 logger = setup_logging()
+slow_query_logger = setup_slow_query_logging()
@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import LOOP_LAG, LOOP_STALLS
+
+
+@dataclass
+class Stall:
+    duration: float  # seconds the loop had been blocked when the stack was taken
+    stack: str
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop scheduling delay and names the code that caused it.
+
+    A heartbeat task sleeps for `interval` and records how late it woke up in
+    the event_loop_lag_seconds histogram. A watchdog thread watches the
+    heartbeat; once it has been silent for longer than `threshold` the loop
+    thread is stuck in synchronous code, so the watchdog takes that thread's
+    stack right then and logs it. One stack is taken per stall.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, keep: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = deque(maxlen=keep)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_beat = 0.0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(loop.time() - scheduled, 0.0))
+            self._last_beat = time.monotonic()
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stopped.wait(self.interval / 2):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.threshold or beat == reported_beat:
+                continue
+
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.stalls.append(Stall(duration=blocked, stack=stack))
+            LOOP_STALLS.inc()
+            logger.warning(
+                f"EVENT LOOP BLOCKED for at least {blocked * 1000:.0f}ms, loop thread stack:\n{stack}"
+            )
+
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_LAG_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000,
+)
@@ -0,0 +1,132 @@
+import ipaddress
+import os
+from typing import AsyncIterator, Iterator, Union
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
+from sqlalchemy import event
+
+from app.core.config import settings
+
+# With PROMETHEUS_MULTIPROC_DIR set (one directory shared by all uvicorn
+# workers, emptied before start), prometheus_client keeps values in per-process
+# files and /metrics aggregates them. Gauges say how to combine processes.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed while handling requests", ["method", "route"]
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups; hit ratio = hit / (hit + miss)", ["cache", "result"]
+)
+BCRYPT_QUEUE_DEPTH = Gauge(
+    "bcrypt_executor_queue_depth", "bcrypt jobs waiting for a worker thread", multiprocess_mode="livesum"
+)
+EXPORT_BYTES = Counter(
+    "export_bytes_streamed_total", "Bytes streamed by CSV exports", ["export"]
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay between when the loop should run a callback and when it does",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls_total", "Times the loop was blocked longer than LOOP_LAG_THRESHOLD_MS"
+)
+
+
+def route_label(request) -> str:
+    """The matched route template, so /expenses/{id} is one series rather than one per id."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def record_request(request, status_code: int, duration: float, query_count: int):
+    route = route_label(request)
+    HTTP_REQUESTS.labels(request.method, route, str(status_code)).inc()
+    HTTP_REQUEST_DURATION.labels(request.method, route).observe(duration)
+    DB_QUERIES.labels(request.method, route).inc(query_count)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def instrument_pool(engine):
+    """Track checked-out connections through the pool's checkout/checkin events."""
+    pool = engine.sync_engine.pool if hasattr(engine, "sync_engine") else engine.pool
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_IN_USE.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.dec()
+
+
+def _size(chunk: Union[str, bytes]) -> int:
+    return len(chunk) if isinstance(chunk, bytes) else len(chunk.encode("utf-8"))
+
+
+async def count_bytes(chunks: Union[AsyncIterator, Iterator], export: str):
+    """Pass a streaming export (str or bytes chunks) through, counting what was sent."""
+    counter = EXPORT_BYTES.labels(export)
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            counter.inc(_size(chunk))
+            yield chunk
+    else:
+        for chunk in chunks:
+            counter.inc(_size(chunk))
+            yield chunk
+
+
+def is_allowed(host: str) -> bool:
+    """Check a client address against METRICS_ALLOWED_IPS (addresses or CIDR ranges)."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    for allowed in settings.METRICS_ALLOWED_IPS:
+        try:
+            if address in ipaddress.ip_network(allowed, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def render() -> bytes:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
@@ -0,0 +1,104 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import LOGS_DIR
+
+PROFILES_DIR = os.path.join(LOGS_DIR, "profiles")
+
+# How long a signed profiling token stays valid
+TOKEN_MAX_AGE_SECONDS = 300
+
+
+def sign(method: str, path: str, timestamp: Optional[int] = None) -> str:
+    """Token for the X-Profile header (or _profile query flag): "<timestamp>:<hmac>"."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    message = f"{timestamp}:{method.upper()}:{path}".encode("utf-8")
+    digest = hmac.new(settings.PROFILING_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()
+    return f"{timestamp}:{digest}"
+
+
+def verify(token: str, method: str, path: str) -> bool:
+    if not settings.PROFILING_SECRET:
+        return False
+    try:
+        timestamp = int(token.split(":", 1)[0])
+    except ValueError:
+        return False
+    if abs(time.time() - timestamp) > TOKEN_MAX_AGE_SECONDS:
+        return False
+    return hmac.compare_digest(token, sign(method, path, timestamp))
+
+
+class RequestProfile:
+    """Phase timings collected while a profiled request runs."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.total = 0.0
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+# Set by ProfilingMiddleware for the one request being profiled
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def record_phase(phase: str, seconds: float):
+    profile = current_profile.get()
+    if profile is not None:
+        profile.add(phase, seconds)
+
+
+def _time_in(frame, predicate: Callable) -> float:
+    """Time under the outermost frames matching `predicate`."""
+    if frame is None:
+        return 0.0
+    if predicate(frame):
+        return frame.time
+    return sum(_time_in(child, predicate) for child in frame.children)
+
+
+def _in(module: str, *functions: str) -> Callable:
+    module = module.replace("/", os.sep)
+    return lambda f: f.function in functions and (f.file_path or "").endswith(module)
+
+
+def breakdown(session, profile: RequestProfile) -> Dict[str, float]:
+    """
+    Per-phase milliseconds. "app" (everything below LoggingMiddleware), auth
+    and db are timed directly; middleware is the rest of the total.
+    Serialization comes from the sampled call tree, so anything shorter than
+    the sampling interval reads as 0. DB time spent in auth counts in both.
+    """
+    app = profile.phases.get("app", 0.0)
+    phases = {
+        "total": profile.total,
+        "middleware": max(profile.total - app, 0.0),
+        "app": app,
+        "auth": profile.phases.get("auth", 0.0),
+        "db": profile.phases.get("db", 0.0),
+        "serialization": _time_in(session.root_frame(), _in("fastapi/routing.py", "serialize_response")),
+    }
+    return {name: round(value * 1000, 2) for name, value in phases.items()}
+
+
+def write(profile_id: str, profiler, profile: RequestProfile, route: str) -> Dict[str, float]:
+    """Write <id>.speedscope.json (open at https://www.speedscope.app) and <id>.phases.json."""
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    phases = breakdown(profiler.last_session, profile)
+
+    with open(os.path.join(PROFILES_DIR, f"{profile_id}.speedscope.json"), "w", encoding="utf-8") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+    with open(os.path.join(PROFILES_DIR, f"{profile_id}.phases.json"), "w", encoding="utf-8") as f:
+        json.dump({"route": route, "phases_ms": phases}, f, indent=2)
+
+    return phases
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Encoded rows are sent in chunks of about this many bytes
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+
+def _default(obj: Any):
+    # Matches Pydantic's JSON mode, which renders Decimal as a string
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-encoded response for trusted rows that skip response_model
+    validation. Output matches the Pydantic encoding of the same data
+    (UUIDs and Decimals as strings, UTC datetimes with a Z suffix).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse, carrying over headers set on the endpoint's
+    injected `response` (e.g. ETag from not_modified), which FastAPI drops
+    when an endpoint returns its own Response.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def ndjson_lines(rows: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """One orjson-encoded row per line, buffered into chunks of NDJSON_CHUNK_BYTES."""
+    buffer = bytearray()
+    async for row in rows:
+        buffer += orjson.dumps(row, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        if len(buffer) >= NDJSON_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_response(chunks: AsyncIterator[bytes], response: Optional[Response] = None) -> StreamingResponse:
+    """Stream NDJSON, carrying over headers from `response` like fast_json does."""
+    headers = {}
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
@@ -11,8 +14,12 @@ from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import BCRYPT_QUEUE_DEPTH
+from app.core.profiling import record_phase
 from app.db.session import get_db
+from app.db.instrumentation import current_query_stats
 from app.models.user import User
+from app.services.data_version_service import data_version_service
 
 logger = logging.getLogger("expense_app")
 
@@ -20,12 +27,35 @@ logger = logging.getLogger("expense_app")
 security = HTTPBearer()
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+# bcrypt is deliberately slow; run it off the event loop on a bounded pool
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+async def _run_bcrypt(fn, *args):
+    started = False
+    BCRYPT_QUEUE_DEPTH.inc()
+
+    def job():
+        nonlocal started
+        started = True
+        BCRYPT_QUEUE_DEPTH.dec()  # picked up by a worker
+        return fn(*args)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, job)
+    finally:
+        if not started:
+            # Cancelled while still queued
+            BCRYPT_QUEUE_DEPTH.dec()
+
+
+async def hash_password(password: str) -> str:
+    hashed = await _run_bcrypt(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
+    return hashed.decode("utf-8")
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_bcrypt(bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -62,6 +92,7 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """Extract and validate user from JWT access token."""
+    start = time.perf_counter()
     token = credentials.credentials
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,4 +113,10 @@ async def get_current_user(
     user = result.scalars().first()
     if user is None:
         raise credentials_exception
+    data_version_service.remember(db, user)
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.user_id = user.id
+    record_phase("auth", time.perf_counter() - start)
     return user
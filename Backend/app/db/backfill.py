@@ -0,0 +1,177 @@
+"""
+Online data backfills and index builds for Alembic migrations.
+
+A backfill walks a table in key order, `batch_size` rows at a time, and runs
+each batch in autocommit mode so no lock is held longer than one batch:
+
+    backfill("expenses", "date = created_at", where="date IS NULL")
+
+    def link(conn, lower, upper):
+        conn.execute(sa.text("UPDATE ... WHERE id BETWEEN :lower AND :upper"), {"lower": lower, "upper": upper})
+    backfill("incomes", process=link, name="incomes_category")
+
+Progress is logged as batches complete and checkpointed in the
+backfill_progress table, so a migration that is interrupted picks up after
+the last finished batch when it is run again. Batch work must be idempotent:
+a batch that was cut off half-way is repeated. Call these from upgrade() or
+downgrade() only; they commit the migration's transaction so far.
+"""
+import logging
+import time
+from typing import Callable, Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+PROGRESS_TABLE = "backfill_progress"
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_PAUSE_MS = 50
+
+
+def _progress_table(bind) -> sa.Table:
+    table = sa.Table(
+        PROGRESS_TABLE,
+        sa.MetaData(),
+        sa.Column("name", sa.String(200), primary_key=True),
+        sa.Column("last_key", sa.String(), nullable=False),
+        sa.Column("rows_done", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    table.create(bind, checkfirst=True)
+    return table
+
+
+def _estimate_rows(bind, table: str, where: Optional[str]) -> Optional[int]:
+    if where is None and bind.dialect.name == "postgresql":
+        # Planner estimate; an exact count would be a full scan of its own
+        return bind.scalar(
+            sa.text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"), {"t": table}
+        )
+    clause = f" WHERE {where}" if where else ""
+    return bind.scalar(sa.text(f'SELECT count(*) FROM "{table}"{clause}'))
+
+
+def _parse_key(column: sa.Column, value: str):
+    try:
+        return column.type.python_type(value)
+    except NotImplementedError:
+        return value
+
+
+def backfill(
+    table: str,
+    update: Optional[str] = None,
+    *,
+    process: Optional[Callable[[sa.engine.Connection, object, object], None]] = None,
+    key: str = "id",
+    where: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_ms: float = DEFAULT_PAUSE_MS,
+    name: Optional[str] = None,
+) -> int:
+    """
+    Apply `update` (the SET clause of an UPDATE) or call `process(conn,
+    lower, upper)` for consecutive key ranges [lower, upper] of `table`
+    covering every row that matches `where`. Sleeps `pause_ms` between
+    batches. Returns the number of rows visited.
+    """
+    if (update is None) == (process is None):
+        raise ValueError("pass exactly one of update or process")
+    name = name or f"{table}.{key}"
+    filters = f" AND ({where})" if where else ""
+
+    if op.get_context().as_sql:
+        # Offline (--sql) mode can't read keys; emit the whole rewrite as one statement
+        if process is not None:
+            raise RuntimeError(f"backfill {name} needs a database connection")
+        op.execute(f'UPDATE "{table}" SET {update}' + (f" WHERE {where}" if where else ""))
+        return 0
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        progress = _progress_table(bind)
+        column = sa.Table(table, sa.MetaData(), autoload_with=bind).c[key]
+
+        checkpoint = bind.execute(sa.select(progress).where(progress.c.name == name)).first()
+        last = _parse_key(column, checkpoint.last_key) if checkpoint else None
+        done = checkpoint.rows_done if checkpoint else 0
+        if checkpoint:
+            logger.info(f"Backfill {name}: resuming after {last} ({done:,} rows done)")
+
+        total = _estimate_rows(bind, table, where)
+        started = time.perf_counter()
+        visited = 0
+        while True:
+            query = sa.select(column).where(sa.text(where) if where else sa.true())
+            if last is not None:
+                query = query.where(column > last)
+            keys = bind.scalars(query.order_by(column).limit(batch_size)).all()
+            if not keys:
+                break
+
+            lower, upper = keys[0], keys[-1]
+            if process is not None:
+                process(bind, lower, upper)
+            else:
+                bind.execute(
+                    sa.text(f'UPDATE "{table}" SET {update} WHERE "{key}" BETWEEN :lower AND :upper{filters}')
+                    .bindparams(sa.bindparam("lower", type_=column.type), sa.bindparam("upper", type_=column.type)),
+                    {"lower": lower, "upper": upper},
+                )
+
+            last = upper
+            visited += len(keys)
+            done += len(keys)
+            values = {"last_key": str(last), "rows_done": done, "updated_at": sa.func.now()}
+            if checkpoint is None:
+                bind.execute(progress.insert().values(name=name, **values))
+                checkpoint = True
+            else:
+                bind.execute(progress.update().where(progress.c.name == name).values(**values))
+
+            elapsed = time.perf_counter() - started
+            share = f" of ~{total:,}" if total else ""
+            logger.info(f"Backfill {name}: {done:,}{share} rows, {visited / elapsed:,.0f} rows/s")
+
+            if len(keys) < batch_size:
+                break
+            time.sleep(pause_ms / 1000)
+
+        bind.execute(progress.delete().where(progress.c.name == name))
+    logger.info(f"Backfill {name}: finished, {visited:,} rows in {time.perf_counter() - started:.1f}s")
+    return visited
+
+
+def create_index_concurrently(index_name: str, table: str, columns: Sequence[str], **kw) -> None:
+    """
+    op.create_index that doesn't block writes on PostgreSQL (CREATE INDEX
+    CONCURRENTLY, outside the migration transaction). An invalid index
+    left behind by an interrupted earlier attempt is dropped and rebuilt.
+    Other databases get a plain CREATE INDEX.
+    """
+    if op.get_context().dialect.name != "postgresql":
+        op.create_index(index_name, table, columns, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            valid = op.get_bind().scalar(
+                sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+                {"name": index_name},
+            )
+            if valid:
+                return
+            if valid is False:
+                op.drop_index(index_name, table_name=table, postgresql_concurrently=True)
+        op.create_index(index_name, table, columns, postgresql_concurrently=True, **kw)
+
+
+def drop_index_concurrently(index_name: str, table: str) -> None:
+    """op.drop_index without blocking reads and writes on PostgreSQL."""
+    if op.get_context().dialect.name != "postgresql":
+        op.drop_index(index_name, table_name=table)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+from sqlalchemy import DateTime, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class day_start(FunctionElement):
+    """Truncate a timestamp to the start of its day."""
+    type = DateTime()
+    name = "day_start"
+    inherit_cache = True
+
+
+@compiles(day_start)
+def _day_start_default(element, compiler, **kw):
+    return "date_trunc('day', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_start, "sqlite")
+def _day_start_sqlite(element, compiler, **kw):
+    return "datetime(%s, 'start of day')" % compiler.process(element.clauses, **kw)
+
+
+class year_month(FunctionElement):
+    """Format a timestamp as a 'YYYY-MM' month key."""
+    type = String()
+    name = "year_month"
+    inherit_cache = True
+
+
+@compiles(year_month)
+def _year_month_default(element, compiler, **kw):
+    return "to_char(%s, 'YYYY-MM')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(year_month, "sqlite")
+def _year_month_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m', %s)" % compiler.process(element.clauses, **kw)
@@ -0,0 +1,57 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.profiling import record_phase
+from app.db.slow_queries import capture_slow_query
+
+
+class QueryStats:
+    """SQL statements executed while handling one request."""
+
+    def __init__(self, route: Optional[str] = None):
+        self.count = 0
+        self.duration = 0.0  # seconds spent in the database
+        self.statements = Counter()
+        self.route = route
+        self.user_id = None  # set once get_current_user resolves the caller
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Identical statements executed at least `threshold` times, the usual sign of an N+1."""
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+
+# Set per request by LoggingMiddleware; None outside a request
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+# Listening on the Engine class covers the app engine and the test engine alike.
+# SQLAlchemy runs async drivers in greenlets that share the caller's context,
+# so the request's stats are visible here.
+# The start time lives on the statement's execution context: a statement that
+# raises never reaches after_cursor_execute, and its context goes away with it.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    record_phase("db", elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        capture_slow_query(conn, statement, parameters, executemany, elapsed, stats)
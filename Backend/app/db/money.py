@@ -0,0 +1,138 @@
+"""
+Storage of monetary amounts.
+
+Amounts are Decimals with two places everywhere above the database. How
+they are stored is chosen by MONEY_STORAGE:
+
+- "numeric" (default): NUMERIC(precision, 2), as before.
+- "cents": BIGINT minor units. SUM and comparisons run on integers in the
+  database, and each value is turned back into a Decimal once, as it is
+  read.
+
+Money does the conversion in both directions, including for aggregates
+(func.sum(Expense.amount) keeps the column's type), so queries and schemas
+are the same in both modes. Switching an existing database is a table
+rewrite: see convert_money_storage and scripts/money_storage.py.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List
+
+from sqlalchemy import BigInteger, Numeric, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+from app.core.logging import logger
+
+STORAGE_MODES = ("numeric", "cents")
+CENT = Decimal("0.01")
+
+# table -> NUMERIC precision of its amount column
+MONEY_COLUMNS: Dict[str, int] = {
+    "expenses": 10,
+    "incomes": 10,
+    "budgets": 12,
+    "expenses_archive": 10,
+}
+
+
+def to_cents(value) -> int:
+    """12.345 -> 1235. Rounds half up, as NUMERIC(_, 2) does for positive amounts."""
+    return int(Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents) -> Decimal:
+    """1235 -> Decimal("12.35"). Also takes the Decimal PostgreSQL returns for SUM(bigint)."""
+    return Decimal(cents).scaleb(-2).quantize(CENT)
+
+
+class Money(TypeDecorator):
+    """An amount with two decimal places, stored per MONEY_STORAGE."""
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self, precision: int = 12, cents: bool = None):
+        super().__init__(precision, 2)
+        self.precision = precision
+        self.cents = settings.MONEY_STORAGE == "cents" if cents is None else cents
+
+    def load_dialect_impl(self, dialect):
+        if self.cents:
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(Numeric(self.precision, 2))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.cents:
+            return value
+        return to_cents(value)
+
+    def process_literal_param(self, value, dialect):
+        return self.process_bind_param(value, dialect)
+
+    def process_result_value(self, value, dialect):
+        if value is None or not self.cents:
+            return value
+        return from_cents(value)
+
+    @property
+    def python_type(self):
+        return Decimal
+
+
+def stored_in_cents(conn: Connection, table: str) -> bool:
+    column = next(c for c in inspect(conn).get_columns(table) if c["name"] == "amount")
+    return isinstance(column["type"], BigInteger)
+
+
+def convert_money_storage(conn: Connection, mode: str) -> List[str]:
+    """
+    Rewrite every amount column to `mode` ("numeric" or "cents") on
+    PostgreSQL, skipping tables already stored that way. ALTER COLUMN TYPE
+    rewrites the table (and its partitions) under an exclusive lock, so run
+    it in a maintenance window. Returns the tables converted.
+    """
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"mode must be one of {STORAGE_MODES}")
+    if conn.dialect.name != "postgresql":
+        raise RuntimeError("Converting money storage in place needs PostgreSQL")
+
+    existing = set(inspect(conn).get_table_names())
+    converted = []
+    for table, precision in MONEY_COLUMNS.items():
+        if table not in existing or stored_in_cents(conn, table) == (mode == "cents"):
+            continue
+        if mode == "cents":
+            using = "round(amount * 100)::bigint"
+            column_type = "BIGINT"
+        else:
+            using = "(amount / 100.0)::numeric"
+            column_type = f"NUMERIC({precision}, 2)"
+        conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN amount TYPE {column_type} USING {using}'))
+        converted.append(table)
+    if converted:
+        logger.info(f"Converted amounts of {', '.join(converted)} to {mode}")
+    return converted
+
+
+def storage_mismatches(conn: Connection) -> List[str]:
+    """Tables whose amount column isn't stored the way MONEY_STORAGE says."""
+    existing = set(inspect(conn).get_table_names())
+    cents = settings.MONEY_STORAGE == "cents"
+    return [table for table in MONEY_COLUMNS if table in existing and stored_in_cents(conn, table) != cents]
+
+
+async def check_money_storage(engine) -> None:
+    """
+    Refuse to start when MONEY_STORAGE doesn't match the database: cents read
+    as NUMERIC would be 100 times too large, and the other way round 100
+    times too small. Run at startup.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.connect() as conn:
+        mismatched = await conn.run_sync(storage_mismatches)
+    if mismatched:
+        raise RuntimeError(
+            f"MONEY_STORAGE={settings.MONEY_STORAGE} but {', '.join(mismatched)} store amounts the other way; "
+            "run python -m scripts.money_storage convert or fix the setting"
+        )
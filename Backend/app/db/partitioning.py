@@ -0,0 +1,269 @@
+"""
+Range partitioning of the ledger tables by `date` on PostgreSQL.
+
+The ORM models don't change: the partitioned table keeps its name and
+columns, its primary key widens to (id, date) because PostgreSQL requires the
+partition key in every unique index, and queries bounded by `date` (all the
+analytics and snapshot queries) only touch the partitions they need.
+
+Partitions are named <table>_y2024 (interval "year") or <table>_y2024m03
+(interval "month"). A <table>_default partition catches dates outside the
+created ranges; ensure_partitions moves those rows into a real partition
+when it creates one. Every function takes a synchronous Connection so it can
+run from Alembic and through AsyncConnection.run_sync.
+"""
+import re
+from datetime import date, datetime, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.logging import logger
+
+PARTITIONED_TABLES = ("expenses", "incomes")
+PARTITION_KEY = "date"
+INTERVALS = ("year", "month")
+
+# Serializes partition maintenance between workers
+MAINTENANCE_LOCK_KEY = 0x6578_7061  # "expa"
+
+_NAME = re.compile(r"^(?P<table>\w+)_y(?P<year>\d{4})(?:m(?P<month>\d{2}))?$")
+
+
+class Partition(NamedTuple):
+    name: str
+    start: date
+    end: date
+
+
+def _next(start: date, interval: str) -> date:
+    if interval == "year":
+        return date(start.year + 1, 1, 1)
+    return date(start.year + (start.month == 12), start.month % 12 + 1, 1)
+
+
+def _floor(day: date, interval: str) -> date:
+    return date(day.year, 1, 1) if interval == "year" else date(day.year, day.month, 1)
+
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    if interval == "year":
+        return f"{table}_y{start.year}"
+    return f"{table}_y{start.year}m{start.month:02d}"
+
+
+def _bound(day: date) -> str:
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+def is_partition_name(name: str) -> bool:
+    """Whether `name` is a partition of one of PARTITIONED_TABLES."""
+    match = _NAME.match(name)
+    if match:
+        return match.group("table") in PARTITIONED_TABLES
+    return name in {f"{table}_default" for table in PARTITIONED_TABLES}
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return bool(conn.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+             "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace)"),
+        {"table": table},
+    ))
+
+
+def list_partitions(conn: Connection, table: str) -> List[Partition]:
+    """Range partitions of `table`, oldest first (the default partition is left out)."""
+    names = conn.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND p.relnamespace = 'public'::regnamespace"
+    ), {"table": table}).all()
+
+    partitions = []
+    for name in names:
+        match = _NAME.match(name)
+        if not match or match.group("table") != table:
+            continue
+        year, month = int(match.group("year")), match.group("month")
+        interval = "month" if month else "year"
+        start = date(year, int(month or 1), 1)
+        partitions.append(Partition(name, start, _next(start, interval)))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def _create_partition(conn: Connection, table: str, start: date, interval: str) -> str:
+    """
+    Create the partition for [start, next interval). Rows already sitting in
+    the default partition for that range are moved into it first, otherwise
+    PostgreSQL refuses to add the range.
+    """
+    name = partition_name(table, start, interval)
+    end = _next(start, interval)
+    default = f"{table}_default"
+    has_default = conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"public.{default}"})
+
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    if has_default:
+        conn.execute(text(
+            f'WITH moved AS (DELETE FROM "{default}" WHERE {PARTITION_KEY} >= {_bound(start)} '
+            f'AND {PARTITION_KEY} < {_bound(end)} RETURNING *) INSERT INTO "{name}" SELECT * FROM moved'
+        ))
+    conn.execute(text(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})'
+    ))
+    return name
+
+
+def ensure_partitions(
+    conn: Connection,
+    table: str,
+    interval: str,
+    ahead: int,
+    today: Optional[date] = None,
+    first: Optional[date] = None,
+) -> List[str]:
+    """
+    Make sure partitions exist from the newest one (or `first`, when there
+    are none yet) through `ahead` intervals past today. No-op for tables that
+    aren't partitioned, so it's safe to run on every startup. Returns the
+    names of the partitions created.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {INTERVALS}")
+    if not is_partitioned(conn, table):
+        return []
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+    today = today or datetime.now(timezone.utc).date()
+
+    target = _floor(today, interval)
+    for _ in range(ahead):
+        target = _next(target, interval)
+
+    existing = list_partitions(conn, table)
+    start = existing[-1].end if existing else _floor(first or today, interval)
+    created = []
+    while start <= target:
+        created.append(_create_partition(conn, table, start, interval))
+        start = _next(start, interval)
+    return created
+
+
+def detach_partitions(conn: Connection, table: str, before: date) -> List[str]:
+    """
+    Detach every partition that ends on or before `before`. The detached
+    tables keep their data and names and can be archived or dropped later.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+    detached = []
+    for partition in list_partitions(conn, table):
+        if partition.end <= before:
+            conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"'))
+            detached.append(partition.name)
+    return detached
+
+
+def _definitions(conn: Connection, table: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """CREATE INDEX statements (primary key excluded) and foreign keys of `table`."""
+    indexes = conn.scalars(text(
+        "SELECT i.indexdef FROM pg_indexes i "
+        "JOIN pg_class c ON c.relname = i.indexname AND c.relnamespace = 'public'::regnamespace "
+        "JOIN pg_index x ON x.indexrelid = c.oid "
+        "WHERE i.schemaname = 'public' AND i.tablename = :table AND NOT x.indisprimary"
+    ), {"table": table}).all()
+    foreign_keys = conn.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {"table": f"public.{table}"}).all()
+    # Partitioned indexes are reported as "ON ONLY <table>"; recreate them recursively
+    indexes = [statement.replace(" ON ONLY ", " ON ", 1) for statement in indexes]
+    return indexes, [tuple(fk) for fk in foreign_keys]
+
+
+def _rebuild(conn: Connection, table: str, partition_clause: str, primary_key: str, before_copy=None):
+    """Swap `table` for a copy with a new layout, carrying over rows, indexes and foreign keys."""
+    referenced = conn.scalar(text(
+        "SELECT count(*) FROM pg_constraint WHERE confrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {"table": f"public.{table}"})
+    if referenced:
+        raise RuntimeError(f"{table} is referenced by foreign keys; rebuild it by hand")
+
+    indexes, foreign_keys = _definitions(conn, table)
+    old = f"{table}_unpartitioned" if partition_clause else f"{table}_partitioned"
+    pkey = conn.scalar(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'p'"
+    ), {"table": f"public.{table}"})
+
+    conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{old}"'))
+    if pkey:
+        conn.execute(text(f'ALTER TABLE "{old}" RENAME CONSTRAINT "{pkey}" TO "{old}_pkey"'))
+
+    conn.execute(text(
+        f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+        f'INCLUDING STORAGE INCLUDING COMMENTS) {partition_clause}'
+    ))
+    conn.execute(text(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ({primary_key})'))
+    if before_copy:
+        before_copy()
+
+    conn.execute(text(f'INSERT INTO "{table}" SELECT * FROM "{old}"'))
+    conn.execute(text(f'DROP TABLE "{old}" CASCADE'))
+
+    # Indexes are built after the copy, which is much faster than maintaining them row by row
+    for statement in indexes:
+        conn.execute(text(statement))
+    for name, definition in foreign_keys:
+        conn.execute(text(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}'))
+    conn.execute(text(f'ANALYZE "{table}"'))
+
+
+def convert_to_partitioned(conn: Connection, table: str, interval: str, ahead: int) -> List[str]:
+    """
+    Rebuild `table` as a table partitioned by range on date, with one
+    partition per interval from its oldest row through `ahead` intervals
+    past today, plus a default partition. Rows are copied, so this holds an
+    exclusive lock on the table for as long as the copy takes.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {INTERVALS}")
+    if is_partitioned(conn, table):
+        return []
+
+    oldest = conn.scalar(text(f'SELECT min({PARTITION_KEY}) FROM "{table}"'))
+    first = oldest.astimezone(timezone.utc).date() if oldest else None
+    created = []
+
+    def create_partitions():
+        conn.execute(text(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT'))
+        created.extend(ensure_partitions(conn, table, interval, ahead, first=first))
+
+    _rebuild(conn, table, f"PARTITION BY RANGE ({PARTITION_KEY})", f"id, {PARTITION_KEY}", create_partitions)
+    logger.info(f"Partitioned {table} by {interval} into {len(created)} partitions")
+    return created
+
+
+def convert_to_plain(conn: Connection, table: str) -> None:
+    """Undo convert_to_partitioned: one heap table again, primary key on id alone."""
+    if not is_partitioned(conn, table):
+        return
+    _rebuild(conn, table, "", "id")
+
+
+async def maintain_partitions(engine) -> None:
+    """Create upcoming partitions for every partitioned ledger table; run at startup."""
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        async with engine.begin() as conn:
+            for table in PARTITIONED_TABLES:
+                created = await conn.run_sync(
+                    ensure_partitions, table, settings.PARTITION_INTERVAL, settings.PARTITION_PREMAKE
+                )
+                if created:
+                    logger.info(f"Created partitions {', '.join(created)}")
+    except Exception as e:
+        # Rows outside the existing ranges land in the default partition, so this can wait
+        logger.error(f"Partition maintenance failed: {e}")
@@ -1,6 +1,9 @@
+import time
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db import instrumentation  # registers per-request query counting
+from app.core import metrics
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -8,10 +11,21 @@ engine = create_async_engine(
     connect_args={"statement_cache_size": 0},
 )
 
+metrics.instrument_pool(engine)
+
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
 async def get_db():
     async with AsyncSessionLocal() as session:
+        # Check the connection out up front so pool waits are measured on their own
+        start = time.perf_counter()
+        await session.connection()
+        metrics.DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
         yield session
+
+def get_session_factory():
+    """Session factory for endpoints that run independent queries concurrently."""
+    return AsyncSessionLocal
+
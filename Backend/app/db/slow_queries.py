@@ -0,0 +1,151 @@
+import asyncio
+import glob
+import hashlib
+import json
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import logger, slow_query_logger, SLOW_QUERY_LOG_FILE
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Strong references to in-flight EXPLAIN tasks, and a cap so a burst of slow
+# queries cannot fan out into a burst of EXPLAIN ANALYZE runs.
+_explain_tasks = set()
+MAX_CONCURRENT_EXPLAINS = 1
+
+
+def normalize(statement: str) -> str:
+    """Replace literals and bind placeholders with ? so equivalent statements compare equal."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip().lower()
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode("utf-8")).hexdigest()[:12]
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Types of the bound parameters, never their values."""
+    if executemany and parameters:
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _write(record: dict):
+    slow_query_logger.info(json.dumps(record, default=str))
+
+
+def capture_slow_query(conn, statement, parameters, executemany, elapsed, stats=None):
+    """
+    Called from the after_cursor_execute hook once a statement crosses
+    SLOW_QUERY_THRESHOLD_MS. Writes one JSON record to logs/slow_queries.log,
+    after an EXPLAIN (ANALYZE, BUFFERS) on a side connection when enabled.
+    """
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "fingerprint": fingerprint(statement),
+        "statement": statement,
+        "parameters": parameter_shape(parameters, executemany),
+        "duration_ms": round(elapsed * 1000, 2),
+        "route": stats.route if stats else None,
+        "user_id": str(stats.user_id) if stats and stats.user_id else None,
+    }
+
+    if _should_explain(conn, statement, executemany):
+        task = asyncio.get_running_loop().create_task(_explain_and_write(record, statement, parameters))
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+        return
+
+    _write(record)
+
+
+def _should_explain(conn, statement, executemany) -> bool:
+    if not settings.SLOW_QUERY_EXPLAIN or executemany:
+        return False
+    if conn.dialect.name != "postgresql":
+        return False
+    # ANALYZE executes the statement, so only ever re-run reads
+    if not statement.lstrip().lower().startswith(("select", "with")):
+        return False
+    if len(_explain_tasks) >= MAX_CONCURRENT_EXPLAINS:
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def _explain_and_write(record: dict, statement: str, parameters):
+    # Imported here: app.db.session imports the instrumentation that calls into this module
+    from app.db.session import engine
+
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+            )
+            record["plan"] = result.scalar()
+            # Nothing the EXPLAIN touched should stick
+            await conn.rollback()
+    except Exception as e:
+        logger.warning(f"EXPLAIN for slow query {record['fingerprint']} failed: {e}")
+    _write(record)
+
+
+def read_records(path: str = SLOW_QUERY_LOG_FILE) -> List[dict]:
+    """Records from the log and its rotated backups, oldest file first."""
+    records = []
+    for file in sorted(glob.glob(path + ".*"), reverse=True) + [path]:
+        try:
+            with open(file, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        records.append(json.loads(line))
+        except FileNotFoundError:
+            continue
+    return records
+
+
+def top_offenders(records: List[dict], limit: int = 10, route: Optional[str] = None) -> List[Dict]:
+    """Group records by fingerprint and rank the groups by total time spent."""
+    groups = defaultdict(list)
+    for record in records:
+        if route and record.get("route") != route:
+            continue
+        groups[record["fingerprint"]].append(record)
+
+    summary = []
+    for key, group in groups.items():
+        durations = sorted(r["duration_ms"] for r in group)
+        summary.append({
+            "fingerprint": key,
+            "count": len(group),
+            "total_ms": round(sum(durations), 2),
+            "avg_ms": round(sum(durations) / len(durations), 2),
+            "max_ms": durations[-1],
+            "routes": sorted({r["route"] for r in group if r.get("route")}),
+            "statement": normalize(group[-1]["statement"]),
+            "plan": next((r["plan"] for r in reversed(group) if r.get("plan")), None),
+        })
+
+    summary.sort(key=lambda s: s["total_ms"], reverse=True)
+    return summary[:limit]
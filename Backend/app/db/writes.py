@@ -0,0 +1,60 @@
+"""
+Single-statement writes.
+
+Each helper issues one INSERT, UPDATE or DELETE with RETURNING and hands back
+the ORM object, so a write never needs a SELECT beforehand to check the row
+exists or a refresh() afterwards to read server defaults such as created_at.
+Ownership goes in the WHERE clause: a row that doesn't exist and a row that
+belongs to someone else both come back as None, and the caller raises 404.
+"""
+from typing import Optional, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+# Rows come back from RETURNING; loaded copies in the session are overwritten
+_RETURNING_OPTIONS = {"synchronize_session": False, "populate_existing": True}
+
+
+async def insert_returning(db: AsyncSession, model: Type[T], values: dict) -> T:
+    """INSERT one row and return it with every column, server defaults included."""
+    result = await db.scalars(insert(model).values(**values).returning(model))
+    return result.one()
+
+
+async def update_returning(db: AsyncSession, model: Type[T], values: dict, *where) -> Optional[T]:
+    """UPDATE the row matching `where` and return it, or None if nothing matched."""
+    result = await db.scalars(
+        update(model).where(*where).values(**values).returning(model).execution_options(**_RETURNING_OPTIONS)
+    )
+    return result.first()
+
+
+async def update_owned(db: AsyncSession, model: Type[T], id, user_id: UUID, values: dict, *where) -> Optional[T]:
+    """update_returning for the row `id` of `user_id`."""
+    return await update_returning(db, model, values, model.id == id, model.user_id == user_id, *where)
+
+
+async def delete_owned(db: AsyncSession, model: Type[T], id, user_id: UUID, *where) -> Optional[T]:
+    """DELETE the row `id` of `user_id` and return it as it was, or None if nothing matched."""
+    result = await db.scalars(
+        delete(model)
+        .where(model.id == id, model.user_id == user_id, *where)
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+def insert_ignoring_conflicts(model, dialect: str):
+    """
+    INSERT ... ON CONFLICT DO NOTHING into `model`'s table. Executed with a
+    list of rows it goes out as multi-row VALUES pages, so a large batch
+    takes a handful of round trips.
+    """
+    insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    return insert_(model.__table__).on_conflict_do_nothing()
@@ -1,8 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, expense, budget, health, income
+from app.routers import auth, expense, budget, health, income, dashboard, sync, transaction, metrics
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.core.config import settings
+from app.core import metrics as app_metrics
+from app.core.loop_monitor import loop_monitor
+from app.db.money import check_money_storage
+from app.db.partitioning import maintain_partitions
+from app.db.session import engine
 
 description = """
 Expense Management API helps you track your expenses easily.
@@ -26,21 +32,45 @@ tags_metadata = [
         "name": "Incomes",
         "description": "Track your income sources.",
     },
+    {
+        "name": "Transactions",
+        "description": "Incomes and expenses together in one timeline.",
+    },
     {
         "name": "Budgets",
         "description": "Set monthly budgets and track your spending progress.",
     },
+    {
+        "name": "Dashboard",
+        "description": "Everything the dashboard page needs in a single request.",
+    },
+    {
+        "name": "Sync",
+        "description": "Incremental changes for clients that keep a local replica.",
+    },
     {
         "name": "Health",
         "description": "Check if the API and Database are alive.",
     },
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    await check_money_storage(engine)
+    await maintain_partitions(engine)
+    yield
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+    app_metrics.mark_process_dead()
+
 app = FastAPI(
     title="Expense Management API",
     description=description,
     version="1.0.0",
-    openapi_tags=tags_metadata
+    openapi_tags=tags_metadata,
+    lifespan=lifespan
 )
 
 # Security Middleware (added first, runs last)
@@ -71,6 +101,10 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
+# Profiling Middleware (added after everything else so it wraps the whole stack)
+from app.middleware.profiling_middleware import ProfilingMiddleware
+app.add_middleware(ProfilingMiddleware)
+
 # Security Middleware moved above CORS to ensure correct ordering
 
 # Exception Handlers
@@ -94,6 +128,10 @@ app.include_router(expense.router)
 app.include_router(budget.router)
 app.include_router(health.router)
 app.include_router(income.router)
+app.include_router(dashboard.router)
+app.include_router(sync.router)
+app.include_router(transaction.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -1,31 +1,76 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
 from app.core.logging import logger
+from app.core import metrics
+from app.core.profiling import record_phase
+from app.db.instrumentation import QueryStats, current_query_stats
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class LoggingMiddleware:
+    """
+    Access log, request metrics and per-request query stats.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which returns as soon as the
+    headers are ready: a streamed body (the CSV and NDJSON exports) runs its
+    queries after that. The log line, metrics and N+1 scan are written once
+    the last body chunk is sent. Server-Timing has to go out with the
+    headers, so for a streamed body it covers the work done before them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         start_time = time.time()
-        
+        stats = QueryStats(route=f"{request.method} {request.url.path}")
+        token = current_query_stats.set(stats)
+        status_code = 500
+
         # Log Request
         logger.info(f"REQUEST: {request.method} {request.url.path}")
-        
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["Server-Timing"] = (
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                    f"total;dur={(time.time() - start_time) * 1000:.2f}"
+                )
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate execution time
+            app_start = time.perf_counter()
+            await self.app(scope, receive, send_with_timing)
+            record_phase("app", time.perf_counter() - app_start)
+
+            # Calculate execution time, up to the end of the body
             process_time = time.time() - start_time
             formatted_process_time = f"{process_time:.4f}s"
-            
+            db_ms = stats.duration * 1000
+
             # Log Response
             logger.info(
                 f"RESPONSE: {request.method} {request.url.path} "
-                f"Status: {response.status_code} Duration: {formatted_process_time}"
+                f"Status: {status_code} Duration: {formatted_process_time} "
+                f"Queries: {stats.count} DB: {db_ms:.2f}ms"
             )
-            
-            return response
-            
+            metrics.record_request(request, status_code, process_time, stats.count)
+
+            for statement, times in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                logger.warning(
+                    f"N+1 SUSPECT: {request.method} {request.url.path} "
+                    f"ran the same statement {times} times: {' '.join(statement.split())[:300]}"
+                )
+
         except Exception as e:
             # Log Error
             process_time = time.time() - start_time
@@ -34,4 +79,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 f"Duration: {process_time:.4f}s Error: {str(e)}",
                 exc_info=True
             )
+            metrics.record_request(request, 500, process_time, stats.count)
             raise e
+        finally:
+            current_query_stats.reset(token)
@@ -0,0 +1,67 @@
+import asyncio
+import re
+import time
+import uuid
+from datetime import datetime
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core import profiling
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request end to end when it carries a valid signed
+    X-Profile header or _profile query flag (see scripts/profile_token.py).
+
+    Plain ASGI rather than BaseHTTPMiddleware so the request runs in this
+    task and the sampling profiler sees every middleware below it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.PROFILING_SECRET:
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get("x-profile") or QueryParams(scope["query_string"]).get("_profile")
+        if not token or not profiling.verify(token, scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        route = f"{scope['method']} {scope['path']}"
+        slug = re.sub(r"[^a-zA-Z0-9]+", "-", scope["path"]).strip("-") or "root"
+        profile_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:6]}"
+
+        async def send_with_id(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode("ascii"))]
+            await send(message)
+
+        profile = profiling.RequestProfile()
+        context_token = profiling.current_profile.set(profile)
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL_MS / 1000, async_mode="enabled")
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            profile.total = time.perf_counter() - start
+            profiling.current_profile.reset(context_token)
+            try:
+                # Rendering and writing the files takes a while; keep it off the event loop
+                phases = await asyncio.to_thread(profiling.write, profile_id, profiler, profile, route)
+            except Exception as e:
+                # Never replace the request's own outcome with a profiling failure
+                logger.error(f"PROFILE: {route} id={profile_id} could not be written: {e}")
+            else:
+                logger.info(f"PROFILE: {route} id={profile_id} phases_ms={phases}")
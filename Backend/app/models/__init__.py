@@ -4,3 +4,6 @@ from app.models.expense import Expense
 from app.models.budget import Budget
 from app.models.income import Income
 from app.models.otp import OTPCode
+from app.models.snapshot import PeriodSnapshot
+from app.models.sync import SyncTombstone
+from app.models.archive import ExpenseArchive
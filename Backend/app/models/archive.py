@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, BigInteger, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+from app.db.money import Money
+
+class ExpenseArchive(Base):
+    """
+    Cold storage for expenses moved out of the hot table by the retention
+    job: long soft-deleted rows and, optionally, very old history. Columns
+    mirror Expense so rows can move back on restore.
+    """
+    __tablename__ = "expenses_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    amount = Column(Money(10), nullable=False)
+    category_id = Column(Integer, nullable=False)  # no FK: the category may be deleted later
+    description = Column(String, nullable=True)
+    is_deleted = Column(Boolean, nullable=False)
+    date = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    change_seq = Column(BigInteger, nullable=False)
+    reason = Column(String(20), nullable=False)  # "deleted" or "history"
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_expenses_archive_user_date", "user_id", "date"),
+    )
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index, BigInteger, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
 from app.db.base import Base
+from app.db.money import Money
 from app.models.category import Category # Import to avoid circular dependency issues if possible, or string reference
 
 class Budget(Base):
@@ -10,9 +12,11 @@ class Budget(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
-    amount = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Money(12), nullable=False)
     month = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    change_seq = Column(BigInteger, default=0, server_default="0", nullable=False)  # user's data_version at last write
     
     user = relationship("User", back_populates="budgets")
     category = relationship("Category")
@@ -20,4 +24,5 @@ class Budget(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "month", "year", "category_id", name="uq_budget_user_month_year_category"),
         Index("ix_budget_user_month_year", "user_id", "month", "year"),
+        Index("ix_budgets_user_change_seq", "user_id", "change_seq"),
     )
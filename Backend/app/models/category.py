@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, BigInteger, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
 from app.db.base import Base
 
 class Category(Base):
@@ -11,10 +12,14 @@ class Category(Base):
     type = Column(String, default="expense", nullable=False) # 'income' or 'expense'
     is_default = Column(Boolean, default=False, nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    change_seq = Column(BigInteger, default=0, server_default="0", nullable=False)  # user's data_version at last write
 
     expenses = relationship("Expense", back_populates="category")
     user = relationship("User", back_populates="categories")
 
     __table_args__ = (
-        UniqueConstraint("name", "type", "user_id", name="uq_category_name_type_user"),
+        # Case-insensitive, so "Food" and "food" can't both exist
+        Index("uq_categories_user_type_lower_name", "user_id", "type", func.lower(name), unique=True),
+        Index("ix_categories_user_change_seq", "user_id", "change_seq"),
     )
@@ -1,21 +1,34 @@
-from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, Integer, Boolean
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from app.db.base import Base
+from app.db.money import Money
 
 class Expense(Base):
     __tablename__ = "expenses"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(Money(10), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     description = Column(String, nullable=True)
     is_deleted = Column(Boolean, default=False, nullable=False, index=True)
     date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    change_seq = Column(BigInteger, default=0, server_default="0", nullable=False)  # user's data_version at last write
 
     user = relationship("User", back_populates="expenses")
     category = relationship("Category", back_populates="expenses")
+
+    __table_args__ = (
+        Index("ix_expenses_user_change_seq", "user_id", "change_seq"),
+        # Index-only scans for narrow list queries (fields=...)
+        Index(
+            "ix_expenses_user_date_covering", "user_id", "date",
+            postgresql_include=["amount", "category_id", "id"],
+            postgresql_where=text("is_deleted = false")
+        ),
+    )
@@ -1,16 +1,17 @@
-from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, Integer, Boolean
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, BigInteger, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 from app.db.base import Base
+from app.db.money import Money
 
 class Income(Base):
     __tablename__ = "incomes"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    amount = Column(Numeric(10, 2), nullable=False) # Precision 10, scale 2 for currency
+    amount = Column(Money(10), nullable=False) # Precision 10, scale 2 for currency (or cents, see app/db/money.py)
     source = Column(String, nullable=False) # e.g. Salary, Freelance, Gift - Keep for history or migration
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True) # Nullable for migration
     description = Column(String, nullable=True)
@@ -18,6 +19,16 @@ class Income(Base):
     date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    change_seq = Column(BigInteger, default=0, server_default="0", nullable=False)  # user's data_version at last write
 
     user = relationship("User", back_populates="incomes")
     category = relationship("Category")
+
+    __table_args__ = (
+        Index("ix_incomes_user_change_seq", "user_id", "change_seq"),
+        # Index-only scans for narrow list queries (fields=...)
+        Index(
+            "ix_incomes_user_date_covering", "user_id", "date",
+            postgresql_include=["amount", "category_id", "id"]
+        ),
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class PeriodSnapshot(Base):
+    __tablename__ = "period_snapshots"
+
+    # Composite primary key so a closed period is a single PK lookup
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # "summary" or "analytics"
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)  # 0 for yearly snapshots
+    payload = Column(JSON, nullable=False)
+    etag = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,8 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     avatar_url = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped by every write to the user's data; backs ETags for read endpoints
+    data_version = Column(BigInteger, default=0, server_default="0", nullable=False)
 
     categories = relationship("Category", back_populates="user")
     budgets = relationship("Budget", back_populates="user")
@@ -9,6 +9,7 @@ from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 
 from app.db.session import get_db
+from app.db.writes import insert_returning, update_returning
 from app.models.user import User
 from app.models.otp import OTPCode
 from app.core.config import settings
@@ -74,23 +75,21 @@ async def register(request: Request, user: UserRegister, db: AsyncSession = Depe
 
     if existing and not existing.is_verified:
         # Re-send OTP for unverified user
-        existing.password_hash = hash_password(user.password)
+        existing.password_hash = await hash_password(user.password)
         existing.full_name = user.full_name
         await db.commit()
         await create_and_send_otp(db, existing.id, user.email, "signup", "verify your account")
         return {"message": "OTP sent to your email. Please verify to complete registration."}
 
     # Create new user (unverified)
-    new_user = User(
-        email=user.email,
-        full_name=user.full_name,
-        password_hash=hash_password(user.password),
-        auth_provider="email",
-        is_verified=False,
-    )
-    db.add(new_user)
+    new_user = await insert_returning(db, User, {
+        "email": user.email,
+        "full_name": user.full_name,
+        "password_hash": await hash_password(user.password),
+        "auth_provider": "email",
+        "is_verified": False,
+    })
     await db.commit()
-    await db.refresh(new_user)
 
     # Send OTP
     await create_and_send_otp(db, new_user.id, user.email, "signup", "verify your account")
@@ -190,7 +189,7 @@ async def login(request: Request, user: UserLogin, db: AsyncSession = Depends(ge
     if not db_user.is_verified:
         raise HTTPException(status_code=403, detail="Please verify your email first")
 
-    if not verify_password(user.password, db_user.password_hash):
+    if not await verify_password(user.password, db_user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     access_token = create_access_token(data={"sub": db_user.email})
@@ -252,7 +251,7 @@ async def reset_password(
     if data.password != data.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
-    current_user.password_hash = hash_password(data.password)
+    current_user.password_hash = await hash_password(data.password)
     await db.commit()
     return {"message": "Password updated successfully"}
 
@@ -293,15 +292,13 @@ async def google_login(data: GoogleAuth, db: AsyncSession = Depends(get_db)):
     user = result.scalars().first()
 
     if not user:
-        user = User(
-            email=email,
-            full_name=name,
-            auth_provider="google",
-            is_verified=True,  # Google users are pre-verified
-        )
-        db.add(user)
+        user = await insert_returning(db, User, {
+            "email": email,
+            "full_name": name,
+            "auth_provider": "google",
+            "is_verified": True,  # Google users are pre-verified
+        })
         await db.commit()
-        await db.refresh(user)
 
         # Seed default categories
         await category_service.seed_user_categories(db, user.id)
@@ -335,13 +332,10 @@ async def update_current_user_profile(
     db: AsyncSession = Depends(get_db),
 ):
     """Update current user's profile."""
-    if data.full_name is not None:
-        current_user.full_name = data.full_name
-    if data.avatar_url is not None:
-        current_user.avatar_url = data.avatar_url
-        
-    await db.commit()
-    await db.refresh(current_user)
+    values = data.model_dump(exclude_none=True)
+    if values:
+        current_user = await update_returning(db, User, values, User.id == current_user.id)
+        await db.commit()
     
     return UserResponse(
         id=str(current_user.id),
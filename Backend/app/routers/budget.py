@@ -1,18 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy.future import select
-from sqlalchemy import func
-from datetime import datetime
-from decimal import Decimal
+from sqlalchemy.orm import aliased
 
 from app.db.session import get_db
+from app.db.writes import insert_returning, update_returning, update_owned, delete_owned
 from app.models.budget import Budget
-from app.models.expense import Expense
 from app.models.user import User
 from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetStatusResponse
 from app.core.security import get_current_user
+from app.core.http_cache import not_modified
+from app.services.data_version_service import data_version_service
+from app.services.budget_service import budget_service
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
@@ -37,94 +37,37 @@ async def create_or_update_budget(
     result = await db.execute(query)
     existing_budget = result.scalars().first()
 
+    version = await data_version_service.bump(db, current_user.id)
     if existing_budget:
-        existing_budget.amount = budget_in.amount
-        await db.commit()
-        await db.refresh(existing_budget)
-        return existing_budget
-    else:
-        new_budget = Budget(
-            user_id=current_user.id,
-            amount=budget_in.amount,
-            month=budget_in.month,
-            year=budget_in.year,
-            category_id=budget_in.category_id
+        budget = await update_returning(
+            db, Budget, {"amount": budget_in.amount, "change_seq": version}, Budget.id == existing_budget.id
         )
-        db.add(new_budget)
-        await db.commit()
-        await db.refresh(new_budget)
-        return new_budget
+    else:
+        budget = await insert_returning(db, Budget, {
+            "user_id": current_user.id,
+            "amount": budget_in.amount,
+            "month": budget_in.month,
+            "year": budget_in.year,
+            "category_id": budget_in.category_id,
+            "change_seq": version,
+        })
+    await db.commit()
+    return budget
 
 @router.get("/progress", response_model=List[BudgetStatusResponse])
 async def get_budget_progress(
+    request: Request,
+    response: Response,
     month: Optional[int] = None,
     year: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    now = datetime.now()
-    target_month = month or now.month
-    target_year = year or now.year
-    
-    start_date = datetime(target_year, target_month, 1)
-    if target_month == 12:
-        end_date = datetime(target_year + 1, 1, 1)
-    else:
-        end_date = datetime(target_year, target_month + 1, 1)
-
-    # 1. Get all budgets for the month
-    # We join with Category to get names
-    budgets_query = select(Budget).options(
-            selectinload(Budget.category)
-        ).where(
-        Budget.user_id == current_user.id,
-        Budget.month == target_month,
-        Budget.year == target_year
-    )
-    budgets_result = await db.execute(budgets_query)
-    budgets = budgets_result.scalars().all()
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
 
-    # 2. Get expenses aggregated by category (Single Query for N+1 fix)
-    expense_query = select(
-        Expense.category_id, 
-        func.sum(Expense.amount).label("total")
-    ).where(
-        Expense.user_id == current_user.id,
-        Expense.date >= start_date,
-        Expense.date < end_date,
-        Expense.is_deleted == False
-    ).group_by(Expense.category_id)
-    
-    expense_result = await db.execute(expense_query)
-    expense_data = expense_result.all()
-    
-    spent_by_category = {row.category_id: (row.total or Decimal(0)) for row in expense_data}
-    total_spent_all = sum(spent_by_category.values()) if spent_by_category else Decimal(0)
-    
-    response = []
-    
-    for budget in budgets:
-        category_name = "Global"
-        
-        if budget.category_id:
-            spent = spent_by_category.get(budget.category_id, Decimal(0))
-            category_name = budget.category.name if budget.category else "Unknown"
-        else:
-            spent = total_spent_all
-        
-        percent_used = (float(spent) / float(budget.amount)) * 100 if budget.amount > 0 else 0
-        
-        response.append(BudgetStatusResponse(
-            id=budget.id,
-            category_id=budget.category_id,
-            category_name=category_name,
-            budget=budget.amount,
-            spent=spent,
-            remaining=budget.amount - spent,
-            percent_used=round(percent_used, 2)
-        ))
-        
-    return response
+    return await budget_service.get_budget_progress(db, current_user.id, month, year)
 
 @router.put("/{budget_id}", response_model=BudgetResponse)
 async def update_budget(
@@ -133,47 +76,41 @@ async def update_budget(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Budget).where(
-        Budget.id == budget_id,
-        Budget.user_id == current_user.id
+    # A different budget already covering the target category/month/year
+    other = aliased(Budget)
+    conflict = select(other.id).where(
+        other.user_id == current_user.id,
+        other.month == budget_in.month,
+        other.year == budget_in.year,
+        other.id != budget_id
     )
-    result = await db.execute(query)
-    budget = result.scalars().first()
+    if budget_in.category_id:
+        conflict = conflict.where(other.category_id == budget_in.category_id)
+    else:
+        conflict = conflict.where(other.category_id.is_(None))
+
+    version = await data_version_service.bump(db, current_user.id)
+    budget = await update_owned(db, Budget, budget_id, current_user.id, {
+        "amount": budget_in.amount,
+        "category_id": budget_in.category_id,
+        "month": budget_in.month,
+        "year": budget_in.year,
+        "change_seq": version,
+    }, ~conflict.exists())
 
     if not budget:
+        # Only the failure path pays for telling the two cases apart
+        if await db.scalar(conflict.limit(1)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A budget for this category already exists in the selected month."
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Budget not found or you don't have permission to update it"
         )
-    
-    # Check if the desired category/month/year already exists for a DIFFERENT budget
-    check_query = select(Budget).where(
-        Budget.user_id == current_user.id,
-        Budget.month == budget_in.month,
-        Budget.year == budget_in.year,
-        Budget.id != budget_id
-    )
-    if budget_in.category_id:
-        check_query = check_query.where(Budget.category_id == budget_in.category_id)
-    else:
-        check_query = check_query.where(Budget.category_id.is_(None))
-        
-    check_result = await db.execute(check_query)
-    existing_conflict = check_result.scalars().first()
-    
-    if existing_conflict:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A budget for this category already exists in the selected month."
-        )
-
-    budget.amount = budget_in.amount
-    budget.category_id = budget_in.category_id
-    budget.month = budget_in.month
-    budget.year = budget_in.year
 
     await db.commit()
-    await db.refresh(budget)
     return budget
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -182,12 +119,7 @@ async def delete_budget(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Budget).where(
-        Budget.id == budget_id,
-        Budget.user_id == current_user.id
-    )
-    result = await db.execute(query)
-    budget = result.scalars().first()
+    budget = await delete_owned(db, Budget, budget_id, current_user.id)
 
     if not budget:
         raise HTTPException(
@@ -195,6 +127,6 @@ async def delete_budget(
             detail="Budget not found or you don't have permission to delete it"
         )
     
-    await db.delete(budget)
+    await data_version_service.tombstone(db, current_user.id, "budget", budget.id)
     await db.commit()
     return None
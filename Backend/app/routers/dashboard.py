@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.db.session import get_session_factory
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.expense import DashboardSummaryResponse
+from app.core.security import get_current_user
+from app.core.http_cache import not_modified
+from app.services.expense_service import expense_service
+from app.services.category_service import category_service
+from app.services.budget_service import budget_service
+from app.services.data_version_service import data_version_service
+from app.services.snapshot_service import snapshot_service, SUMMARY
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=2000),
+    recent_limit: int = Query(5, ge=1, le=20),
+    session_factory=Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything the dashboard page needs in one round trip: monthly summary,
+    recent expenses, expense categories and budget progress. The user is
+    authenticated once and the four parts run concurrently, each on its own
+    session since a session cannot run queries in parallel.
+    """
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    user_id = current_user.id
+    today = datetime.now()
+    target_month = month or today.month
+    target_year = year or today.year
+
+    async def summary(db):
+        async def build():
+            data = await expense_service.get_monthly_summary(db, user_id, target_month, target_year)
+            return DashboardSummaryResponse.model_validate(data).model_dump(mode="json")
+
+        snapshot = await snapshot_service.get_or_build(db, user_id, SUMMARY, target_year, target_month, build)
+        if snapshot:
+            return snapshot.payload
+        return await expense_service.get_monthly_summary(db, user_id, target_month, target_year)
+
+    async def recent_expenses(db):
+        return await expense_service.get_recent_expenses(db, user_id, recent_limit)
+
+    async def categories(db):
+        return await category_service.get_categories(db, user_id, "expense")
+
+    async def budgets(db):
+        return await budget_service.get_budget_progress(db, user_id, target_month, target_year)
+
+    async def run(part):
+        async with session_factory() as db:
+            # Every part reads at the version the ETag was computed from
+            data_version_service.remember(db, current_user)
+            return await part(db)
+
+    results = await asyncio.gather(
+        run(summary), run(recent_expenses), run(categories), run(budgets)
+    )
+    return dict(zip(("summary", "recent_expenses", "categories", "budgets"), results))
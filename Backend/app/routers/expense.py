@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
+from app.db.writes import insert_returning, update_owned
 from app.models.expense import Expense
 from app.models.user import User
 from app.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseUpdate, PaginatedExpenseResponse, DashboardSummaryResponse
+from app.schemas.expense import ExpenseBulkAction, ExpenseRecategorize, ExpenseBulkResponse
 from app.core.security import get_current_user
-from app.services.expense_service import expense_service
+from app.services.expense_service import expense_service, EXPENSE_ROW_COLUMNS, EXPENSE_FIELDS
+from app.services.snapshot_service import snapshot_service, SUMMARY, ANALYTICS
+from app.services.data_version_service import data_version_service
+from app.services.category_service import category_service
+from app.services.archive_service import archive_service
+from app.services.budget_service import budget_service
+from app.core.http_cache import snapshot_response, not_modified
+from app.core.metrics import count_bytes
+from app.core.responses import fast_json, wants_ndjson, ndjson_lines, ndjson_response
+from app.core.fieldsets import parse_fields
 from fastapi.responses import StreamingResponse
 
 from app.models.category import Category
@@ -20,42 +32,40 @@ from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdat
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
 
+DUPLICATE_CATEGORY = "A category with this name already exists."
+
 @router.post("/categories", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category: CategoryCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Check if category with same name AND type exists
-    existing_category_query = select(Category).where(
-        Category.user_id == current_user.id,
-        Category.type == category.type,
-        Category.name.ilike(category.name)
-    )
-    existing_category_result = await db.execute(existing_category_query)
-    if existing_category_result.scalars().first():
-        raise HTTPException(
-            status_code=400,
-            detail="A category with this name already exists."
-        )
-
-    new_category = Category(name=category.name, type=category.type, user_id=current_user.id)
-    db.add(new_category)
+    # uq_categories_user_type_lower_name rejects names that differ only in case
+    version = await data_version_service.bump(db, current_user.id)
+    try:
+        new_category = await insert_returning(db, Category, {
+            "name": category.name, "type": category.type, "user_id": current_user.id, "change_seq": version
+        })
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=DUPLICATE_CATEGORY)
     await db.commit()
-    await db.refresh(new_category)
+    category_service.invalidate(current_user.id)
     return new_category
 
 @router.get("/categories", response_model=List[CategoryResponse])
 async def get_categories(
+    request: Request,
+    response: Response,
     type: Optional[str] = Query(None, pattern="^(income|expense)$"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Category).where(Category.user_id == current_user.id)
-    if type:
-        query = query.where(Category.type == type)
-    result = await db.execute(query)
-    return result.scalars().all()
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    return await category_service.get_categories(db, current_user.id, type)
 
 @router.put("/categories/{id}", response_model=CategoryResponse)
 async def update_category(
@@ -64,41 +74,29 @@ async def update_category(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Category).where(Category.id == id, Category.user_id == current_user.id)
-    )
-    category = result.scalars().first()
+    update_data = category_update.model_dump(exclude_none=True)
+    version = await data_version_service.bump(db, current_user.id)
+    try:
+        category = await update_owned(
+            db, Category, id, current_user.id, {**update_data, "change_seq": version}, Category.is_default == False
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=DUPLICATE_CATEGORY)
 
     if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-
-    if category.is_default:
-        raise HTTPException(status_code=403, detail="Cannot edit default category")
-
-    # If name or type is being updated, check for uniqueness constraints
-    new_name = category_update.name if category_update.name else category.name
-    new_type = category_update.type if category_update.type else category.type
-    
-    if (category_update.name and category_update.name.lower() != category.name.lower()) or (category_update.type and category_update.type != category.type):
-        existing_category_query = select(Category).where(
-            Category.user_id == current_user.id,
-            Category.type == new_type,
-            Category.name.ilike(new_name),
-            Category.id != id
+        # Only the failure path pays for finding out why
+        is_default = await db.scalar(
+            select(Category.is_default).where(Category.id == id, Category.user_id == current_user.id)
         )
-        existing_category_result = await db.execute(existing_category_query)
-        if existing_category_result.scalars().first():
-            raise HTTPException(
-                status_code=400,
-                detail="A category with this name already exists."
-            )
-
-    update_data = category_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(category, key, value)
+        if is_default is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        raise HTTPException(status_code=403, detail="Cannot edit default category")
 
+    # Category names are baked into summary/analytics snapshots
+    await snapshot_service.invalidate_all(db, current_user.id)
     await db.commit()
-    await db.refresh(category)
+    category_service.invalidate(current_user.id)
     return category
 
 @router.delete("/categories/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -130,7 +128,10 @@ async def delete_category(
         )
 
     await db.delete(category)
+    await data_version_service.tombstone(db, current_user.id, "category", category.id)
+    await snapshot_service.invalidate_all(db, current_user.id)
     await db.commit()
+    category_service.invalidate(current_user.id)
     return None
 
 @router.get("/export")
@@ -144,14 +145,14 @@ async def export_expenses(
 ):
     # Stream the CSV response
     return StreamingResponse(
-        expense_service.export_expenses_to_csv(
+        count_bytes(expense_service.export_expenses_to_csv(
             db, 
             current_user.id, 
             start_date, 
             end_date, 
             category_id, 
             search
-        ),
+        ), "expenses"),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=expenses_{datetime.now().strftime('%Y%m%d')}.csv"}
     )
@@ -160,25 +161,60 @@ from app.schemas.analytics import AnalyticsResponse
 
 @router.get("/analytics", response_model=AnalyticsResponse)
 async def get_analytics(
+    request: Request,
+    response: Response,
     year: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    async def build():
+        data = await expense_service.get_analytics_data(db, current_user.id, year=year)
+        return AnalyticsResponse.model_validate(data).model_dump(mode="json")
+
+    target_year = year or datetime.now().year
+    snapshot = await snapshot_service.get_or_build(db, current_user.id, ANALYTICS, target_year, 0, build)
+    if snapshot:
+        return snapshot_response(request, snapshot)
+
     return await expense_service.get_analytics_data(db, current_user.id, year=year)
 
 @router.get("/", response_model=PaginatedExpenseResponse)
 async def get_expenses(
+    request: Request,
+    response: Response,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     category_id: Optional[int] = None,
     search: Optional[str] = None,
-    page: int = 1,
-    limit: int = 20,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
     sort: str = "date_desc",
+    fields: Optional[str] = Query(None, description="comma-separated subset of the expense fields"),
     db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
     current_user: User = Depends(get_current_user)
 ):
-    return await expense_service.get_expenses_with_filters(
+    """
+    Paged expenses. With `Accept: application/x-ndjson` every matching row
+    is streamed instead, one JSON object per line, and page/limit are ignored.
+    """
+    selected = parse_fields(fields, EXPENSE_FIELDS)
+
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    if wants_ndjson(request):
+        rows = expense_service.stream_expenses(
+            session_factory, current_user.id, start_date, end_date, category_id, search, sort, selected
+        )
+        return ndjson_response(count_bytes(ndjson_lines(rows), "expenses_ndjson"), response)
+
+    page_data = await expense_service.get_expenses_with_filters(
         db=db,
         user_id=current_user.id,
         start_date=start_date,
@@ -187,16 +223,36 @@ async def get_expenses(
         search=search,
         page=page,
         limit=limit,
-        sort=sort
+        sort=sort,
+        fields=selected
     )
+    # Rows come straight from the database in the response shape; skip re-validation
+    return fast_json(page_data, response)
 
 @router.get("/summary/monthly", response_model=DashboardSummaryResponse)
 async def get_dashboard_summary(
+    request: Request,
+    response: Response,
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    async def build():
+        data = await expense_service.get_monthly_summary(db, current_user.id, month, year)
+        return DashboardSummaryResponse.model_validate(data).model_dump(mode="json")
+
+    today = datetime.now()
+    target_year = year or today.year
+    target_month = month or today.month
+    snapshot = await snapshot_service.get_or_build(db, current_user.id, SUMMARY, target_year, target_month, build)
+    if snapshot:
+        return snapshot_response(request, snapshot)
+
     return await expense_service.get_monthly_summary(db, current_user.id, month, year)
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -205,13 +261,12 @@ async def create_expense(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    new_expense = Expense(
-        **expense.model_dump(),
-        user_id=current_user.id
-    )
-    db.add(new_expense)
+    version = await data_version_service.bump(db, current_user.id)
+    new_expense = await insert_returning(db, Expense, {
+        **expense.model_dump(), "user_id": current_user.id, "change_seq": version
+    })
+    await snapshot_service.invalidate(db, current_user.id, new_expense.date)
     await db.commit()
-    await db.refresh(new_expense)
     
     # --- Budget Alert Check ---
     budget_warning = None
@@ -261,10 +316,9 @@ async def create_expense(
                     budget_warning = f"⚠️ Budget warning: You've used {percent}% of your budget."
 
     # Build response
-    response_data = ExpenseResponse.model_validate(new_expense).model_dump(mode='json')
+    response_data = {column.key: getattr(new_expense, column.key) for column in EXPENSE_ROW_COLUMNS}
     response_data["budget_warning"] = budget_warning
-    from fastapi.responses import JSONResponse
-    return JSONResponse(content=response_data, status_code=201)
+    return fast_json(response_data, status_code=201)
 
 @router.put("/{id}", response_model=ExpenseResponse)
 async def update_expense(
@@ -273,25 +327,22 @@ async def update_expense(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Expense).where(Expense.id == id))
-    expense = result.scalars().first()
-
-    if not expense:
-        raise HTTPException(status_code=404, detail="Expense not found")
-    
-    if expense.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this expense")
-
     update_data = expense_update.model_dump(exclude_unset=True)
-    
-    # Map 'date' from schema to 'created_at' in model if present
 
+    # RETURNING only has the new date; read the old one when the expense moves
+    previous_date = None
+    if "date" in update_data:
+        previous_date = await db.scalar(
+            select(Expense.date).where(Expense.id == id, Expense.user_id == current_user.id)
+        )
 
-    for key, value in update_data.items():
-        setattr(expense, key, value)
+    version = await data_version_service.bump(db, current_user.id)
+    expense = await update_owned(db, Expense, id, current_user.id, {**update_data, "change_seq": version})
+    if not expense:
+        raise HTTPException(status_code=404, detail="Expense not found")
 
+    await snapshot_service.invalidate(db, current_user.id, previous_date, expense.date)
     await db.commit()
-    await db.refresh(expense)
 
     return expense
 
@@ -301,13 +352,13 @@ async def delete_expense(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Expense).where(Expense.id == id, Expense.user_id == current_user.id))
-    expense = result.scalars().first()
-    
+    version = await data_version_service.bump(db, current_user.id)
+    expense = await update_owned(db, Expense, id, current_user.id, {"is_deleted": True, "change_seq": version})
+
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
-        
-    expense.is_deleted = True
+
+    await snapshot_service.invalidate(db, current_user.id, expense.date)
     await db.commit()
     
     return None
@@ -315,17 +366,87 @@ async def delete_expense(
 @router.patch("/{id}/restore", response_model=ExpenseResponse)
 async def restore_expense(
     id: UUID,
+    category_id: Optional[int] = Query(None, description="Category for an archived expense whose category was deleted"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Expense).where(Expense.id == id, Expense.user_id == current_user.id))
-    expense = result.scalars().first()
-    
+    version = await data_version_service.bump(db, current_user.id)
+    expense = await update_owned(db, Expense, id, current_user.id, {"is_deleted": False, "change_seq": version})
+
+    if not expense:
+        # Deleted long enough ago that the retention job archived it
+        expense = await archive_service.unarchive(db, id, current_user.id, category_id)
+        if expense:
+            expense.is_deleted = False
+            expense.change_seq = version
+
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
-        
-    expense.is_deleted = False
+
+    await snapshot_service.invalidate(db, current_user.id, expense.date)
     await db.commit()
-    await db.refresh(expense)
     
     return expense
+
+async def _apply_bulk(db, user: User, action: ExpenseBulkAction, values: dict, month, year, *where) -> dict:
+    """Run one set-based expense UPDATE and return the count with the refreshed summary and budgets."""
+    user_id = user.id  # the rollback below expires the user
+    version = await data_version_service.bump(db, user_id)
+    filters = action.filter.model_dump() if action.filter else None
+    dates = await expense_service.bulk_update(
+        db, user_id, {**values, "change_seq": version}, action.ids, filters, *where
+    )
+    if dates:
+        await snapshot_service.invalidate(db, user_id, *set(dates))
+        await db.commit()
+    else:
+        # Nothing matched; keep the data version (and every ETag) as it was
+        await db.rollback()
+
+    return {
+        "affected": len(dates),
+        "summary": await expense_service.get_monthly_summary(db, user_id, month, year),
+        "budgets": await budget_service.get_budget_progress(db, user_id, month, year),
+    }
+
+@router.post("/bulk/delete", response_model=ExpenseBulkResponse)
+async def bulk_delete_expenses(
+    action: ExpenseBulkAction,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Soft-delete the given expenses, or every one matching the filter. Returns the summary and budgets for month/year."""
+    return await _apply_bulk(db, current_user, action, {"is_deleted": True}, month, year, Expense.is_deleted == False)
+
+@router.post("/bulk/restore", response_model=ExpenseBulkResponse)
+async def bulk_restore_expenses(
+    action: ExpenseBulkAction,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Restore soft-deleted expenses. Archived ones have to be restored one at a time."""
+    return await _apply_bulk(db, current_user, action, {"is_deleted": False}, month, year, Expense.is_deleted == True)
+
+@router.post("/bulk/recategorize", response_model=ExpenseBulkResponse)
+async def bulk_recategorize_expenses(
+    action: ExpenseRecategorize,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    year: Optional[int] = Query(None, ge=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Move expenses to another category. Soft-deleted matches move too, so the
+    old category can be deleted afterwards.
+    """
+    target = await category_service.get_category(db, current_user.id, action.target_category_id)
+    if target is None or target.type != "expense":
+        raise HTTPException(status_code=400, detail="Invalid category. Must be an expense category belonging to the user.")
+
+    return await _apply_bulk(
+        db, current_user, action, {"category_id": target.id}, month, year, Expense.category_id != target.id
+    )
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
-from app.db.session import get_db
-from app.services.income_service import income_service
+from app.db.session import get_db, get_session_factory
+from app.services.income_service import income_service, INCOME_FIELDS
+from app.services.category_service import category_service
 from app.schemas.income import IncomeCreate, IncomeUpdate, IncomeResponse, IncomeListResponse
 from app.models.user import User
 from app.models.income import Income
 from app.core.security import get_current_user
+from app.core.http_cache import not_modified
+from app.core.metrics import count_bytes
+from app.core.responses import fast_json, wants_ndjson, ndjson_lines, ndjson_response
+from app.core.fieldsets import parse_fields
 
 
 router = APIRouter(prefix="/incomes", tags=["Incomes"])
@@ -23,16 +28,16 @@ async def create_income(
 ):
     # If category_id is provided, verify it belongs to user and is of type 'income'
     if income.category_id:
-        from app.models.category import Category
-        from sqlalchemy import select
-        result = await db.execute(select(Category).where(Category.id == income.category_id, Category.user_id == current_user.id, Category.type == 'income'))
-        if not result.scalars().first():
+        category = await category_service.get_category(db, current_user.id, income.category_id)
+        if not category or category.type != 'income':
              raise HTTPException(status_code=400, detail="Invalid category. Must be an income category belonging to the user.")
 
     return await income_service.create_income(db, income, current_user.id)
 
 @router.get("/", response_model=IncomeListResponse)
 async def get_incomes(
+    request: Request,
+    response: Response,
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     category_id: Optional[int] = Query(None),
@@ -40,10 +45,28 @@ async def get_incomes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort: str = Query("date_desc"),
+    fields: Optional[str] = Query(None, description="comma-separated subset of the income fields"),
     db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
     current_user: User = Depends(get_current_user)
 ):
-    return await income_service.get_incomes(db, current_user.id, start_date, end_date, category_id, search, page, limit, sort)
+    """Paged incomes, or every matching row as NDJSON (see GET /expenses/)."""
+    selected = parse_fields(fields, INCOME_FIELDS)
+
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    if wants_ndjson(request):
+        rows = income_service.stream_incomes(
+            session_factory, current_user.id, start_date, end_date, category_id, search, sort, selected
+        )
+        return ndjson_response(count_bytes(ndjson_lines(rows), "incomes_ndjson"), response)
+
+    page_data = await income_service.get_incomes(
+        db, current_user.id, start_date, end_date, category_id, search, page, limit, sort, fields=selected
+    )
+    return fast_json(page_data, response)
 
 @router.get("/{id}", response_model=IncomeResponse)
 async def get_income(
@@ -112,7 +135,7 @@ async def export_incomes_csv(
             output.truncate(0)
 
     return StreamingResponse(
-        generate(),
+        count_bytes(generate(), "incomes"),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=incomes_export.csv"}
     )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.core.config import settings
+from app.core import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """
+    Prometheus scrape endpoint. Disabled unless METRICS_ENABLED is set, and
+    only served to addresses in METRICS_ALLOWED_IPS.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not request.client or not metrics.is_allowed(request.client.host):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
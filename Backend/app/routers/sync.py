@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.core.security import get_current_user
+from app.services.sync_service import sync_service
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+@router.get("", response_model=SyncResponse)
+async def get_changes(
+    since: Optional[str] = Query(None, description="Token from the previous sync; omit for an initial sync"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of rows in one page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await sync_service.get_changes(
+        db,
+        current_user.id,
+        current_version=current_user.data_version or 0,
+        since=since,
+        limit=limit
+    )
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+
+from app.db.session import get_db, get_session_factory
+from app.models.user import User
+from app.schemas.transaction import TransactionPageResponse
+from app.core.security import get_current_user
+from app.core.http_cache import not_modified
+from app.core.metrics import count_bytes
+from app.core.fieldsets import parse_fields
+from app.core.responses import fast_json
+from app.services.transaction_service import transaction_service, TRANSACTION_FIELDS, CSV_FIELDS
+
+router = APIRouter(prefix="/transactions", tags=["Transactions"])
+
+@router.get("/", response_model=TransactionPageResponse)
+async def get_transactions(
+    request: Request,
+    response: Response,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    category_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    with_balance: bool = Query(False),
+    fields: Optional[str] = Query(None, description="comma-separated subset of the transaction fields"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    selected = parse_fields(fields, TRANSACTION_FIELDS)
+
+    cached = not_modified(request, response, current_user)
+    if cached:
+        return cached
+
+    page_data = await transaction_service.get_transactions(
+        db,
+        current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        search=search,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        cursor=cursor,
+        limit=limit,
+        with_balance=with_balance,
+        fields=selected
+    )
+    if selected:
+        # Partial rows don't satisfy TransactionResponse; send them as they are
+        return fast_json(page_data, response)
+    return page_data
+
+@router.get("/export")
+async def export_transactions(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    category_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    fields: Optional[str] = Query(None, description="comma-separated CSV columns"),
+    session_factory=Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    selected = parse_fields(fields, CSV_FIELDS)
+
+    return StreamingResponse(
+        count_bytes(transaction_service.export_transactions_to_csv(
+            session_factory,
+            current_user.id,
+            start_date,
+            end_date,
+            category_id,
+            search,
+            min_amount,
+            max_amount,
+            selected
+        ), "transactions"),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.csv"}
+    )
@@ -2,8 +2,10 @@ from pydantic import BaseModel, field_validator, ConfigDict
 from decimal import Decimal
 from typing import Optional, Any
 
+from app.schemas.money import MoneyAmount
+
 class BudgetBase(BaseModel):
-    amount: Decimal
+    amount: MoneyAmount
     month: int
     year: int
 
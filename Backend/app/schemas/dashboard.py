@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.expense import ExpenseResponse, DashboardSummaryResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.budget import BudgetStatusResponse
+
+class DashboardResponse(BaseModel):
+    summary: DashboardSummaryResponse
+    recent_expenses: List[ExpenseResponse]
+    categories: List[CategoryResponse]
+    budgets: List[BudgetStatusResponse]
@@ -1,11 +1,14 @@
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 from decimal import Decimal
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
 
+from app.schemas.budget import BudgetStatusResponse
+from app.schemas.money import MoneyAmount
+
 class ExpenseBase(BaseModel):
-    amount: Decimal
+    amount: MoneyAmount
     description: Optional[str] = None
     category_id: int
 
@@ -33,7 +36,7 @@ class ExpenseResponse(ExpenseBase):
     model_config = ConfigDict(from_attributes=True)
 
 class ExpenseUpdate(BaseModel):
-    amount: Optional[Decimal] = None
+    amount: Optional[MoneyAmount] = None
     description: Optional[str] = None
     category_id: Optional[int] = None
     date: Optional[datetime] = None
@@ -82,3 +85,35 @@ class DashboardSummaryResponse(BaseModel):
     prev_month_income: Decimal
     by_category: List[CategorySummary]
     daily: List[DailySummary]
+
+class ExpenseFilter(BaseModel):
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    category_id: Optional[int] = None
+    search: Optional[str] = None
+
+    @model_validator(mode='after')
+    def has_criteria(self):
+        # An empty filter matches every expense; bulk actions take ids for that
+        if self.start_date is None and self.end_date is None and self.category_id is None and not self.search:
+            raise ValueError('Filter needs at least one criterion')
+        return self
+
+class ExpenseBulkAction(BaseModel):
+    """Either explicit ids or a filter (same meaning as on GET /expenses/), not both."""
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[ExpenseFilter] = None
+
+    @model_validator(mode='after')
+    def ids_or_filter(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Provide either ids or filter')
+        return self
+
+class ExpenseRecategorize(ExpenseBulkAction):
+    target_category_id: int
+
+class ExpenseBulkResponse(BaseModel):
+    affected: int
+    summary: DashboardSummaryResponse
+    budgets: List[BudgetStatusResponse]
@@ -0,0 +1,8 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+# Amounts are kept to the cent whatever MONEY_STORAGE is: 12.345 is 12.35
+# both as stored (NUMERIC(_, 2) or BIGINT cents) and as echoed back.
+MoneyAmount = Annotated[Decimal, AfterValidator(lambda v: v.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))]
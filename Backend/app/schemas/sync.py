@@ -0,0 +1,65 @@
+from pydantic import BaseModel, ConfigDict
+from decimal import Decimal
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List
+
+class SyncExpense(BaseModel):
+    id: UUID
+    amount: Decimal
+    description: Optional[str] = None
+    category_id: int
+    date: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    change_seq: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncIncome(BaseModel):
+    id: UUID
+    amount: float
+    source: str
+    description: Optional[str] = None
+    category_id: Optional[int] = None
+    date: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    change_seq: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncCategory(BaseModel):
+    id: int
+    name: str
+    type: str
+    is_default: bool
+    updated_at: Optional[datetime] = None
+    change_seq: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncBudget(BaseModel):
+    id: int
+    category_id: Optional[int] = None
+    amount: Decimal
+    month: int
+    year: int
+    updated_at: Optional[datetime] = None
+    change_seq: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SyncDeletion(BaseModel):
+    entity: str # "expense", "income", "category" or "budget"
+    id: str
+    change_seq: int
+
+class SyncResponse(BaseModel):
+    token: str # pass back as `since` to fetch the next changes; a data version once caught up
+    has_more: bool
+    expenses: List[SyncExpense]
+    incomes: List[SyncIncome]
+    categories: List[SyncCategory]
+    budgets: List[SyncBudget]
+    deleted: List[SyncDeletion]
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict
+from decimal import Decimal
+from uuid import UUID
+from datetime import datetime
+from typing import Optional, List
+
+class TransactionResponse(BaseModel):
+    id: UUID
+    type: str # "income" or "expense"
+    date: datetime
+    amount: Decimal
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    source: Optional[str] = None # incomes only
+    created_at: Optional[datetime] = None
+    running_balance: Optional[Decimal] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TransactionPageResponse(BaseModel):
+    limit: int
+    next_cursor: Optional[str] = None
+    data: List[TransactionResponse]
@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException, ConflictException
+from app.core.logging import logger
+from app.models.archive import ExpenseArchive
+from app.models.expense import Expense
+from app.models.sync import SyncTombstone
+from app.services.category_service import category_service
+from app.services.data_version_service import data_version_service
+from app.services.snapshot_service import snapshot_service
+
+# Columns shared by Expense and ExpenseArchive
+ARCHIVED_COLUMNS = (
+    "id", "user_id", "amount", "category_id", "description",
+    "is_deleted", "date", "created_at", "updated_at", "change_seq",
+)
+
+DELETED = "deleted"
+HISTORY = "history"
+
+
+class ArchiveService:
+    async def _move(self, db: AsyncSession, ids, reason: str):
+        """Copy the expenses with `ids` into the archive and delete them from the hot table."""
+        columns = [getattr(Expense, name) for name in ARCHIVED_COLUMNS]
+        await db.execute(
+            insert(ExpenseArchive).from_select(
+                [*ARCHIVED_COLUMNS, "reason"],
+                select(*columns, literal(reason)).where(Expense.id.in_(ids))
+            )
+        )
+        await db.execute(delete(Expense).where(Expense.id.in_(ids)))
+
+    def _batch(self, query, batch_size: int, dialect: str):
+        query = query.order_by(Expense.id).limit(batch_size)
+        if dialect == "postgresql":
+            # Several archivers (or a live restore) never wait on each other's rows
+            query = query.with_for_update(skip_locked=True)
+        return query
+
+    async def archive_deleted_batch(self, db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one batch of expenses soft-deleted before `cutoff` to the
+        archive. Clients have already synced them as deletions at their
+        change_seq, so each gets a tombstone at that same sequence for
+        clients that sync from further back. The caller commits.
+        """
+        query = select(Expense.id, Expense.user_id, Expense.change_seq).where(
+            Expense.is_deleted == True,
+            func.coalesce(Expense.updated_at, Expense.created_at) < cutoff
+        )
+        rows = (await db.execute(self._batch(query, batch_size, db.bind.dialect.name))).all()
+        if not rows:
+            return 0
+
+        db.add_all([
+            SyncTombstone(user_id=row.user_id, entity="expense", entity_id=str(row.id), change_seq=row.change_seq)
+            for row in rows
+        ])
+        await db.flush()
+        await self._move(db, [row.id for row in rows], DELETED)
+        return len(rows)
+
+    async def archive_history_batch(self, db: AsyncSession, before: datetime, batch_size: int) -> int:
+        """
+        Move one batch of live expenses dated before `before` to the archive.
+        They disappear from every view, so each affected user gets a new data
+        version, tombstones and invalidated snapshots. The caller commits.
+        """
+        query = select(Expense.id, Expense.user_id, Expense.date).where(
+            Expense.is_deleted == False,
+            Expense.date < before
+        )
+        rows = (await db.execute(self._batch(query, batch_size, db.bind.dialect.name))).all()
+        if not rows:
+            return 0
+
+        by_user = {}
+        for row in rows:
+            by_user.setdefault(row.user_id, []).append(row)
+        for user_id, user_rows in by_user.items():
+            version = await data_version_service.bump(db, user_id)
+            db.add_all([
+                SyncTombstone(user_id=user_id, entity="expense", entity_id=str(row.id), change_seq=version)
+                for row in user_rows
+            ])
+            await snapshot_service.invalidate(db, user_id, *{row.date for row in user_rows})
+        await db.flush()
+        await self._move(db, [row.id for row in rows], HISTORY)
+        return len(rows)
+
+    async def run(
+        self,
+        session_factory,
+        deleted_after_days: int = settings.ARCHIVE_DELETED_AFTER_DAYS,
+        history_after_years: int = settings.ARCHIVE_HISTORY_AFTER_YEARS,
+        batch_size: int = settings.ARCHIVE_BATCH_SIZE,
+        pause_ms: float = settings.ARCHIVE_BATCH_PAUSE_MS,
+        max_batches: Optional[int] = None,
+    ) -> dict:
+        """
+        Apply the retention policy in batches of `batch_size`, each in its own
+        short transaction, sleeping `pause_ms` between batches so the job
+        never holds locks or saturates I/O for long. History archival is off
+        when `history_after_years` is 0. Returns rows moved per reason.
+        """
+        now = datetime.now(timezone.utc)
+        jobs = [(DELETED, self.archive_deleted_batch, now - timedelta(days=deleted_after_days))]
+        if history_after_years:
+            # Whole years, so archived history lines up with closed periods
+            before = datetime(now.year - history_after_years, 1, 1, tzinfo=timezone.utc)
+            jobs.append((HISTORY, self.archive_history_batch, before))
+
+        moved = {DELETED: 0, HISTORY: 0}
+        batches = 0
+        for reason, archive_batch, cutoff in jobs:
+            while max_batches is None or batches < max_batches:
+                async with session_factory() as db:
+                    count = await archive_batch(db, cutoff, batch_size)
+                    await db.commit()
+                batches += 1
+                moved[reason] += count
+                if count < batch_size:
+                    break
+                await asyncio.sleep(pause_ms / 1000)
+
+        logger.info(f"ARCHIVE: moved {moved[DELETED]} deleted and {moved[HISTORY]} historical expenses "
+                    f"in {batches} batches")
+        return moved
+
+    async def unarchive(
+        self, db: AsyncSession, expense_id: UUID, user_id: UUID, category_id: Optional[int] = None
+    ) -> Optional[Expense]:
+        """
+        Move an archived expense back into the hot table so restore works the
+        same whether or not the retention job has run. The caller stamps,
+        invalidates and commits.
+
+        Nothing references the category of an archived expense, so it may
+        have been deleted since. The expense then goes to `category_id`, and
+        without one a ConflictException leaves it in the archive.
+        """
+        result = await db.execute(
+            select(ExpenseArchive).where(ExpenseArchive.id == expense_id, ExpenseArchive.user_id == user_id)
+        )
+        archived = result.scalars().first()
+        if not archived:
+            return None
+
+        values = {name: getattr(archived, name) for name in ARCHIVED_COLUMNS}
+        if await category_service.get_category(db, user_id, archived.category_id) is None:
+            if category_id is None:
+                raise ConflictException(
+                    "The expense's category has been deleted. Restore it into another category with category_id.",
+                    details={"category_id": archived.category_id}
+                )
+            category = await category_service.get_category(db, user_id, category_id)
+            if category is None or category.type != "expense":
+                raise BadRequestException("Invalid category. Must be an expense category belonging to the user.")
+            values["category_id"] = category.id
+
+        expense = Expense(**values)
+        await db.delete(archived)
+        db.add(expense)
+        return expense
+
+archive_service = ArchiveService()
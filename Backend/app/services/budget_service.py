@@ -0,0 +1,90 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from app.models.budget import Budget
+from app.models.expense import Expense
+from app.schemas.budget import BudgetStatusResponse
+from app.services.category_service import category_service
+from app.services.ledger_service import ledger_service
+
+class BudgetService:
+    async def get_budget_progress(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        month: Optional[int] = None,
+        year: Optional[int] = None
+    ) -> List[BudgetStatusResponse]:
+        now = datetime.now()
+        target_month = month or now.month
+        target_year = year or now.year
+        
+        start_date = datetime(target_year, target_month, 1)
+        if target_month == 12:
+            end_date = datetime(target_year + 1, 1, 1)
+        else:
+            end_date = datetime(target_year, target_month + 1, 1)
+
+        # 1. Get all budgets for the month; category names come from the category cache
+        budgets_query = select(Budget).where(
+            Budget.user_id == user_id,
+            Budget.month == target_month,
+            Budget.year == target_year
+        )
+        budgets_result = await db.execute(budgets_query)
+        budgets = budgets_result.scalars().all()
+
+        # 2. Get expenses aggregated by category (Single Query for N+1 fix)
+        expense_query = select(
+            Expense.category_id, 
+            func.sum(Expense.amount).label("total")
+        ).where(
+            Expense.user_id == user_id,
+            Expense.date >= start_date,
+            Expense.date < end_date,
+            Expense.is_deleted == False
+        ).group_by(Expense.category_id)
+        
+        ledger = await ledger_service.get_ledger(db, user_id)
+        if ledger:
+            spent_by_category = ledger.expense_by_category(start_date, end_date)
+        else:
+            expense_result = await db.execute(expense_query)
+            spent_by_category = {row.category_id: (row.total or Decimal(0)) for row in expense_result}
+        categories = await category_service.get_category_map(
+            db, user_id, ensure=[budget.category_id for budget in budgets]
+        )
+        total_spent_all = sum(spent_by_category.values()) if spent_by_category else Decimal(0)
+        
+        response = []
+        
+        for budget in budgets:
+            category_name = "Global"
+            
+            if budget.category_id:
+                spent = spent_by_category.get(budget.category_id, Decimal(0))
+                category = categories.get(budget.category_id)
+                category_name = category.name if category else "Unknown"
+            else:
+                spent = total_spent_all
+            
+            percent_used = (float(spent) / float(budget.amount)) * 100 if budget.amount > 0 else 0
+            
+            response.append(BudgetStatusResponse(
+                id=budget.id,
+                category_id=budget.category_id,
+                category_name=category_name,
+                budget=budget.amount,
+                spent=spent,
+                remaining=budget.amount - spent,
+                percent_used=round(percent_used, 2)
+            ))
+            
+        return response
+
+budget_service = BudgetService()
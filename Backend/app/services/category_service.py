@@ -1,19 +1,113 @@
+import time
+from collections import OrderedDict
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
 from uuid import UUID
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.db.writes import insert_ignoring_conflicts
 from app.models.category import Category
+from app.services.data_version_service import data_version_service
+
+class CategoryInfo(NamedTuple):
+    id: int
+    name: str
+    type: str
+    is_default: bool
 
 class CategoryService:
+    """
+    Category lookups go through a per-user dictionary (id -> CategoryInfo)
+    kept in process memory, so aggregate queries group by category_id and
+    names are filled in afterwards instead of joining categories.
+
+    Each entry records the user's data version it was read at, and every
+    lookup compares it with the request's version (loaded with the user by
+    get_current_user, so usually no extra query): any write on any worker
+    advances the version, so renames and deletes made elsewhere are never
+    served stale, neither to ETag-validated responses nor into stored
+    snapshots. CATEGORY_CACHE_TTL_SECONDS only bounds rows written outside
+    the API.
+    """
+
+    def __init__(self):
+        self._cache: "OrderedDict[UUID, tuple]" = OrderedDict()  # user -> (loaded_at, version, categories)
+
+    def default_category_rows(self, user_ids: Iterable[UUID]) -> List[dict]:
+        return [
+            {"user_id": user_id, "name": name, "type": type, "is_default": True}
+            for user_id in user_ids
+            for type, names in settings.DEFAULT_CATEGORIES.items()
+            for name in names
+        ]
+
+    async def seed_categories(self, db: AsyncSession, user_ids: Sequence[UUID]):
+        """
+        Give every user in `user_ids` the DEFAULT_CATEGORIES template in one
+        INSERT ... ON CONFLICT DO NOTHING; categories a user already has
+        (ignoring case) are left alone. The caller commits and then
+        invalidates the users' cache entries.
+        """
+        rows = self.default_category_rows(user_ids)
+        if rows:
+            await db.execute(insert_ignoring_conflicts(Category, db.bind.dialect.name), rows)
+
     async def seed_user_categories(self, db: AsyncSession, user_id: UUID):
-        default_categories = ["Food", "Transport", "Bills", "Entertainment", "Shopping"]
-        
-        for name in default_categories:
-            # Check if exists (idempotency, though user is new)
-            result = await db.execute(select(Category).where(Category.name == name, Category.user_id == user_id))
-            if not result.scalars().first():
-                new_category = Category(name=name, user_id=user_id, is_default=True)
-                db.add(new_category)
-        
+        await self.seed_categories(db, [user_id])
         await db.commit()
+        self.invalidate(user_id)
+
+    async def get_category_map(
+        self, db: AsyncSession, user_id: UUID, ensure: Iterable[Optional[int]] = ()
+    ) -> Dict[int, CategoryInfo]:
+        """
+        The user's categories by id, from the cache when it was read at the
+        current data version and holds every id in `ensure`, otherwise
+        reread in one query.
+        """
+        version = await data_version_service.current(db, user_id)
+        entry = self._cache.get(user_id)
+        if entry is not None:
+            loaded_at, cached_version, categories = entry
+            fresh = (
+                cached_version == version
+                and time.monotonic() - loaded_at < settings.CATEGORY_CACHE_TTL_SECONDS
+            )
+            if fresh and all(id is None or id in categories for id in ensure):
+                self._cache.move_to_end(user_id)
+                record_cache("categories", hit=True)
+                return categories
+        record_cache("categories", hit=False)
+
+        result = await db.execute(
+            select(Category.id, Category.name, Category.type, Category.is_default)
+            .where(Category.user_id == user_id)
+            .order_by(Category.id)
+        )
+        categories = {row.id: CategoryInfo(*row) for row in result}
+        if data_version_service.uncommitted(db, user_id):
+            # Read inside a write that may still roll back
+            return categories
+        self._cache[user_id] = (time.monotonic(), version, categories)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > settings.CATEGORY_CACHE_MAX_USERS:
+            self._cache.popitem(last=False)
+        return categories
+
+    async def get_category(self, db: AsyncSession, user_id: UUID, category_id: int) -> Optional[CategoryInfo]:
+        categories = await self.get_category_map(db, user_id, ensure=[category_id])
+        return categories.get(category_id)
+
+    def invalidate(self, user_id: UUID):
+        """Forget a user's categories; call after committing a category write."""
+        self._cache.pop(user_id, None)
+
+    def clear(self):
+        self._cache.clear()
+
+    async def get_categories(self, db: AsyncSession, user_id: UUID, type: Optional[str] = None):
+        categories = await self.get_category_map(db, user_id)
+        return [c._asdict() for c in categories.values() if not type or c.type == type]
 
 category_service = CategoryService()
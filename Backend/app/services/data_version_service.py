@@ -0,0 +1,96 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import event, select, update
+from typing import Optional
+from uuid import UUID
+
+from app.models.user import User
+from app.models.sync import SyncTombstone
+
+# Users whose data version this session bumped and hasn't committed yet
+_BUMPED = "data_version_bumped"
+# The data version this session last read or wrote, per user
+_VERSIONS = "data_versions"
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_bumps(session):
+    session.info.pop(_BUMPED, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_versions(session):
+    # Rolled back versions will be reused by the next write
+    session.info.pop(_BUMPED, None)
+    session.info.pop(_VERSIONS, None)
+
+
+class DataVersionService:
+    async def bump(self, db: AsyncSession, user_id: UUID) -> int:
+        """
+        Increment the user's data version and return the new value.
+        Called by every write handler before it commits; the row lock on
+        the user keeps versions monotonic across concurrent writers.
+        """
+        # Keep pending rows unflushed so they are written once, already stamped
+        with db.no_autoflush:
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(data_version=User.data_version + 1)
+                .returning(User.data_version)
+            )
+        version = result.scalar_one()
+        db.info.setdefault(_BUMPED, set()).add(user_id)
+        db.info.setdefault(_VERSIONS, {})[user_id] = version
+        return version
+
+    def remember(self, db: AsyncSession, user: User):
+        """
+        Record the data version of a user row the session just loaded, so
+        current() doesn't read it again. get_current_user does this for the
+        caller, which keeps cache lookups in line with the request's ETag.
+        """
+        db.info.setdefault(_VERSIONS, {})[user.id] = user.data_version or 0
+
+    async def current(self, db: AsyncSession, user_id: UUID) -> Optional[int]:
+        """
+        The user's data version, or None if there is no such user. Read once
+        per session: later calls return the version remembered from that
+        read, from the authenticated user, or from this session's own bump.
+        """
+        versions = db.info.setdefault(_VERSIONS, {})
+        if user_id not in versions:
+            version = await db.scalar(select(User.data_version).where(User.id == user_id))
+            if version is None:
+                return None
+            versions[user_id] = version
+        return versions[user_id]
+
+    def uncommitted(self, db: AsyncSession, user_id: UUID) -> bool:
+        """
+        Whether this session bumped the user's version and hasn't committed.
+        That version may yet be rolled back and reused by another write, so
+        in-process caches must not be stored under it.
+        """
+        return user_id in db.info.get(_BUMPED, ())
+
+    async def stamp(self, db: AsyncSession, user_id: UUID, *rows) -> int:
+        """Bump the data version and record it as the change_seq of the written rows."""
+        version = await self.bump(db, user_id)
+        for row in rows:
+            row.change_seq = version
+        return version
+
+    async def tombstone(self, db: AsyncSession, user_id: UUID, entity: str, entity_id) -> int:
+        """Bump the data version and record a hard delete for sync clients."""
+        version = await self.bump(db, user_id)
+        db.add(SyncTombstone(
+            user_id=user_id,
+            entity=entity,
+            entity_id=str(entity_id),
+            change_seq=version
+        ))
+        return version
+
+data_version_service = DataVersionService()
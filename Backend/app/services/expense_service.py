@@ -1,11 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, asc
+from sqlalchemy import func, desc, asc, update
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 
 from app.models.expense import Expense
+from app.core.config import settings
+from app.db.functions import day_start, year_month
+from app.services.category_service import category_service
+from app.services.ledger_service import ledger_service
+
+# ExpenseResponse fields, in its field order, for list queries that return
+# plain rows instead of ORM entities
+EXPENSE_ROW_COLUMNS = (
+    Expense.amount,
+    Expense.description,
+    Expense.category_id,
+    Expense.id,
+    Expense.user_id,
+    Expense.date,
+    Expense.created_at,
+)
+EXPENSE_FIELDS = tuple(column.key for column in EXPENSE_ROW_COLUMNS)
 
 class ExpenseService:
     def _apply_filters(self, query, start_date, end_date, category_id, search):
@@ -22,19 +39,37 @@ class ExpenseService:
             query = query.where(Expense.description.ilike(f"%{search}%"))
         return query
 
-    async def get_expenses_with_filters(
+    async def bulk_update(
         self,
         db: AsyncSession,
         user_id: UUID,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        category_id: Optional[int] = None,
-        search: Optional[str] = None,
-        page: int = 1,
-        limit: int = 20,
-        sort: str = "date_desc"
-    ):
-        query = select(Expense).where(Expense.user_id == user_id, Expense.is_deleted == False)
+        values: dict,
+        ids: Optional[List[UUID]] = None,
+        filters: Optional[dict] = None,
+        *where
+    ) -> List[datetime]:
+        """
+        Apply `values` to the user's expenses with the given `ids`, or to all
+        of them matching `filters` (the _apply_filters arguments), in one
+        UPDATE. Extra `where` clauses skip rows that are already in the
+        target state. Returns the dates of the rows changed. The caller
+        commits.
+        """
+        query = update(Expense).where(Expense.user_id == user_id, *where)
+        if ids is not None:
+            query = query.where(Expense.id.in_(ids))
+        else:
+            query = self._apply_filters(query, **filters)
+
+        result = await db.execute(
+            query.values(**values).returning(Expense.date).execution_options(synchronize_session=False)
+        )
+        return result.scalars().all()
+
+    def _list_query(self, user_id, start_date, end_date, category_id, search, sort, fields):
+        # A narrow projection lets Postgres answer from ix_expenses_user_date_covering
+        columns = [c for c in EXPENSE_ROW_COLUMNS if fields is None or c.key in fields]
+        query = select(*columns).where(Expense.user_id == user_id, Expense.is_deleted == False)
 
         # Apply Filters
         query = self._apply_filters(query, start_date, end_date, category_id, search)
@@ -48,6 +83,22 @@ class ExpenseService:
             query = query.order_by(asc(Expense.date))
         else: # default date_desc
             query = query.order_by(desc(Expense.date))
+        return query
+
+    async def get_expenses_with_filters(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        page: int = 1,
+        limit: int = 20,
+        sort: str = "date_desc",
+        fields: Optional[List[str]] = None
+    ):
+        query = self._list_query(user_id, start_date, end_date, category_id, search, sort, fields)
 
         # Count total
         count_query = select(func.count()).select_from(query.subquery())
@@ -59,7 +110,7 @@ class ExpenseService:
         query = query.offset(offset).limit(limit)
 
         result = await db.execute(query)
-        expenses = result.scalars().all()
+        expenses = [dict(row._mapping) for row in result]
 
         return {
             "total": total,
@@ -68,6 +119,36 @@ class ExpenseService:
             "data": expenses
         }
 
+    async def stream_expenses(
+        self,
+        session_factory,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        sort: str = "date_desc",
+        fields: Optional[List[str]] = None
+    ):
+        """
+        Every matching row, read through a server-side cursor in batches of
+        STREAM_YIELD_PER. Opens its own session because the request's session
+        is closed before a streaming response starts sending.
+        """
+        query = self._list_query(user_id, start_date, end_date, category_id, search, sort, fields)
+        async with session_factory() as db:
+            result = await db.stream(query.execution_options(yield_per=settings.STREAM_YIELD_PER))
+            async for row in result:
+                yield dict(row._mapping)
+
+    async def get_recent_expenses(self, db: AsyncSession, user_id: UUID, limit: int = 5):
+        query = select(Expense).where(
+            Expense.user_id == user_id,
+            Expense.is_deleted == False
+        ).order_by(desc(Expense.date)).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
     async def export_expenses_to_csv(
         self,
         db: AsyncSession,
@@ -79,10 +160,9 @@ class ExpenseService:
     ):
         import csv
         import io
-        from app.models.category import Category
 
-        # Join with Category to get names
-        query = select(Expense).join(Category).where(Expense.user_id == user_id, Expense.is_deleted == False)
+        # Category names come from the cached dictionary, not a join
+        query = select(Expense).where(Expense.user_id == user_id, Expense.is_deleted == False)
         
         # Apply reusing filters
         query = self._apply_filters(query, start_date, end_date, category_id, search)
@@ -92,6 +172,9 @@ class ExpenseService:
         
         result = await db.execute(query)
         expenses = result.scalars().all()
+        categories = await category_service.get_category_map(
+            db, user_id, ensure={expense.category_id for expense in expenses}
+        )
         
         # Generator for StreamingResponse
         output = io.StringIO()
@@ -106,7 +189,7 @@ class ExpenseService:
         for expense in expenses:
             writer.writerow([
                 expense.date.strftime("%Y-%m-%d"),
-                expense.category.name,
+                categories[expense.category_id].name,
                 f"{expense.amount:.2f}",
                 expense.description or "",
                 expense.created_at.strftime("%Y-%m-%d %H:%M:%S")
@@ -116,7 +199,6 @@ class ExpenseService:
             output.truncate(0)
 
     async def get_analytics_data(self, db: AsyncSession, user_id: UUID, year: Optional[int] = None):
-        from app.models.category import Category
         from datetime import timezone as tz
         
         today = datetime.now()
@@ -125,30 +207,41 @@ class ExpenseService:
         start_of_year = datetime(target_year, 1, 1, 0, 0, 0, tzinfo=tz.utc)
         end_of_year = datetime(target_year + 1, 1, 1, 0, 0, 0, tzinfo=tz.utc)
         
-        # 1. Category Breakdown — select from Expense, join Category explicitly
+        # Hot users aggregate from their in-memory ledger, everyone else in SQL
+        ledger = await ledger_service.get_ledger(db, user_id)
+
+        # 1. Category Breakdown — aggregate by id, names come from the category cache
         cat_query = select(
-            Category.name,
+            Expense.category_id,
             func.sum(Expense.amount).label("total")
-        ).select_from(Expense).join(
-            Category, Expense.category_id == Category.id
         ).where(
             Expense.user_id == user_id,
             Expense.is_deleted == False,
             Expense.date >= start_of_year,
             Expense.date < end_of_year
-        ).group_by(Category.name).order_by(func.sum(Expense.amount).desc())
+        ).group_by(Expense.category_id)
         
-        cat_result = await db.execute(cat_query)
-        categories_data = cat_result.all()
+        if ledger:
+            category_totals = ledger.expense_by_category(start_of_year, end_of_year)
+        else:
+            cat_result = await db.execute(cat_query)
+            category_totals = {row.category_id: row.total for row in cat_result}
+        categories = await category_service.get_category_map(db, user_id, ensure=category_totals)
+
+        # Categories that share a name are reported together
+        totals_by_name = {}
+        for category_id, total in category_totals.items():
+            name = categories[category_id].name
+            totals_by_name[name] = totals_by_name.get(name, 0) + total
         
-        total_year_expense = sum([row.total for row in categories_data]) or 1  # Avoid division by zero
+        total_year_expense = sum(totals_by_name.values()) or 1  # Avoid division by zero
         
         category_breakdown = []
-        for row in categories_data:
-            percentage = (row.total / total_year_expense) * 100
+        for name, total in sorted(totals_by_name.items(), key=lambda item: item[1], reverse=True):
+            percentage = (total / total_year_expense) * 100
             category_breakdown.append({
-                "category_name": row.name,
-                "total_amount": float(row.total),
+                "category_name": name,
+                "total_amount": float(total),
                 "percentage": round(percentage, 2)
             })
             
@@ -157,7 +250,7 @@ class ExpenseService:
 
         # Expense Trend
         expense_trend_query = select(
-            func.to_char(Expense.date, 'YYYY-MM').label("month"),
+            year_month(Expense.date).label("month"),
             func.sum(Expense.amount).label("total")
         ).where(
             Expense.user_id == user_id,
@@ -166,12 +259,15 @@ class ExpenseService:
             Expense.date < end_of_year
         ).group_by("month").order_by("month")
         
-        expense_trend_result = await db.execute(expense_trend_query)
-        expense_map = {row.month: float(row.total) for row in expense_trend_result}
+        if ledger:
+            expense_map = {month: float(total) for month, total in ledger.expense_by_month(start_of_year, end_of_year).items()}
+        else:
+            expense_trend_result = await db.execute(expense_trend_query)
+            expense_map = {row.month: float(row.total) for row in expense_trend_result}
         
         # Income Trend
         income_trend_query = select(
-            func.to_char(Income.date, 'YYYY-MM').label("month"),
+            year_month(Income.date).label("month"),
             func.sum(Income.amount).label("total")
         ).where(
             Income.user_id == user_id,
@@ -179,8 +275,11 @@ class ExpenseService:
             Income.date < end_of_year
         ).group_by("month").order_by("month")
         
-        income_trend_result = await db.execute(income_trend_query)
-        income_map = {row.month: float(row.total) for row in income_trend_result}
+        if ledger:
+            income_map = {month: float(total) for month, total in ledger.income_by_month(start_of_year, end_of_year).items()}
+        else:
+            income_trend_result = await db.execute(income_trend_query)
+            income_map = {row.month: float(row.total) for row in income_trend_result}
         
         # Merge months
         all_months = sorted(list(set(list(expense_map.keys()) + list(income_map.keys()))))
@@ -219,11 +318,14 @@ class ExpenseService:
         # For "today", we only show today's total if they are viewing the current month/year
         is_current_month = (target_year == today.year and target_month == today.month)
         start_of_day = today.replace(hour=0, minute=0, second=0, microsecond=0) if is_current_month else None
-        start_of_year = today.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_of_day = today.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Hot users aggregate from their in-memory ledger, everyone else in SQL
+        ledger = await ledger_service.get_ledger(db, user_id)
 
         # 1. Total Expenses
         async def get_total(start_date, end_date_opt: Optional[datetime] = None):
+            if ledger:
+                return ledger.expense_total(start_date, end_date_opt)
             query = select(func.sum(Expense.amount)).where(
                 Expense.user_id == user_id,
                 Expense.date >= start_date,
@@ -241,28 +343,30 @@ class ExpenseService:
         total_today = await get_total(start_of_day) if start_of_day else 0
 
         # 2. Total by Category (Current Month)
-        from app.models.category import Category
         category_query = select(
             Expense.category_id,
-            Category.name,
             func.sum(Expense.amount).label("total")
-        ).join(Category).where(
+        ).where(
             Expense.user_id == user_id,
             Expense.date >= start_of_month,
             Expense.date < start_of_next_month,
             Expense.is_deleted == False
-        ).group_by(Expense.category_id, Category.name)
+        ).group_by(Expense.category_id)
         
-        category_result = await db.execute(category_query)
+        if ledger:
+            category_totals = ledger.expense_by_category(start_of_month, start_of_next_month)
+        else:
+            category_totals = {row.category_id: row.total for row in await db.execute(category_query)}
+        categories = await category_service.get_category_map(db, user_id, ensure=category_totals)
         by_category = [
-            {"category_id": row.category_id, "category_name": row.name, "total": row.total}
-            for row in category_result
+            {"category_id": category_id, "category_name": categories[category_id].name, "total": total}
+            for category_id, total in category_totals.items()
         ]
 
         # 3. Daily Spending (Current Month)
         # Note: truncating to day might depend on DB dialect, assuming accessible here or simplified
         daily_query = select(
-            func.date_trunc('day', Expense.date).label("date"),
+            day_start(Expense.date).label("date"),
             func.sum(Expense.amount).label("total")
         ).where(
             Expense.user_id == user_id,
@@ -271,8 +375,11 @@ class ExpenseService:
             Expense.is_deleted == False
         ).group_by("date").order_by("date")
 
-        daily_result = await db.execute(daily_query)
-        daily_records = {row.date.strftime("%Y-%m-%d"): row.total for row in daily_result}
+        if ledger:
+            daily_records = ledger.expense_by_day(start_of_month, start_of_next_month)
+        else:
+            daily_result = await db.execute(daily_query)
+            daily_records = {row.date.strftime("%Y-%m-%d"): row.total for row in daily_result}
         
         # Fill in zero for missing days
         import calendar
@@ -295,6 +402,8 @@ class ExpenseService:
         from app.models.income import Income
         
         async def get_total_income(start_date, end_date_opt: Optional[datetime] = None):
+            if ledger:
+                return ledger.income_total(start_date, end_date_opt)
             query = select(func.sum(Income.amount)).where(
                 Income.user_id == user_id,
                 Income.date >= start_date
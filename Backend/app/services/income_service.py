@@ -1,26 +1,70 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func, desc, asc
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
+from app.db.writes import insert_returning, update_owned, delete_owned
 from app.models.income import Income
+from app.core.config import settings
+from app.models.category import Category
 from app.schemas.income import IncomeCreate, IncomeUpdate
 from app.core.exceptions import NotFoundException, UnauthorizedException
+from app.services.snapshot_service import snapshot_service
+from app.services.data_version_service import data_version_service
+
+# IncomeResponse fields in its field order; the category is joined in the same
+# query rather than lazy-loaded per row
+INCOME_ROW_COLUMNS = (
+    Income.amount,
+    Income.source,
+    Income.description,
+    Income.date,
+    Income.category_id,
+    Income.id,
+    Income.user_id,
+    Income.created_at,
+)
+CATEGORY_ROW_COLUMNS = (
+    Category.name.label("category_name"),
+    Category.type.label("category_type"),
+    Category.is_default.label("category_is_default"),
+)
+INCOME_FIELDS = tuple(column.key for column in INCOME_ROW_COLUMNS) + ("category",)
+
+
+def income_row_to_dict(row, fields: Optional[List[str]] = None) -> dict:
+    data = {
+        column.key: row._mapping[column.key]
+        for column in INCOME_ROW_COLUMNS
+        if fields is None or column.key in fields
+    }
+    if "amount" in data:
+        data["amount"] = float(data["amount"])  # IncomeResponse.amount is a float
+    if fields is None or "category" in fields:
+        data["category"] = {
+            "name": row.category_name,
+            "type": row.category_type,
+            "id": row.category_id,
+            "is_default": row.category_is_default,
+        } if row.category_id is not None else None
+    return data
+
 
 class IncomeService:
     async def create_income(self, db: AsyncSession, income: IncomeCreate, user_id: UUID) -> Income:
-        new_income = Income(
-            user_id=user_id,
-            amount=income.amount,
-            source=income.source,
-            description=income.description,
-            date=income.date
-        )
-        db.add(new_income)
+        version = await data_version_service.bump(db, user_id)
+        new_income = await insert_returning(db, Income, {
+            "user_id": user_id,
+            "amount": income.amount,
+            "source": income.source,
+            "description": income.description,
+            "date": income.date,
+            "change_seq": version,
+        })
+        await snapshot_service.invalidate(db, user_id, new_income.date)
         await db.commit()
-        await db.refresh(new_income)
         return new_income
 
     async def get_income(self, db: AsyncSession, income_id: UUID, user_id: UUID) -> Income:
@@ -31,35 +75,42 @@ class IncomeService:
         return income
 
     async def update_income(self, db: AsyncSession, income_id: UUID, income_data: IncomeUpdate, user_id: UUID) -> Income:
-        income = await self.get_income(db, income_id, user_id)
-        
         update_data = income_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(income, key, value)
-            
+
+        # RETURNING only has the new date; read the old one when the income moves
+        previous_date = None
+        if "date" in update_data:
+            previous_date = await db.scalar(
+                select(Income.date).where(Income.id == income_id, Income.user_id == user_id)
+            )
+
+        version = await data_version_service.bump(db, user_id)
+        income = await update_owned(db, Income, income_id, user_id, {**update_data, "change_seq": version})
+        if not income:
+             raise NotFoundException(message="Income not found")
+
+        await snapshot_service.invalidate(db, user_id, previous_date, income.date)
         await db.commit()
-        await db.refresh(income)
         return income
 
     async def delete_income(self, db: AsyncSession, income_id: UUID, user_id: UUID):
-        income = await self.get_income(db, income_id, user_id)
-        
-        await db.delete(income)
+        income = await delete_owned(db, Income, income_id, user_id)
+        if not income:
+             raise NotFoundException(message="Income not found")
+
+        await data_version_service.tombstone(db, user_id, "income", income.id)
+        await snapshot_service.invalidate(db, user_id, income.date)
         await db.commit()
 
-    async def get_incomes(
-        self,
-        db: AsyncSession,
-        user_id: UUID,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        category_id: Optional[int] = None,
-        search: Optional[str] = None,
-        page: int = 1,
-        limit: int = 20,
-        sort: str = "date_desc"
-    ):
-        query = select(Income).where(Income.user_id == user_id)
+    def _list_query(self, user_id, start_date, end_date, category_id, search, sort, fields):
+        if fields is None or "category" in fields:
+            query = select(*INCOME_ROW_COLUMNS, *CATEGORY_ROW_COLUMNS).outerjoin(
+                Category, Category.id == Income.category_id
+            )
+        else:
+            # No join, and only the requested columns
+            query = select(*[c for c in INCOME_ROW_COLUMNS if c.key in fields])
+        query = query.where(Income.user_id == user_id)
 
         if category_id:
             query = query.where(Income.category_id == category_id)
@@ -80,6 +131,22 @@ class IncomeService:
             query = query.order_by(asc(Income.amount))
         else:
             query = query.order_by(desc(Income.date))
+        return query
+
+    async def get_incomes(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        page: int = 1,
+        limit: int = 20,
+        sort: str = "date_desc",
+        fields: Optional[List[str]] = None
+    ):
+        query = self._list_query(user_id, start_date, end_date, category_id, search, sort, fields)
 
         # Count
         count_query = select(func.count()).select_from(query.subquery())
@@ -91,7 +158,7 @@ class IncomeService:
         query = query.offset(offset).limit(limit)
         
         result = await db.execute(query)
-        incomes = result.scalars().all()
+        incomes = [income_row_to_dict(row, fields) for row in result]
 
         return {
             "total": total,
@@ -100,4 +167,22 @@ class IncomeService:
             "data": incomes
         }
 
+    async def stream_incomes(
+        self,
+        session_factory,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        sort: str = "date_desc",
+        fields: Optional[List[str]] = None
+    ):
+        """Every matching row through a server-side cursor; see ExpenseService.stream_expenses."""
+        query = self._list_query(user_id, start_date, end_date, category_id, search, sort, fields)
+        async with session_factory() as db:
+            result = await db.stream(query.execution_options(yield_per=settings.STREAM_YIELD_PER))
+            async for row in result:
+                yield income_row_to_dict(row, fields)
+
 income_service = IncomeService()
@@ -0,0 +1,260 @@
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, Optional, Union
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.db.money import from_cents, to_cents
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.sync import SyncTombstone
+from app.services.data_version_service import data_version_service
+
+try:
+    import numpy as np
+except ImportError:  # optional: without NumPy every aggregate runs in SQL
+    np = None
+
+EPOCH = date(1970, 1, 1)
+
+# Column -> dtype. Days count from 1970-01-01, which is also datetime64[D]'s epoch
+EXPENSE_DTYPES = {"id": "S16", "day": "int32", "cents": "int64", "category_id": "int32"}
+INCOME_DTYPES = {"id": "S16", "day": "int32", "cents": "int64"}
+
+
+def day_number(value: datetime) -> int:
+    """Days since 1970-01-01 of a timestamp, in UTC when it carries a time zone."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return (value.date() - EPOCH).days
+
+
+def _columns(rows, dtypes) -> dict:
+    values = list(zip(*rows)) if rows else [()] * len(dtypes)
+    return {name: np.array(column, dtype=dtype) for (name, dtype), column in zip(dtypes.items(), values)}
+
+
+def _expense_row(row):
+    return row.id.bytes, day_number(row.date), to_cents(row.amount), row.category_id
+
+
+def _income_row(row):
+    return row.id.bytes, day_number(row.date), to_cents(row.amount)
+
+
+def _replace(columns: dict, removed, rows, dtypes) -> dict:
+    """`columns` without the rows whose id is in `removed`, plus `rows`."""
+    if removed:
+        keep = ~np.isin(columns["id"], np.array(list(removed), dtype="S16"))
+        columns = {name: column[keep] for name, column in columns.items()}
+    if rows:
+        added = _columns(rows, dtypes)
+        columns = {name: np.concatenate([column, added[name]]) for name, column in columns.items()}
+    return columns
+
+
+class UserLedger:
+    """
+    One user's live expenses and incomes as parallel arrays, as of data
+    version `version`. Immutable: applying changes builds a new ledger, so a
+    request keeps a consistent view while others refresh the cache.
+
+    Periods are [start, end) like the SQL they replace, end None meaning
+    open-ended. Every boundary the services pass is a midnight, so comparing
+    whole days is exact. Totals come back as Decimals, and 0 when nothing
+    matches, as SUM() or 0 does.
+    """
+
+    def __init__(self, version: int, loaded_at: float, expenses: dict, incomes: dict):
+        self.version = version
+        self.loaded_at = loaded_at
+        self.expenses = expenses
+        self.incomes = incomes
+
+    def __len__(self):
+        return len(self.expenses["id"]) + len(self.incomes["id"])
+
+    def _period(self, columns, start: datetime, end: Optional[datetime]):
+        mask = columns["day"] >= day_number(start)
+        if end is not None:
+            mask &= columns["day"] < day_number(end)
+        return mask
+
+    def _total(self, columns, start, end) -> Union[Decimal, int]:
+        cents = columns["cents"][self._period(columns, start, end)]
+        return from_cents(int(cents.sum())) if len(cents) else 0
+
+    def _group(self, keys, cents, unit: Optional[str] = None) -> dict:
+        """
+        Sum `cents` by integer `keys`. With a datetime64 `unit` ("D", "M")
+        the keys are formatted as ISO dates after grouping, once per group.
+        """
+        unique, inverse = np.unique(keys, return_inverse=True)
+        # float64 holds cent totals exactly up to 2**53, about 90 trillion
+        totals = np.bincount(inverse, weights=cents, minlength=len(unique)).round().astype(np.int64)
+        if unit:
+            unique = unique.astype(f"datetime64[{unit}]").astype(str)
+        return dict(zip(unique.tolist(), (from_cents(total) for total in totals.tolist())))
+
+    def _by_month(self, columns, start, end) -> Dict[str, Decimal]:
+        mask = self._period(columns, start, end)
+        months = columns["day"][mask].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        return self._group(months, columns["cents"][mask], "M")
+
+    def expense_total(self, start: datetime, end: Optional[datetime] = None):
+        return self._total(self.expenses, start, end)
+
+    def income_total(self, start: datetime, end: Optional[datetime] = None):
+        return self._total(self.incomes, start, end)
+
+    def expense_by_category(self, start: datetime, end: datetime) -> Dict[int, Decimal]:
+        mask = self._period(self.expenses, start, end)
+        return self._group(self.expenses["category_id"][mask], self.expenses["cents"][mask])
+
+    def expense_by_day(self, start: datetime, end: datetime) -> Dict[str, Decimal]:
+        """'YYYY-MM-DD' -> total."""
+        mask = self._period(self.expenses, start, end)
+        return self._group(self.expenses["day"][mask], self.expenses["cents"][mask], "D")
+
+    def expense_by_month(self, start: datetime, end: datetime) -> Dict[str, Decimal]:
+        """'YYYY-MM' -> total."""
+        return self._by_month(self.expenses, start, end)
+
+    def income_by_month(self, start: datetime, end: datetime) -> Dict[str, Decimal]:
+        return self._by_month(self.incomes, start, end)
+
+
+class LedgerService:
+    """
+    Keeps the ledgers of recently active users in process memory, so the
+    dashboard, analytics and budget progress aggregate with NumPy instead of
+    re-running their SUM queries. Off unless LEDGER_CACHE_ENABLED is set and
+    NumPy is installed; get_ledger() returns None and callers use SQL.
+
+    Every read compares the ledger with the request's data version (see
+    data_version_service.current). Every write advances it and stamps its rows with change_seq, and hard deletes
+    leave tombstones, so a stale ledger is brought up to date by reading just
+    the rows changed since, whichever worker wrote them. A full reload
+    happens at least every LEDGER_CACHE_TTL_SECONDS, for rows written
+    outside the API. Memory is bounded by LEDGER_CACHE_MAX_USERS and
+    LEDGER_CACHE_MAX_ROWS, evicting the least recently used users.
+
+    Days are UTC days, matching the database's default session time zone.
+    """
+
+    def __init__(self):
+        self._cache: "OrderedDict[UUID, UserLedger]" = OrderedDict()
+        self._rows = 0
+
+    @property
+    def available(self) -> bool:
+        return np is not None and settings.LEDGER_CACHE_ENABLED
+
+    async def get_ledger(self, db: AsyncSession, user_id: UUID) -> Optional[UserLedger]:
+        """The user's ledger at the current data version, or None to fall back to SQL."""
+        if not self.available:
+            return None
+        version = await data_version_service.current(db, user_id)
+        if version is None:
+            return None
+
+        ledger = self._cache.get(user_id)
+        if ledger is not None and time.monotonic() - ledger.loaded_at < settings.LEDGER_CACHE_TTL_SECONDS:
+            if ledger.version == version:
+                self._cache.move_to_end(user_id)
+                record_cache("ledger", hit=True)
+                return ledger
+            ledger = await self._apply_changes(db, user_id, ledger, version)
+        else:
+            ledger = await self._load(db, user_id, version)
+        record_cache("ledger", hit=False)
+        if not data_version_service.uncommitted(db, user_id):
+            # Inside a write the version may still roll back and be reused
+            self._store(user_id, ledger)
+        return ledger
+
+    async def _load(self, db: AsyncSession, user_id: UUID, version: int) -> UserLedger:
+        expenses = await db.execute(
+            select(Expense.id, Expense.date, Expense.amount, Expense.category_id)
+            .where(Expense.user_id == user_id, Expense.is_deleted == False)
+        )
+        incomes = await db.execute(
+            select(Income.id, Income.date, Income.amount).where(Income.user_id == user_id)
+        )
+        return UserLedger(
+            version,
+            time.monotonic(),
+            _columns([_expense_row(row) for row in expenses], EXPENSE_DTYPES),
+            _columns([_income_row(row) for row in incomes], INCOME_DTYPES),
+        )
+
+    async def _apply_changes(self, db: AsyncSession, user_id: UUID, ledger: UserLedger, version: int) -> UserLedger:
+        """
+        Rows written after ledger.version replace their old copies. Rows
+        read here may be newer than `version` (a write committed in
+        between); applying them again on the next refresh is harmless.
+        """
+        since = ledger.version
+        expenses = (await db.execute(
+            select(Expense.id, Expense.date, Expense.amount, Expense.category_id, Expense.is_deleted)
+            .where(Expense.user_id == user_id, Expense.change_seq > since)
+        )).all()
+        incomes = (await db.execute(
+            select(Income.id, Income.date, Income.amount)
+            .where(Income.user_id == user_id, Income.change_seq > since)
+        )).all()
+        tombstones = (await db.execute(
+            select(SyncTombstone.entity, SyncTombstone.entity_id).where(
+                SyncTombstone.user_id == user_id,
+                SyncTombstone.change_seq > since,
+                SyncTombstone.entity.in_(("expense", "income"))
+            )
+        )).all()
+        deleted = {
+            entity: {UUID(t.entity_id).bytes for t in tombstones if t.entity == entity}
+            for entity in ("expense", "income")
+        }
+
+        return UserLedger(
+            version,
+            ledger.loaded_at,
+            _replace(
+                ledger.expenses,
+                deleted["expense"] | {row.id.bytes for row in expenses},
+                [_expense_row(row) for row in expenses if not row.is_deleted],
+                EXPENSE_DTYPES,
+            ),
+            _replace(
+                ledger.incomes,
+                deleted["income"] | {row.id.bytes for row in incomes},
+                [_income_row(row) for row in incomes],
+                INCOME_DTYPES,
+            ),
+        )
+
+    def _store(self, user_id: UUID, ledger: UserLedger):
+        current = self._cache.pop(user_id, None)
+        if current is not None:
+            self._rows -= len(current)
+            if current.version > ledger.version:
+                # A concurrent request already cached a newer state
+                ledger = current
+        self._cache[user_id] = ledger
+        self._rows += len(ledger)
+        while self._cache and (
+            len(self._cache) > settings.LEDGER_CACHE_MAX_USERS or self._rows > settings.LEDGER_CACHE_MAX_ROWS
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._rows -= len(evicted)
+
+    def clear(self):
+        self._cache.clear()
+        self._rows = 0
+
+ledger_service = LedgerService()
@@ -0,0 +1,69 @@
+import time
+from typing import List, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.writes import insert_ignoring_conflicts
+from app.models.user import User
+from app.services.category_service import category_service
+
+# Columns an imported account may set; everything else takes the model default
+ACCOUNT_FIELDS = ("email", "full_name", "password_hash", "auth_provider", "is_verified", "avatar_url")
+
+
+def _column_default(key):
+    default = User.__table__.c[key].default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+# executemany needs the same keys in every row, so missing fields are filled in
+ACCOUNT_DEFAULTS = {key: _column_default(key) for key in ACCOUNT_FIELDS}
+
+
+class ProvisioningService:
+    async def provision_batch(self, db: AsyncSession, accounts: Sequence[dict]) -> List[UUID]:
+        """
+        Create the users in `accounts` whose email isn't taken yet and seed
+        their default categories: one INSERT ... ON CONFLICT DO NOTHING for
+        the users and one for the categories. Existing users are skipped
+        untouched. Returns the ids of the users created. The caller commits.
+        """
+        rows = [
+            {
+                **ACCOUNT_DEFAULTS,
+                "is_verified": True,
+                **{key: account[key] for key in ACCOUNT_FIELDS if account.get(key) is not None},
+            }
+            for account in accounts
+        ]
+        if not rows:
+            return []
+        result = await db.execute(
+            insert_ignoring_conflicts(User, db.bind.dialect.name).returning(User.__table__.c.id), rows
+        )
+        user_ids = list(result.scalars())
+        await category_service.seed_categories(db, user_ids)
+        return user_ids
+
+    async def provision(
+        self, session_factory, accounts: Sequence[dict], batch_size: int = settings.PROVISION_BATCH_SIZE
+    ) -> int:
+        """
+        provision_batch over `accounts` in batches of `batch_size`, each in its
+        own transaction, so a failure loses at most one batch and rerunning
+        the same import picks up where it stopped. Returns users created.
+        """
+        started = time.perf_counter()
+        created = 0
+        for start in range(0, len(accounts), batch_size):
+            async with session_factory() as db:
+                created += len(await self.provision_batch(db, accounts[start:start + batch_size]))
+                await db.commit()
+        logger.info(f"PROVISION: created {created} of {len(accounts)} accounts "
+                    f"in {time.perf_counter() - started:.1f}s")
+        return created
+
+provisioning_service = ProvisioningService()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import delete, or_, and_
+
+from app.core.metrics import record_cache
+from app.models.snapshot import PeriodSnapshot
+
+SUMMARY = "summary"
+ANALYTICS = "analytics"
+
+
+class SnapshotService:
+    """
+    Persists computed summary/analytics payloads for closed periods.
+
+    A period is closed once its year has ended: the monthly summary also
+    carries year-to-date totals, so a month of the current year still changes
+    with every new expense. Snapshots are keyed by (user, kind, year, month)
+    with month = 0 for yearly analytics.
+    """
+
+    def is_closed(self, year: int) -> bool:
+        return year < datetime.now().year
+
+    async def get_or_build(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        kind: str,
+        year: int,
+        month: int,
+        build: Callable[[], Awaitable[dict]],
+    ) -> Optional[PeriodSnapshot]:
+        """
+        Return the stored snapshot for a closed period, building and storing
+        it on first access. Returns None for open periods.
+        """
+        if not self.is_closed(year):
+            return None
+
+        snapshot = await db.get(PeriodSnapshot, (user_id, kind, year, month))
+        record_cache("snapshot", hit=snapshot is not None)
+        if snapshot:
+            return snapshot
+
+        payload = await build()
+        snapshot = PeriodSnapshot(
+            user_id=user_id,
+            kind=kind,
+            year=year,
+            month=month,
+            payload=payload,
+            etag=self._etag(payload),
+        )
+        db.add(snapshot)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent request stored the same period first
+            await db.rollback()
+            return await db.get(PeriodSnapshot, (user_id, kind, year, month))
+        return snapshot
+
+    async def invalidate(self, db: AsyncSession, user_id: UUID, *dates: Optional[datetime]):
+        """
+        Drop snapshots affected by a backdated write on the given dates.
+
+        A write touches its own year (year totals, analytics) and, for
+        December, the January summary of the next year (previous-month
+        comparison). Writes in open periods issue no statement at all.
+        The caller commits.
+        """
+        conditions = []
+        for d in dates:
+            if d is None or not self.is_closed(d.year):
+                continue
+            conditions.append(PeriodSnapshot.year == d.year)
+            if d.month == 12:
+                conditions.append(and_(
+                    PeriodSnapshot.kind == SUMMARY,
+                    PeriodSnapshot.year == d.year + 1,
+                    PeriodSnapshot.month == 1
+                ))
+
+        if conditions:
+            await db.execute(
+                delete(PeriodSnapshot).where(
+                    PeriodSnapshot.user_id == user_id,
+                    or_(*conditions)
+                )
+            )
+
+    async def invalidate_all(self, db: AsyncSession, user_id: UUID):
+        """Drop every snapshot of a user, e.g. after a category rename. The caller commits."""
+        await db.execute(delete(PeriodSnapshot).where(PeriodSnapshot.user_id == user_id))
+
+    def _etag(self, payload: dict) -> str:
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+
+snapshot_service = SnapshotService()
@@ -0,0 +1,120 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import and_, or_
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from app.core.exceptions import BadRequestException
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.category import Category
+from app.models.budget import Budget
+from app.models.sync import SyncTombstone
+
+# Rows are paged in (change_seq, entity, id) order; the index is the entity's place
+ENTITIES = [("expenses", Expense), ("incomes", Income), ("categories", Category), ("budgets", Budget),
+            ("tombstones", SyncTombstone)]
+UUID_KEYED = {"expenses", "incomes"}
+
+
+class Position(NamedTuple):
+    """The last row a page returned; a page that ends on a whole version has no entity."""
+    change_seq: int
+    entity: Optional[int] = None
+    id: object = None
+
+    def __str__(self):
+        if self.entity is None:
+            return str(self.change_seq)
+        return f"{self.change_seq}.{self.entity}.{self.id}"
+
+    @classmethod
+    def parse(cls, token: str) -> "Position":
+        try:
+            parts = token.split(".")
+            if len(parts) == 1:
+                return cls(int(parts[0]))
+            change_seq, entity, id = int(parts[0]), int(parts[1]), parts[2]
+            name = ENTITIES[entity][0]
+            return cls(change_seq, entity, UUID(id) if name in UUID_KEYED else int(id))
+        except (ValueError, IndexError):
+            raise BadRequestException("Invalid sync token")
+
+
+class SyncService:
+    def _after(self, model, entity: int, since: Position):
+        """Rows of `model` (entity number `entity`) that come after `since`."""
+        if since.entity is None or entity < since.entity:
+            return model.change_seq > since.change_seq
+        if entity > since.entity:
+            return model.change_seq >= since.change_seq
+        return or_(
+            model.change_seq > since.change_seq,
+            and_(model.change_seq == since.change_seq, model.id > since.id)
+        )
+
+    async def get_changes(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        current_version: int,
+        since: Optional[str] = None,
+        limit: int = 500
+    ):
+        """
+        Rows created, changed or deleted after the `since` token, at most
+        `limit` per page. Rows are ordered by (change_seq, entity, id), so a
+        page can end in the middle of a write that stamped many rows (a bulk
+        update, archiving) and the next one resumes after its last row.
+        Without `since` this is an initial sync of the current state.
+        """
+        position = Position.parse(since) if since is not None else None
+
+        rows = []
+        for entity, (name, model) in enumerate(ENTITIES):
+            if position is None and model is SyncTombstone:
+                continue
+            query = select(model).where(model.user_id == user_id, model.change_seq <= current_version)
+            if position is not None:
+                query = query.where(self._after(model, entity, position))
+            elif model is Expense:
+                query = query.where(Expense.is_deleted == False)
+            # One more than a page tells whether anything is left
+            query = query.order_by(model.change_seq, model.id).limit(limit + 1)
+            rows.extend((row.change_seq, entity, row.id, row) for row in (await db.execute(query)).scalars())
+
+        rows.sort(key=lambda r: r[:3])
+        page = rows[:limit]
+        has_more = len(rows) > limit
+        if has_more:
+            last = page[-1]
+            token = Position(last[0], last[1], last[2])
+        else:
+            token = Position(max(current_version, position.change_seq if position else 0))
+
+        by_entity = {name: [] for name, _ in ENTITIES}
+        for _, entity, _, row in page:
+            by_entity[ENTITIES[entity][0]].append(row)
+
+        # Soft-deleted expenses are reported as deletions alongside tombstones
+        deleted = [
+            {"entity": "expense", "id": str(e.id), "change_seq": e.change_seq}
+            for e in by_entity["expenses"] if e.is_deleted
+        ]
+        deleted.extend(
+            {"entity": t.entity, "id": t.entity_id, "change_seq": t.change_seq}
+            for t in by_entity["tombstones"]
+        )
+        deleted.sort(key=lambda d: d["change_seq"])
+
+        return {
+            "token": str(token),
+            "has_more": has_more,
+            "expenses": [e for e in by_entity["expenses"] if not e.is_deleted],
+            "incomes": by_entity["incomes"],
+            "categories": by_entity["categories"],
+            "budgets": by_entity["budgets"],
+            "deleted": deleted
+        }
+
+sync_service = SyncService()
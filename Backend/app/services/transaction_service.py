@@ -0,0 +1,219 @@
+import base64
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, desc, literal, cast, String, union_all, tuple_
+from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from app.models.expense import Expense
+from app.models.income import Income
+from app.core.exceptions import BadRequestException
+
+# TransactionResponse fields in its field order
+TRANSACTION_FIELDS = (
+    "id", "type", "date", "amount", "category_id", "description", "source", "created_at", "running_balance",
+)
+
+# CSV export: field -> (header, formatter), in column order
+CSV_COLUMNS = {
+    "date": ("Date", lambda row: row.date.strftime("%Y-%m-%d")),
+    "type": ("Type", lambda row: row.type),
+    "amount": ("Amount", lambda row: f"{row.amount:.2f}"),
+    "source": ("Source", lambda row: row.source or ""),
+    "description": ("Description", lambda row: row.description or ""),
+    "created_at": ("Created At", lambda row: row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else ""),
+    "category_id": ("Category ID", lambda row: row.category_id if row.category_id is not None else ""),
+    "id": ("ID", lambda row: str(row.id)),
+}
+CSV_FIELDS = tuple(CSV_COLUMNS)
+DEFAULT_CSV_FIELDS = ["date", "type", "amount", "source", "description", "created_at"]
+
+
+async def merge_sorted(*streams, key, reverse=False):
+    """
+    k-way merge of async iterators that are each already sorted by `key`.
+    Holds one pending row per stream, so memory stays constant.
+    """
+    iterators = [stream.__aiter__() for stream in streams]
+    heads = [await anext(it, None) for it in iterators]
+    while True:
+        pending = [i for i, head in enumerate(heads) if head is not None]
+        if not pending:
+            return
+        pick = max if reverse else min
+        i = pick(pending, key=lambda i: key(heads[i]))
+        yield heads[i]
+        heads[i] = await anext(iterators[i], None)
+
+
+class TransactionService:
+    def encode_cursor(self, row) -> str:
+        raw = f"{row.date.isoformat()}|{row.id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            date_part, id_part = raw.split("|")
+            return datetime.fromisoformat(date_part), UUID(id_part)
+        except ValueError:
+            raise BadRequestException(message="Invalid cursor")
+
+    def _columns(self, fields: Optional[List[str]], with_balance: bool = False) -> List[str]:
+        """
+        Columns both arms of the union select: the requested fields plus date
+        and id, which keyset pagination and the export merge order by.
+        """
+        names = ["id", "date"] + [
+            name for name in (fields or TRANSACTION_FIELDS)
+            if name not in ("id", "date", "running_balance")
+        ]
+        if with_balance:
+            names.append("signed_amount")
+        return names
+
+    def _expense_query(self, columns, user_id, start_date, end_date, category_id, search, min_amount, max_amount):
+        available = {
+            "id": Expense.id,
+            "type": literal("expense", String),
+            "date": Expense.date,
+            "amount": Expense.amount,
+            "signed_amount": -Expense.amount,
+            "category_id": Expense.category_id,
+            "description": Expense.description,
+            "source": cast(None, String),
+            "created_at": Expense.created_at,
+        }
+        query = select(*[available[name].label(name) for name in columns]).where(
+            Expense.user_id == user_id, Expense.is_deleted == False
+        )
+        return self._apply_filters(query, Expense, start_date, end_date, category_id, search, min_amount, max_amount)
+
+    def _income_query(self, columns, user_id, start_date, end_date, category_id, search, min_amount, max_amount):
+        available = {
+            "id": Income.id,
+            "type": literal("income", String),
+            "date": Income.date,
+            "amount": Income.amount,
+            "signed_amount": Income.amount,
+            "category_id": Income.category_id,
+            "description": Income.description,
+            "source": Income.source,
+            "created_at": Income.created_at,
+        }
+        query = select(*[available[name].label(name) for name in columns]).where(Income.user_id == user_id)
+        return self._apply_filters(query, Income, start_date, end_date, category_id, search, min_amount, max_amount)
+
+    def _apply_filters(self, query, model, start_date, end_date, category_id, search, min_amount, max_amount):
+        if start_date:
+            query = query.where(model.date >= start_date)
+        if end_date:
+            query = query.where(model.date <= end_date)
+        if category_id:
+            query = query.where(model.category_id == category_id)
+        if search:
+            query = query.where(model.description.ilike(f"%{search}%"))
+        if min_amount is not None:
+            query = query.where(model.amount >= min_amount)
+        if max_amount is not None:
+            query = query.where(model.amount <= max_amount)
+        return query
+
+    async def get_transactions(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        with_balance: bool = False,
+        fields: Optional[List[str]] = None
+    ):
+        """
+        Incomes and expenses in one timeline, newest first, using keyset
+        pagination on (date, id). The optional running balance is the
+        cumulative sum of incomes minus expenses over the filtered timeline.
+        With `fields`, only those columns are selected and returned.
+        """
+        filters = (self._columns(fields, with_balance), user_id, start_date, end_date, category_id, search, min_amount, max_amount)
+        timeline = union_all(self._expense_query(*filters), self._income_query(*filters)).subquery("timeline")
+
+        if with_balance:
+            # The window has to see rows before the page, so page over a ranked subquery
+            timeline = select(
+                timeline,
+                func.sum(timeline.c.signed_amount).over(
+                    order_by=(timeline.c.date, timeline.c.id)
+                ).label("running_balance")
+            ).subquery("ranked")
+
+        query = select(timeline)
+        if cursor:
+            cursor_date, cursor_id = self.decode_cursor(cursor)
+            query = query.where(tuple_(timeline.c.date, timeline.c.id) < tuple_(cursor_date, cursor_id))
+        query = query.order_by(desc(timeline.c.date), desc(timeline.c.id)).limit(limit + 1)
+
+        result = await db.execute(query)
+        rows = result.all()
+        page = rows[:limit]
+
+        return {
+            "limit": limit,
+            "next_cursor": self.encode_cursor(page[-1]) if len(rows) > limit else None,
+            "data": [
+                {name: row._mapping.get(name) for name in fields} if fields else row._mapping
+                for row in page
+            ]
+        }
+
+    async def export_transactions_to_csv(
+        self,
+        session_factory,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        fields: Optional[List[str]] = None
+    ):
+        """
+        The merged timeline as CSV lines. Opens its own session because the
+        request's session is closed before a streaming response starts sending.
+        """
+        import csv
+        import io
+
+        fields = fields or DEFAULT_CSV_FIELDS
+        formatters = [CSV_COLUMNS[name][1] for name in fields]
+        filters = (self._columns(fields), user_id, start_date, end_date, category_id, search, min_amount, max_amount)
+        newest_first = (desc("date"), desc("id"))
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+
+        writer.writerow([CSV_COLUMNS[name][0] for name in fields])
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
+        async with session_factory() as db:
+            # Two server-side cursors, merged as they are read
+            expenses = await db.stream(self._expense_query(*filters).order_by(*newest_first))
+            incomes = await db.stream(self._income_query(*filters).order_by(*newest_first))
+
+            async for row in merge_sorted(expenses, incomes, key=lambda r: (r.date, r.id), reverse=True):
+                writer.writerow([format_value(row) for format_value in formatters])
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+
+transaction_service = TransactionService()
@@ -0,0 +1,82 @@
+"""
+Rows/sec for the expense list response: the previous path (ORM entities
+validated through response_model, then the standard JSON encoder) against
+the fast path (plain rows encoded with orjson, no re-validation).
+
+    python -m benchmarks.bench_serialization --rows 20,100,1000
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.models.expense import Expense
+from app.schemas.expense import PaginatedExpenseResponse
+from app.services.expense_service import EXPENSE_ROW_COLUMNS
+
+
+def make_rows(n):
+    user_id = uuid.uuid4()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "amount": Decimal(f"{(i % 500) + 0.99:.2f}"),
+            "description": f"Expense {i}",
+            "category_id": i % 12 + 1,
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "date": start + timedelta(hours=i),
+            "created_at": start + timedelta(hours=i, minutes=5),
+        }
+        for i in range(n)
+    ]
+
+
+def orm_path(rows):
+    entities = [Expense(**row) for row in rows]
+    page = {"total": len(entities), "page": 1, "limit": len(entities), "data": entities}
+    content = PaginatedExpenseResponse.model_validate(page).model_dump(mode="json")
+    return JSONResponse(content).body
+
+
+def fast_path(rows):
+    page = {"total": len(rows), "page": 1, "limit": len(rows), "data": rows}
+    return FastJSONResponse(page).body
+
+
+def rows_per_second(fn, rows, min_seconds):
+    loops, start = 0, time.perf_counter()
+    while True:
+        fn(rows)
+        loops += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return loops * len(rows) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", default="20,100,1000", help="page sizes")
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum time per measurement")
+    args = parser.parse_args()
+
+    # Both paths must produce the same document
+    sample = make_rows(3)
+    assert json.loads(orm_path(sample)) == json.loads(fast_path(sample))
+    assert [c.key for c in EXPENSE_ROW_COLUMNS] == list(sample[0])
+
+    print(f"{'rows':>6}{'orm + response_model':>24}{'rows + orjson':>18}{'speedup':>10}")
+    for n in [int(r) for r in args.rows.split(",")]:
+        rows = make_rows(n)
+        slow = rows_per_second(orm_path, rows, args.seconds)
+        fast = rows_per_second(fast_path, rows, args.seconds)
+        print(f"{n:>6}{slow:>20,.0f}/s{fast:>14,.0f}/s{fast / slow:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ from sqlalchemy.orm import sessionmaker
 from app.db.base import Base
 from app.main import app
 from app.db.session import get_db
+from app.services.category_service import category_service
+from app.services.ledger_service import ledger_service
 
 # Use an in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -56,6 +58,10 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with TestingSessionLocal() as session:
         yield session
 
+    # Ids restart with every test database
+    category_service.clear()
+    ledger_service.clear()
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
@@ -0,0 +1,39 @@
+"""
+Apply the expense retention policy: move long soft-deleted expenses (and,
+when ARCHIVE_HISTORY_AFTER_YEARS is set, very old history) to
+expenses_archive in small throttled batches. Safe to run from cron; restoring
+an archived expense through the API moves it back.
+
+    python -m scripts.archive_expenses
+    python -m scripts.archive_expenses --deleted-after-days 7 --history-after-years 7 --max-batches 50
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.services.archive_service import archive_service
+
+
+async def main(args):
+    moved = await archive_service.run(
+        AsyncSessionLocal,
+        deleted_after_days=args.deleted_after_days,
+        history_after_years=args.history_after_years,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        max_batches=args.max_batches,
+    )
+    await engine.dispose()
+    print(f"Archived {moved['deleted']} deleted and {moved['history']} historical expenses.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old expenses")
+    parser.add_argument("--deleted-after-days", type=int, default=settings.ARCHIVE_DELETED_AFTER_DAYS)
+    parser.add_argument("--history-after-years", type=int, default=settings.ARCHIVE_HISTORY_AFTER_YEARS,
+                        help="0 keeps all live history")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--pause-ms", type=float, default=settings.ARCHIVE_BATCH_PAUSE_MS)
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,230 @@
+"""
+Scripted load test against a running API seeded with scripts/seed_data.py.
+
+    python -m scripts.load_test --base-url http://localhost:8000 --concurrency 20 --duration 60
+    python -m scripts.load_test --compare benchmarks/results/<earlier run>.json
+
+Virtual users log in as the seeded accounts and loop over a weighted mix of
+scenarios. Throughput and latency percentiles per scenario are printed and
+saved to benchmarks/results/<timestamp>-<commit>.json so runs can be compared
+across commits. Start the API with RATE_LIMIT_ENABLED=false, otherwise the
+login limits cap the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+# Accounts created by scripts/seed_data.py
+EMAIL_PREFIX = "loadtest"
+DEFAULT_PASSWORD = "LoadTest123!"
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "results")
+
+SEARCH_TERMS = ["coffee", "rent", "pizza", "fuel", "gift", "market", "bill"]
+
+# scenario: weight
+SCENARIOS = {
+    "dashboard": 30,
+    "list_paging": 25,
+    "search": 15,
+    "create_expense": 15,
+    "export": 5,
+    "login": 10,
+}
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, password: str, rng: random.Random):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.headers = {}
+        self.category_ids = []
+
+    async def setup(self):
+        await self.login()
+        res = await self.client.get("/expenses/categories?type=expense", headers=self.headers)
+        res.raise_for_status()
+        self.category_ids = [c["id"] for c in res.json()]
+
+    async def login(self):
+        res = await self.client.post("/auth/login", json={"email": self.email, "password": self.password})
+        res.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+        return res
+
+    def random_month(self):
+        today = datetime.now()
+        back = self.rng.randint(0, 11)
+        month = (today.month - back - 1) % 12 + 1
+        year = today.year - (1 if back >= today.month else 0)
+        return month, year
+
+    async def dashboard(self):
+        month, year = self.random_month()
+        return await self.client.get(f"/dashboard?month={month}&year={year}", headers=self.headers)
+
+    async def list_paging(self):
+        res = None
+        for page in range(1, self.rng.randint(2, 5) + 1):
+            res = await self.client.get(f"/expenses/?page={page}&limit=20", headers=self.headers)
+            if res.status_code != 200:
+                break
+        return res
+
+    async def search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        return await self.client.get(f"/expenses/?search={term}&limit=20", headers=self.headers)
+
+    async def create_expense(self):
+        # The create path also runs the budget alert check for the category
+        res = await self.client.post("/expenses/", headers=self.headers, json={
+            "amount": round(self.rng.uniform(5, 120), 2),
+            "category_id": self.rng.choice(self.category_ids),
+            "date": datetime.now().isoformat(),
+            "description": "Load test expense",
+        })
+        if res.status_code == 201:
+            now = datetime.now()
+            return await self.client.get(f"/budgets/progress?month={now.month}&year={now.year}", headers=self.headers)
+        return res
+
+    async def export(self):
+        month, year = self.random_month()
+        start = datetime(year, month, 1).isoformat()
+        async with self.client.stream("GET", f"/expenses/export?start_date={start}", headers=self.headers) as res:
+            async for _ in res.aiter_bytes():
+                pass
+        return res
+
+    async def run(self, scenario: str):
+        if scenario == "login":
+            return await self.login()
+        return await getattr(self, scenario)()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples, wall_seconds):
+    report = {}
+    for scenario, entries in sorted(samples.items()):
+        durations = sorted(d for d, ok in entries if ok)
+        report[scenario] = {
+            "requests": len(entries),
+            "errors": sum(1 for _, ok in entries if not ok),
+            "throughput_rps": round(len(entries) / wall_seconds, 2),
+            "p50_ms": round(percentile(durations, 50) * 1000, 1),
+            "p90_ms": round(percentile(durations, 90) * 1000, 1),
+            "p95_ms": round(percentile(durations, 95) * 1000, 1),
+            "p99_ms": round(percentile(durations, 99) * 1000, 1),
+            "max_ms": round(durations[-1] * 1000, 1) if durations else 0.0,
+        }
+    return report
+
+
+def print_report(report, baseline=None):
+    print(f"{'scenario':<16}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for scenario, r in report.items():
+        line = (f"{scenario:<16}{r['requests']:>8}{r['errors']:>6}{r['throughput_rps']:>9}"
+                f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}")
+        if baseline and scenario in baseline:
+            before = baseline[scenario]["p95_ms"]
+            if before:
+                line += f"   p95 {((r['p95_ms'] - before) / before) * 100:+.0f}% vs baseline"
+        print(line)
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def worker(user: VirtualUser, deadline: float, samples, weights):
+    names, values = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        scenario = user.rng.choices(names, values)[0]
+        start = time.perf_counter()
+        try:
+            res = await user.run(scenario)
+            ok = res is not None and res.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        samples[scenario].append((time.perf_counter() - start, ok))
+
+
+async def main(args):
+    weights = dict(SCENARIOS)
+    for item in args.weight or []:
+        name, value = item.split("=")
+        weights[name] = int(value)
+    weights = {name: w for name, w in weights.items() if w > 0}
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        users = [
+            VirtualUser(client, f"{EMAIL_PREFIX}+{i % args.users}@example.com", args.password, random.Random(args.seed + i))
+            for i in range(args.concurrency)
+        ]
+        await asyncio.gather(*(u.setup() for u in users))
+
+        samples = defaultdict(list)
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(worker(u, deadline, samples, weights) for u in users))
+        wall = time.perf_counter() - started
+
+    report = summarize(samples, wall)
+    total = sum(r["requests"] for r in report.values())
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["scenarios"]
+
+    print(f"{total} scenario runs in {wall:.1f}s ({total / wall:.1f}/s), concurrency {args.concurrency}")
+    print_report(report, baseline)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    commit = current_commit()
+    path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{commit}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": round(wall, 1),
+            "weights": weights,
+            "scenarios": report,
+        }, f, indent=2)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API with a scenario mix")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=10, help="number of seeded users to spread load over")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--weight", action="append", help="override a scenario weight, e.g. export=0")
+    parser.add_argument("--compare", help="earlier results file to compare p95 against")
+    asyncio.run(main(parser.parse_args()))
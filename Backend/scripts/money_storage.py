@@ -0,0 +1,60 @@
+"""
+Show or switch how monetary amounts are stored (PostgreSQL).
+
+    python -m scripts.money_storage status
+    python -m scripts.money_storage convert --to cents
+
+convert rewrites the amount column of expenses, incomes, budgets and
+expenses_archive (ALTER COLUMN TYPE, a full rewrite under an exclusive lock),
+so stop the API first and set MONEY_STORAGE to the new mode before starting
+it again: at startup it refuses to run against the other storage.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.db.money import MONEY_COLUMNS, STORAGE_MODES, convert_money_storage, stored_in_cents
+from app.db.session import engine
+
+
+def describe(conn):
+    existing = set(inspect(conn).get_table_names())
+    return {table: ("cents" if stored_in_cents(conn, table) else "numeric") for table in MONEY_COLUMNS if table in existing}
+
+
+async def status(conn, args):
+    print(f"MONEY_STORAGE={settings.MONEY_STORAGE}")
+    for table, mode in (await conn.run_sync(describe)).items():
+        note = "" if mode == settings.MONEY_STORAGE else "  (does not match MONEY_STORAGE)"
+        print(f"  {table:<20}{mode}{note}")
+
+
+async def convert(conn, args):
+    converted = await conn.run_sync(convert_money_storage, args.to)
+    print(f"Converted {', '.join(converted) if converted else 'nothing'} to {args.to}")
+    if args.to != settings.MONEY_STORAGE:
+        print(f"Set MONEY_STORAGE={args.to} before starting the API.")
+
+
+async def main(args):
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Converting money storage needs PostgreSQL")
+    async with engine.begin() as conn:
+        await args.command(conn, args)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or switch the storage of monetary amounts")
+    commands = parser.add_subparsers(required=True)
+
+    status_parser = commands.add_parser("status", help="show how each table stores amounts")
+    status_parser.set_defaults(command=status)
+
+    convert_parser = commands.add_parser("convert", help="rewrite every amount column to a storage mode")
+    convert_parser.add_argument("--to", choices=STORAGE_MODES, required=True)
+    convert_parser.set_defaults(command=convert)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Manage the date partitions of expenses and incomes (PostgreSQL, after the
+5d2a7c8e1f43 migration).
+
+    python -m scripts.partitions status
+    python -m scripts.partitions create --ahead 3
+    python -m scripts.partitions detach --before 2020-01-01
+    python -m scripts.partitions detach --before 2020-01-01 --archive-dir /backups/ledger
+
+create is also run on every API startup with PARTITION_INTERVAL and
+PARTITION_PREMAKE. detach removes old partitions from the live tables but
+keeps them as standalone tables; with --archive-dir each one is written to a
+gzipped CSV (COPY, streamed) and then dropped.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.partitioning import PARTITIONED_TABLES, detach_partitions, ensure_partitions, list_partitions
+from app.db.session import engine
+
+
+async def status(conn, args):
+    for table in PARTITIONED_TABLES:
+        partitions = await conn.run_sync(list_partitions, table)
+        if not partitions:
+            print(f"{table}: not partitioned")
+            continue
+        print(f"{table}:")
+        for name in [p.name for p in partitions] + [f"{table}_default"]:
+            row = (await conn.execute(text(
+                "SELECT reltuples::bigint, pg_size_pretty(pg_total_relation_size(oid)) FROM pg_class "
+                "WHERE oid = to_regclass(:name)"
+            ), {"name": f"public.{name}"})).first()
+            if row:
+                print(f"  {name:<28}{max(row[0], 0):>12,} rows{row[1]:>12}")
+
+
+async def create(conn, args):
+    for table in PARTITIONED_TABLES:
+        created = await conn.run_sync(ensure_partitions, table, args.interval, args.ahead)
+        print(f"{table}: created {', '.join(created) if created else 'nothing'}")
+
+
+async def archive(conn, name, directory):
+    path = os.path.join(directory, f"{name}.csv.gz")
+    raw = await conn.get_raw_connection()
+    with gzip.open(path, "wb") as f:
+        async def write(chunk):
+            f.write(chunk)
+        await raw.driver_connection.copy_from_table(name, output=write, format="csv", header=True)
+    await conn.execute(text(f'DROP TABLE "{name}"'))
+    print(f"  archived {name} to {path}")
+
+
+async def detach(conn, args):
+    before = date.fromisoformat(args.before)
+    if args.archive_dir:
+        os.makedirs(args.archive_dir, exist_ok=True)
+    for table in PARTITIONED_TABLES:
+        detached = await conn.run_sync(detach_partitions, table, before)
+        print(f"{table}: detached {', '.join(detached) if detached else 'nothing'}")
+        if args.archive_dir:
+            for name in detached:
+                await archive(conn, name, args.archive_dir)
+
+
+async def main(args):
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Partitioning is only available on PostgreSQL")
+    async with engine.begin() as conn:
+        await args.command(conn, args)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage expense and income partitions")
+    commands = parser.add_subparsers(required=True)
+
+    status_parser = commands.add_parser("status", help="list partitions with row estimates and sizes")
+    status_parser.set_defaults(command=status)
+
+    create_parser = commands.add_parser("create", help="create upcoming partitions")
+    create_parser.add_argument("--ahead", type=int, default=settings.PARTITION_PREMAKE)
+    create_parser.add_argument("--interval", choices=["year", "month"], default=settings.PARTITION_INTERVAL)
+    create_parser.set_defaults(command=create)
+
+    detach_parser = commands.add_parser("detach", help="detach partitions that end on or before a date")
+    detach_parser.add_argument("--before", required=True, help="YYYY-MM-DD")
+    detach_parser.add_argument("--archive-dir", help="write each detached partition to <dir>/<name>.csv.gz and drop it")
+    detach_parser.set_defaults(command=detach)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,29 @@
+"""
+Print a signed X-Profile header for one request. Needs the server's
+PROFILING_SECRET in the environment; tokens expire after five minutes.
+
+    python -m scripts.profile_token GET /expenses/analytics
+    curl -H "$(python -m scripts.profile_token GET /expenses/analytics)" ...
+
+The response carries X-Profile-Id; the speedscope file and phase breakdown
+are written to logs/profiles/<id>.*.json on the server.
+"""
+import argparse
+
+from app.core.config import settings
+from app.core.profiling import sign
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign a request for on-demand profiling")
+    parser.add_argument("method")
+    parser.add_argument("path", help="path only, without the query string")
+    args = parser.parse_args()
+
+    if not settings.PROFILING_SECRET:
+        raise SystemExit("PROFILING_SECRET is not set")
+    print(f"X-Profile: {sign(args.method, args.path)}")
+
+
+if __name__ == "__main__":
+    main()
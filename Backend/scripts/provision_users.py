@@ -0,0 +1,49 @@
+"""
+Create accounts in bulk from a CSV file, each with the default categories.
+
+    python -m scripts.provision_users accounts.csv
+    python -m scripts.provision_users accounts.csv --batch-size 5000 --unverified
+
+The CSV needs an email column; full_name, password_hash (a bcrypt hash) and
+auth_provider are optional. Emails that already have an account are skipped,
+so an interrupted import can simply be run again. Accounts without a
+password_hash sign in with Google or set a password through forgot-password.
+"""
+import argparse
+import asyncio
+import csv
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.services.provisioning_service import ACCOUNT_FIELDS, provisioning_service
+
+
+def read_accounts(path, verified):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if "email" not in (reader.fieldnames or []):
+            raise SystemExit(f"{path} has no email column")
+        return [
+            {
+                **{key: value for key, value in row.items() if key in ACCOUNT_FIELDS and value},
+                "email": row["email"].strip(),
+                "is_verified": verified,
+            }
+            for row in reader
+            if row["email"].strip()
+        ]
+
+
+async def main(args):
+    accounts = read_accounts(args.csv, verified=not args.unverified)
+    created = await provisioning_service.provision(AsyncSessionLocal, accounts, args.batch_size)
+    await engine.dispose()
+    print(f"Created {created} accounts, skipped {len(accounts) - created} existing.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Provision accounts in bulk")
+    parser.add_argument("csv", help="CSV file with an email column")
+    parser.add_argument("--batch-size", type=int, default=settings.PROVISION_BATCH_SIZE)
+    parser.add_argument("--unverified", action="store_true", help="require an OTP verification on first login")
+    asyncio.run(main(parser.parse_args()))
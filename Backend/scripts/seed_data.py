@@ -0,0 +1,258 @@
+"""
+Seed synthetic users with realistic categories, expenses, incomes and budgets
+for benchmarking. Rows go in with COPY on PostgreSQL and batched multi-row
+INSERTs elsewhere, one user per transaction.
+
+    python -m scripts.seed_data --users 50 --months 36 --expenses-per-month 80
+    python -m scripts.seed_data --reset          # drop previously seeded users first
+
+Every seeded user is loadtest+<n>@example.com with password --password, which
+is what scripts/load_test.py logs in with.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import bcrypt
+from sqlalchemy import delete, insert, select
+
+from app.db.money import Money, to_cents
+from app.db.session import engine
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.otp import OTPCode
+from app.models.snapshot import PeriodSnapshot
+from app.models.sync import SyncTombstone
+from app.models.user import User
+
+EMAIL_PREFIX = "loadtest"
+DEFAULT_PASSWORD = "LoadTest123!"
+
+# name: (share of transactions, median amount, spread, descriptions)
+EXPENSE_CATEGORIES = {
+    "Groceries": (0.28, 45, 0.6, ["Supermarket", "Farmers market", "Bakery", "Weekly shop"]),
+    "Dining": (0.18, 25, 0.7, ["Lunch", "Coffee", "Dinner out", "Takeaway pizza"]),
+    "Transport": (0.15, 12, 0.8, ["Metro card", "Taxi", "Fuel", "Parking"]),
+    "Shopping": (0.10, 60, 1.0, ["Clothes", "Electronics", "Books", "Home goods"]),
+    "Entertainment": (0.08, 30, 0.8, ["Cinema", "Concert tickets", "Streaming", "Games"]),
+    "Utilities": (0.06, 80, 0.4, ["Electricity bill", "Water bill", "Internet", "Phone plan"]),
+    "Health": (0.05, 40, 0.9, ["Pharmacy", "Doctor visit", "Gym membership", "Dentist"]),
+    "Travel": (0.03, 250, 0.9, ["Flight", "Hotel", "Train tickets", "Car rental"]),
+    "Rent": (0.02, 1200, 0.15, ["Monthly rent"]),
+    "Gifts": (0.05, 35, 0.9, ["Birthday gift", "Flowers", "Donation"]),
+}
+INCOME_CATEGORIES = ["Salary", "Freelance", "Investments", "Gifts"]
+EXPENSE_COLUMNS = [
+    "id", "user_id", "amount", "category_id", "description",
+    "is_deleted", "date", "created_at", "updated_at", "change_seq",
+]
+INCOME_COLUMNS = [
+    "id", "user_id", "amount", "source", "category_id", "description",
+    "date", "created_at", "updated_at", "change_seq",
+]
+
+
+def lognormal_amount(rng: random.Random, median: float, spread: float) -> Decimal:
+    return Decimal(f"{max(rng.lognormvariate(0, spread) * median, 0.5):.2f}")
+
+
+def month_starts(months: int):
+    today = datetime.now(timezone.utc)
+    year, month = today.year, today.month
+    starts = []
+    for _ in range(months):
+        starts.append(datetime(year, month, 1, tzinfo=timezone.utc))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return list(reversed(starts))
+
+
+def random_time_in_month(rng: random.Random, start: datetime) -> datetime:
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    end = min(next_month, datetime.now(timezone.utc))
+    return start + timedelta(seconds=rng.uniform(0, max((end - start).total_seconds(), 1)))
+
+
+class Sequence:
+    """Per-user change sequence, matching what data_version_service would have stamped."""
+
+    def __init__(self):
+        self.value = 0
+
+    def next(self) -> int:
+        self.value += 1
+        return self.value
+
+
+def generate_expenses(rng, user_id, categories, months, per_month, seq):
+    names = list(EXPENSE_CATEGORIES)
+    weights = [EXPENSE_CATEGORIES[n][0] for n in names]
+    for start in months:
+        count = max(int(rng.gauss(per_month, per_month * 0.2)), 1)
+        for name in rng.choices(names, weights, k=count):
+            _, median, spread, descriptions = EXPENSE_CATEGORIES[name]
+            when = random_time_in_month(rng, start)
+            yield (
+                uuid.uuid4(), user_id, lognormal_amount(rng, median, spread), categories[name],
+                rng.choice(descriptions), rng.random() < 0.02, when, when, when, seq.next(),
+            )
+
+
+def generate_incomes(rng, user_id, categories, months, seq):
+    salary = Decimal(f"{rng.uniform(2500, 9000):.2f}")
+    for start in months:
+        payday = start + timedelta(days=rng.randint(0, 3), hours=9)
+        rows = [("Salary", salary, "Monthly salary", payday)]
+        if rng.random() < 0.3:
+            rows.append(("Freelance", lognormal_amount(rng, 600, 0.6), "Side project", random_time_in_month(rng, start)))
+        if rng.random() < 0.15:
+            rows.append(("Investments", lognormal_amount(rng, 150, 0.8), "Dividends", random_time_in_month(rng, start)))
+        for source, amount, description, when in rows:
+            yield (
+                uuid.uuid4(), user_id, amount, source, categories[source], description,
+                when, when, when, seq.next(),
+            )
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def write_rows(conn, table, columns, rows, batch_size):
+    count = 0
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        # COPY skips SQLAlchemy's type processing; convert amounts for MONEY_STORAGE=cents
+        money = [i for i, name in enumerate(columns) if isinstance(table.c[name].type, Money) and table.c[name].type.cents]
+        if money:
+            rows = ([to_cents(v) if i in money else v for i, v in enumerate(row)] for row in rows)
+        for batch in batched(rows, batch_size):
+            await raw.driver_connection.copy_records_to_table(table.name, records=batch, columns=columns)
+            count += len(batch)
+    else:
+        for batch in batched(rows, batch_size):
+            await conn.execute(insert(table), [dict(zip(columns, row)) for row in batch])
+            count += len(batch)
+    return count
+
+
+async def seed_user(conn, index, args, password_hash):
+    rng = random.Random(args.seed + index)
+    seq = Sequence()
+    user_id = uuid.uuid4()
+    months = month_starts(args.months)
+
+    await conn.execute(insert(User.__table__).values(
+        id=user_id,
+        email=f"{EMAIL_PREFIX}+{index}@example.com",
+        full_name=f"Load Test {index}",
+        password_hash=password_hash,
+        auth_provider="email",
+        is_verified=True,
+    ))
+
+    category_rows = [
+        {"name": name, "type": "expense", "is_default": True, "user_id": user_id, "change_seq": seq.next()}
+        for name in EXPENSE_CATEGORIES
+    ] + [
+        {"name": name, "type": "income", "is_default": True, "user_id": user_id, "change_seq": seq.next()}
+        for name in INCOME_CATEGORIES
+    ]
+    result = await conn.execute(
+        insert(Category.__table__).returning(Category.__table__.c.id, Category.__table__.c.name, Category.__table__.c.type),
+        category_rows,
+    )
+    expense_categories, income_categories = {}, {}
+    for row in result:
+        (expense_categories if row.type == "expense" else income_categories)[row.name] = row.id
+
+    expenses = await write_rows(
+        conn, Expense.__table__, EXPENSE_COLUMNS,
+        generate_expenses(rng, user_id, expense_categories, months, args.expenses_per_month, seq),
+        args.batch_size,
+    )
+    incomes = await write_rows(
+        conn, Income.__table__, INCOME_COLUMNS,
+        generate_incomes(rng, user_id, income_categories, months, seq),
+        args.batch_size,
+    )
+
+    # An overall budget every month plus category budgets for the big spenders
+    budget_rows = []
+    for start in months:
+        overall = Decimal(args.expenses_per_month * 55).quantize(Decimal("1"))
+        budget_rows.append({"user_id": user_id, "category_id": None, "amount": overall,
+                            "month": start.month, "year": start.year, "change_seq": seq.next()})
+        for name, share in (("Groceries", 14), ("Dining", 6), ("Transport", 3)):
+            budget_rows.append({"user_id": user_id, "category_id": expense_categories[name],
+                                "amount": Decimal(args.expenses_per_month * share),
+                                "month": start.month, "year": start.year, "change_seq": seq.next()})
+    await conn.execute(insert(Budget.__table__), budget_rows)
+
+    await conn.execute(
+        User.__table__.update().where(User.__table__.c.id == user_id).values(data_version=seq.value)
+    )
+    return expenses, incomes
+
+
+async def reset(conn):
+    users = select(User.id).where(User.email.like(f"{EMAIL_PREFIX}+%@example.com")).scalar_subquery()
+    for model in (Expense, Income, Budget, PeriodSnapshot, SyncTombstone, OTPCode, Category):
+        await conn.execute(delete(model.__table__).where(model.__table__.c.user_id.in_(users)))
+    result = await conn.execute(delete(User.__table__).where(User.__table__.c.id.in_(users)))
+    print(f"Removed {result.rowcount} seeded users.")
+
+
+async def main(args):
+    password_hash = bcrypt.hashpw(args.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    if args.reset:
+        async with engine.begin() as conn:
+            await reset(conn)
+
+    async with engine.connect() as conn:
+        existing = await conn.scalar(
+            select(User.id).where(User.email == f"{EMAIL_PREFIX}+{args.start}@example.com")
+        )
+    if existing:
+        raise SystemExit(f"{EMAIL_PREFIX}+{args.start}@example.com already exists; use --reset or --start")
+
+    started = time.perf_counter()
+    total_expenses = total_incomes = 0
+    for index in range(args.start, args.start + args.users):
+        async with engine.begin() as conn:
+            expenses, incomes = await seed_user(conn, index, args, password_hash)
+        total_expenses += expenses
+        total_incomes += incomes
+        elapsed = time.perf_counter() - started
+        print(f"user {index}: {expenses} expenses, {incomes} incomes "
+              f"({(total_expenses + total_incomes) / elapsed:,.0f} rows/s)")
+
+    await engine.dispose()
+    print(f"Seeded {args.users} users, {total_expenses:,} expenses and {total_incomes:,} incomes "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic data for load tests")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--start", type=int, default=0, help="index of the first user, to add to an existing seed")
+    parser.add_argument("--months", type=int, default=24, help="history length per user")
+    parser.add_argument("--expenses-per-month", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded users first")
+    asyncio.run(main(parser.parse_args()))
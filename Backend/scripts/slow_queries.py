@@ -0,0 +1,40 @@
+"""
+Top slow-query offenders from logs/slow_queries.log, grouped by normalized
+fingerprint and ranked by total time.
+
+    python -m scripts.slow_queries --top 10
+    python -m scripts.slow_queries --route "GET /expenses/" --plans
+"""
+import argparse
+import json
+
+from app.core.logging import SLOW_QUERY_LOG_FILE
+from app.db.slow_queries import read_records, top_offenders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate slow queries by fingerprint")
+    parser.add_argument("--file", default=SLOW_QUERY_LOG_FILE, help="slow query log (rotated backups are read too)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--route", help='only queries issued by this route, e.g. "GET /expenses/"')
+    parser.add_argument("--plans", action="store_true", help="print the latest captured EXPLAIN plan")
+    args = parser.parse_args()
+
+    offenders = top_offenders(read_records(args.file), limit=args.top, route=args.route)
+    if not offenders:
+        print("No slow queries recorded.")
+        return
+
+    for rank, entry in enumerate(offenders, start=1):
+        print(f"#{rank} {entry['fingerprint']}  count={entry['count']}  total={entry['total_ms']}ms  "
+              f"avg={entry['avg_ms']}ms  max={entry['max_ms']}ms")
+        if entry["routes"]:
+            print(f"   routes: {', '.join(entry['routes'])}")
+        print(f"   {entry['statement']}")
+        if args.plans and entry["plan"]:
+            print(json.dumps(entry["plan"], indent=2))
+        print()
+
+
+if __name__ == "__main__":
+    main()
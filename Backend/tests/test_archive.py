@@ -0,0 +1,113 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select, update
+
+from app.core.security import get_current_user
+from app.models.archive import ExpenseArchive
+from app.models.expense import Expense
+from app.models.user import User
+from app.services.archive_service import archive_service
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        return await db_session.get(User, uuid.UUID("123e4567-e89b-12d3-a456-426614174000"))
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+async def create_expenses(client, headers, dates):
+    cat_res = await client.post("/expenses/categories", json={"name": "Old", "type": "expense"}, headers=headers)
+    ids = []
+    for day in dates:
+        res = await client.post(
+            "/expenses/",
+            json={"amount": 10.0, "category_id": cat_res.json()["id"], "date": day},
+            headers=headers
+        )
+        ids.append(res.json()["id"])
+    return ids
+
+@pytest.mark.asyncio
+async def test_old_deletions_are_archived_and_restorable(client: AsyncClient, auth_headers, db_session):
+    expense_id, recent_id = await create_expenses(client, auth_headers, ["2024-01-05T09:00:00", "2024-01-06T09:00:00"])
+    await client.delete(f"/expenses/{expense_id}", headers=auth_headers)
+    await client.delete(f"/expenses/{recent_id}", headers=auth_headers)
+    sync = (await client.get("/sync", headers=auth_headers)).json()
+
+    # Only the deletion that is past the retention window moves
+    await db_session.execute(
+        update(Expense).where(Expense.id == uuid.UUID(expense_id))
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=40))
+    )
+    await db_session.commit()
+    moved = await archive_service.run(TestingSessionLocal, deleted_after_days=30, batch_size=1, pause_ms=0)
+    assert moved == {"deleted": 1, "history": 0}
+
+    async with TestingSessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(Expense)) == 1
+        assert (await db.get(ExpenseArchive, uuid.UUID(expense_id))).reason == "deleted"
+
+    # A client syncing from before the deletion still learns about it
+    delta = (await client.get(f"/sync?since={int(sync['token']) - 2}", headers=auth_headers)).json()
+    assert expense_id in [d["id"] for d in delta["deleted"]]
+
+    restored = await client.patch(f"/expenses/{expense_id}/restore", headers=auth_headers)
+    assert restored.status_code == 200
+    assert restored.json()["id"] == expense_id
+    listed = (await client.get("/expenses/", headers=auth_headers)).json()
+    assert [e["id"] for e in listed["data"]] == [expense_id]
+    async with TestingSessionLocal() as db:
+        assert await db.get(ExpenseArchive, uuid.UUID(expense_id)) is None
+
+@pytest.mark.asyncio
+async def test_history_archival_is_opt_in(client: AsyncClient, auth_headers):
+    old_year = datetime.now().year - 8
+    await create_expenses(client, auth_headers, [f"{old_year}-03-01T09:00:00", f"{datetime.now().year}-01-01T09:00:00"])
+
+    assert await archive_service.run(TestingSessionLocal, history_after_years=0, pause_ms=0) == {"deleted": 0, "history": 0}
+    moved = await archive_service.run(TestingSessionLocal, history_after_years=7, pause_ms=0)
+    assert moved == {"deleted": 0, "history": 1}
+
+    listed = (await client.get("/expenses/", headers=auth_headers)).json()
+    assert listed["total"] == 1
+
+@pytest.mark.asyncio
+async def test_restore_after_the_category_was_deleted(client: AsyncClient, auth_headers, db_session):
+    (expense_id,) = await create_expenses(client, auth_headers, ["2024-01-05T09:00:00"])
+    (old_category,) = [c["id"] for c in (await client.get("/expenses/categories", headers=auth_headers)).json()]
+    await client.delete(f"/expenses/{expense_id}", headers=auth_headers)
+    await db_session.execute(
+        update(Expense).where(Expense.id == uuid.UUID(expense_id))
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=40))
+    )
+    await db_session.commit()
+    await archive_service.run(TestingSessionLocal, deleted_after_days=30, pause_ms=0)
+
+    # Nothing in expenses references it any more
+    res = await client.delete(f"/expenses/categories/{old_category}", headers=auth_headers)
+    assert res.status_code == 204
+
+    res = await client.patch(f"/expenses/{expense_id}/restore", headers=auth_headers)
+    assert res.status_code == 409
+    assert res.json()["details"] == {"category_id": old_category}
+    async with TestingSessionLocal() as db:
+        assert await db.get(ExpenseArchive, uuid.UUID(expense_id)) is not None
+
+    res = await client.patch(f"/expenses/{expense_id}/restore?category_id={old_category}", headers=auth_headers)
+    assert res.status_code == 400
+
+    new_category = (await client.post(
+        "/expenses/categories", json={"name": "New", "type": "expense"}, headers=auth_headers
+    )).json()["id"]
+    res = await client.patch(f"/expenses/{expense_id}/restore?category_id={new_category}", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["category_id"] == new_category
+    async with TestingSessionLocal() as db:
+        assert await db.get(ExpenseArchive, uuid.UUID(expense_id)) is None
@@ -0,0 +1,51 @@
+import logging
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.db.backfill import PROGRESS_TABLE, backfill
+
+@pytest.fixture
+def conn():
+    engine = sa.create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(sa.text("CREATE TABLE items (id INTEGER PRIMARY KEY, source TEXT, copy TEXT)"))
+        conn.execute(sa.text("INSERT INTO items (id, source) VALUES " + ", ".join(f"({i}, 's{i}')" for i in range(1, 26))))
+        conn.commit()
+        yield conn
+
+def migrate(conn, **kwargs):
+    """Run a backfill the way a migration's upgrade() would."""
+    context = MigrationContext.configure(conn)
+    with context.begin_transaction(), Operations.context(context):
+        return backfill("items", pause_ms=0, batch_size=10, **kwargs)
+
+def copied(conn):
+    return conn.scalar(sa.text("SELECT count(*) FROM items WHERE copy = source"))
+
+def test_backfill_runs_in_batches_and_cleans_up(conn, caplog):
+    with caplog.at_level(logging.INFO, logger="alembic.runtime.migration"):
+        visited = migrate(conn, update="copy = source", where="copy IS NULL")
+    assert visited == 25
+    assert copied(conn) == 25
+    assert sum("Backfill items.id:" in r.message and "rows/s" in r.message for r in caplog.records) == 3
+    assert conn.scalar(sa.text(f"SELECT count(*) FROM {PROGRESS_TABLE}")) == 0
+
+def test_backfill_resumes_after_the_last_checkpoint(conn):
+    calls = []
+
+    def process(conn, lower, upper):
+        calls.append((lower, upper))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        conn.execute(sa.text("UPDATE items SET copy = source WHERE id BETWEEN :l AND :u"), {"l": lower, "u": upper})
+
+    with pytest.raises(RuntimeError):
+        migrate(conn, process=process, name="copy")
+    assert conn.scalar(sa.text(f"SELECT last_key FROM {PROGRESS_TABLE} WHERE name = 'copy'")) == "10"
+    conn.rollback()
+
+    migrate(conn, process=process, name="copy")
+    assert calls == [(1, 10), (11, 20), (11, 20), (21, 25)]
+    assert copied(conn) == 25
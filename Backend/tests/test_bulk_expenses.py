@@ -0,0 +1,122 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.security import get_current_user
+from app.models.expense import Expense
+from app.models.user import User
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        return await db_session.get(User, uuid.UUID("123e4567-e89b-12d3-a456-426614174000"))
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+async def seed(client, headers):
+    categories = []
+    for name in ["Food", "Travel"]:
+        res = await client.post("/expenses/categories", json={"name": name, "type": "expense"}, headers=headers)
+        categories.append(res.json()["id"])
+    ids = []
+    for i, (category_id, description) in enumerate([(0, "lunch"), (0, "dinner"), (1, "train")]):
+        res = await client.post("/expenses/", json={
+            "amount": 10.0 * (i + 1), "category_id": categories[category_id],
+            "description": description, "date": f"2024-03-1{i}T12:00:00"
+        }, headers=headers)
+        ids.append(res.json()["id"])
+    await client.post("/budgets/", json={"amount": 100.0, "month": 3, "year": 2024}, headers=headers)
+    return categories, ids
+
+async def live_expenses():
+    async with TestingSessionLocal() as db:
+        rows = await db.execute(select(Expense.id, Expense.category_id).where(Expense.is_deleted == False))
+        return {str(row.id): row.category_id for row in rows}
+
+@pytest.mark.asyncio
+async def test_bulk_delete_and_restore_by_ids(client: AsyncClient, auth_headers):
+    _, ids = await seed(client, auth_headers)
+
+    res = await client.post("/expenses/bulk/delete?month=3&year=2024", json={"ids": ids[:2]}, headers=auth_headers)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["affected"] == 2
+    assert float(body["summary"]["total_month"]) == 30.0
+    assert float(body["budgets"][0]["spent"]) == 30.0
+    assert set(await live_expenses()) == {ids[2]}
+
+    # Already deleted rows aren't counted again
+    res = await client.post("/expenses/bulk/delete", json={"ids": ids[:2]}, headers=auth_headers)
+    assert res.json()["affected"] == 0
+
+    res = await client.post("/expenses/bulk/restore?month=3&year=2024", json={"ids": ids}, headers=auth_headers)
+    assert res.json()["affected"] == 2
+    assert float(res.json()["summary"]["total_month"]) == 60.0
+
+@pytest.mark.asyncio
+async def test_bulk_recategorize_by_filter_unblocks_category_delete(client: AsyncClient, auth_headers):
+    (food, travel), ids = await seed(client, auth_headers)
+    await client.delete(f"/expenses/{ids[1]}", headers=auth_headers)
+
+    res = await client.delete(f"/expenses/categories/{food}", headers=auth_headers)
+    assert res.status_code == 400
+
+    res = await client.post("/expenses/bulk/recategorize", json={
+        "filter": {"category_id": food}, "target_category_id": travel
+    }, headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["affected"] == 2  # the soft-deleted one moves too
+    assert set((await live_expenses()).values()) == {travel}
+
+    res = await client.delete(f"/expenses/categories/{food}", headers=auth_headers)
+    assert res.status_code == 204
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_search_filter(client: AsyncClient, auth_headers):
+    _, ids = await seed(client, auth_headers)
+
+    res = await client.post("/expenses/bulk/delete", json={"filter": {"search": "train"}}, headers=auth_headers)
+    assert res.json()["affected"] == 1
+    assert set(await live_expenses()) == {ids[0], ids[1]}
+
+@pytest.mark.asyncio
+async def test_bulk_actions_validate_input(client: AsyncClient, auth_headers):
+    (food, _), ids = await seed(client, auth_headers)
+
+    res = await client.post("/expenses/bulk/delete", json={}, headers=auth_headers)
+    assert res.status_code == 422
+    res = await client.post("/expenses/bulk/delete", json={"ids": ids, "filter": {}}, headers=auth_headers)
+    assert res.status_code == 422
+
+    # A filter without criteria would match everything
+    for empty in ({}, {"search": ""}):
+        res = await client.post("/expenses/bulk/delete", json={"filter": empty}, headers=auth_headers)
+        assert res.status_code == 422
+    assert len(await live_expenses()) == len(ids)
+
+    # Another user's category can't be a target
+    res = await client.post("/expenses/bulk/recategorize", json={
+        "ids": ids, "target_category_id": food + 100
+    }, headers=auth_headers)
+    assert res.status_code == 400
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_scoped_to_the_owner(client: AsyncClient, auth_headers, db_session):
+    _, ids = await seed(client, auth_headers)
+    other = User(id=uuid.uuid4(), email="other@example.com")
+    db_session.add(other)
+    await db_session.commit()
+
+    async def get_other_user():
+        return await db_session.get(User, other.id)
+    app.dependency_overrides[get_current_user] = get_other_user
+
+    res = await client.post("/expenses/bulk/delete", json={"ids": ids}, headers=auth_headers)
+    assert res.json()["affected"] == 0
+    assert len(await live_expenses()) == 3
@@ -0,0 +1,59 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_current_user
+from app.models.category import Category
+from app.models.user import User
+import uuid
+from app.main import app
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        return await db_session.get(User, USER_ID)
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_names_are_unique_ignoring_case(client: AsyncClient, auth_headers):
+    res = await client.post("/expenses/categories", json={"name": "Food", "type": "expense"}, headers=auth_headers)
+    assert res.status_code == 201
+
+    res = await client.post("/expenses/categories", json={"name": "FOOD", "type": "expense"}, headers=auth_headers)
+    assert res.status_code == 400
+    assert res.json()["message"] == "A category with this name already exists."
+
+    # Same name with the other type is a different category
+    res = await client.post("/expenses/categories", json={"name": "food", "type": "income"}, headers=auth_headers)
+    assert res.status_code == 201
+
+@pytest.mark.asyncio
+async def test_rename_onto_an_existing_name_is_rejected(client: AsyncClient, auth_headers):
+    await client.post("/expenses/categories", json={"name": "Food", "type": "expense"}, headers=auth_headers)
+    res = await client.post("/expenses/categories", json={"name": "Travel", "type": "expense"}, headers=auth_headers)
+    travel_id = res.json()["id"]
+
+    res = await client.put(f"/expenses/categories/{travel_id}", json={"name": "fOOD"}, headers=auth_headers)
+    assert res.status_code == 400
+    assert res.json()["message"] == "A category with this name already exists."
+
+    # Changing only the case of its own name is fine
+    res = await client.put(f"/expenses/categories/{travel_id}", json={"name": "TRAVEL"}, headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["name"] == "TRAVEL"
+
+@pytest.mark.asyncio
+async def test_update_reports_missing_and_default_categories(client: AsyncClient, auth_headers, db_session):
+    default = Category(name="Bills", type="expense", user_id=USER_ID, is_default=True)
+    db_session.add(default)
+    await db_session.commit()
+
+    res = await client.put(f"/expenses/categories/{default.id}", json={"name": "Utilities"}, headers=auth_headers)
+    assert res.status_code == 403
+    res = await client.put(f"/expenses/categories/{default.id + 1}", json={"name": "Utilities"}, headers=auth_headers)
+    assert res.status_code == 404
@@ -0,0 +1,135 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.db.instrumentation import QueryStats, current_query_stats
+from app.models.category import Category
+from app.models.user import User
+from app.services.category_service import category_service
+from app.services.data_version_service import data_version_service
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        return await db_session.get(User, USER_ID)
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+async def rename_behind_the_cache(category_id, name):
+    # As another worker would: the database changes, this process isn't told
+    async with TestingSessionLocal() as db:
+        await db.execute(update(Category).where(Category.id == category_id).values(name=name))
+        await db.commit()
+
+@pytest.mark.asyncio
+async def test_category_writes_invalidate_the_cache(client: AsyncClient, auth_headers):
+    res = await client.post("/expenses/categories", json={"name": "Food", "type": "expense"}, headers=auth_headers)
+    category_id = res.json()["id"]
+    await client.post("/expenses/", json={"amount": 10.0, "category_id": category_id, "date": "2024-03-01T12:00:00"},
+                      headers=auth_headers)
+
+    res = await client.get("/expenses/analytics?year=2024", headers=auth_headers)
+    assert res.json()["category_breakdown"][0]["category_name"] == "Food"
+
+    await client.put(f"/expenses/categories/{category_id}", json={"name": "Groceries"}, headers=auth_headers)
+    res = await client.get("/expenses/analytics?year=2024", headers=auth_headers)
+    assert res.json()["category_breakdown"][0]["category_name"] == "Groceries"
+
+    res = await client.get("/expenses/categories", headers=auth_headers)
+    assert [c["name"] for c in res.json()] == ["Groceries"]
+
+@pytest.mark.asyncio
+async def test_unknown_ids_and_expired_entries_are_reread(db_session):
+    db_session.add(Category(name="Food", type="expense", user_id=USER_ID))
+    await db_session.commit()
+    assert [c.name for c in (await category_service.get_category_map(db_session, USER_ID)).values()] == ["Food"]
+
+    # Created elsewhere: a lookup by its id rereads
+    other = Category(name="Salary", type="income", user_id=USER_ID)
+    db_session.add(other)
+    await db_session.commit()
+    assert (await category_service.get_category(db_session, USER_ID, other.id)).type == "income"
+
+    # Renamed elsewhere: served from the cache until the TTL runs out
+    await rename_behind_the_cache(other.id, "Wages")
+    assert (await category_service.get_category(db_session, USER_ID, other.id)).name == "Salary"
+    ttl = settings.CATEGORY_CACHE_TTL_SECONDS
+    settings.CATEGORY_CACHE_TTL_SECONDS = 0
+    try:
+        assert (await category_service.get_category(db_session, USER_ID, other.id)).name == "Wages"
+    finally:
+        settings.CATEGORY_CACHE_TTL_SECONDS = ttl
+
+@pytest.mark.asyncio
+async def test_least_recently_used_users_are_evicted(db_session):
+    max_users = settings.CATEGORY_CACHE_MAX_USERS
+    settings.CATEGORY_CACHE_MAX_USERS = 2
+    try:
+        users = [uuid.uuid4() for _ in range(3)]
+        for user_id in users:
+            await category_service.get_category_map(db_session, user_id)
+        assert list(category_service._cache) == users[1:]
+    finally:
+        settings.CATEGORY_CACHE_MAX_USERS = max_users
+
+@pytest.mark.asyncio
+async def test_writes_on_other_workers_are_seen_through_the_data_version(db_session):
+    food = Category(name="Food", type="expense", user_id=USER_ID)
+    db_session.add(food)
+    await db_session.commit()
+    assert (await category_service.get_category(db_session, USER_ID, food.id)).name == "Food"
+
+    # Renamed elsewhere through the API: the version moves, this cache isn't told
+    async with TestingSessionLocal() as db:
+        await data_version_service.bump(db, USER_ID)
+        await db.execute(update(Category).where(Category.id == food.id).values(name="Groceries"))
+        await db.commit()
+    # The next request reads the new version
+    async with TestingSessionLocal() as db:
+        assert (await category_service.get_category(db, USER_ID, food.id)).name == "Groceries"
+
+@pytest.mark.asyncio
+async def test_hits_reuse_the_request_users_data_version(db_session):
+    db_session.add(Category(name="Food", type="expense", user_id=USER_ID))
+    await db_session.commit()
+    await category_service.get_category_map(db_session, USER_ID)
+
+    async with TestingSessionLocal() as db:
+        # As get_current_user does
+        data_version_service.remember(db, await db.get(User, USER_ID))
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            assert [c.name for c in (await category_service.get_category_map(db, USER_ID)).values()] == ["Food"]
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count == 0
+
+        # A rolled back bump's version is forgotten with it
+        await data_version_service.bump(db, USER_ID)
+        await db.rollback()
+        assert await data_version_service.current(db, USER_ID) == 0
+
+@pytest.mark.asyncio
+async def test_reads_inside_an_uncommitted_write_are_not_cached(db_session):
+    db_session.add(Category(name="Food", type="expense", user_id=USER_ID))
+    await db_session.commit()
+
+    async with TestingSessionLocal() as db:
+        await data_version_service.bump(db, USER_ID)
+        await category_service.get_category_map(db, USER_ID)
+        assert USER_ID not in category_service._cache
+        await db.rollback()
+
+    await category_service.get_category_map(db_session, USER_ID)
+    assert USER_ID in category_service._cache
@@ -0,0 +1,40 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_current_user
+from app.models.user import User
+import uuid
+from app.main import app
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    # Load the seeded user so data_version bumps are visible to later requests
+    async def get_seeded_user():
+        return await db_session.get(User, uuid.UUID("123e4567-e89b-12d3-a456-426614174000"))
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_unchanged_list_returns_304(client: AsyncClient, auth_headers):
+    first = await client.get("/expenses/categories", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = await client.get("/expenses/categories", headers={**auth_headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+
+@pytest.mark.asyncio
+async def test_write_changes_etag(client: AsyncClient, auth_headers):
+    first = await client.get("/budgets/progress?month=1&year=2024", headers=auth_headers)
+    etag = first.headers["etag"]
+
+    await client.post("/budgets/", json={"amount": 300.0, "month": 1, "year": 2024}, headers=auth_headers)
+
+    second = await client.get("/budgets/progress?month=1&year=2024", headers={**auth_headers, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert len(second.json()) == 1
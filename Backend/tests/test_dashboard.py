@@ -0,0 +1,50 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from decimal import Decimal
+
+from app.core.security import get_current_user
+from app.db.session import get_session_factory
+from app.models.user import User
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_session_factory]
+
+@pytest.mark.asyncio
+async def test_dashboard_bundles_all_parts(client: AsyncClient, auth_headers):
+    cat_res = await client.post(
+        "/expenses/categories",
+        json={"name": "Dashboard Cat", "type": "expense"},
+        headers=auth_headers
+    )
+    category_id = cat_res.json()["id"]
+    await client.post("/budgets/", json={"amount": 200.0, "month": 3, "year": 2024}, headers=auth_headers)
+    await client.post(
+        "/expenses/",
+        json={"amount": 50.0, "category_id": category_id, "date": "2024-03-10T10:00:00"},
+        headers=auth_headers
+    )
+
+    response = await client.get("/dashboard?month=3&year=2024", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert Decimal(data["summary"]["total_month"]) == Decimal("50.00")
+    assert len(data["recent_expenses"]) == 1
+    assert [c["name"] for c in data["categories"]] == ["Dashboard Cat"]
+    assert data["budgets"][0]["percent_used"] == 25.0
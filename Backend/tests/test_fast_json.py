@@ -0,0 +1,66 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from datetime import datetime, timezone
+from decimal import Decimal
+import uuid
+
+from app.core.responses import FastJSONResponse
+from app.core.security import get_current_user
+from app.models.user import User
+from app.models.income import Income
+from app.schemas.expense import PaginatedExpenseResponse
+from app.schemas.income import IncomeListResponse
+from app.main import app
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+def test_encoding_matches_pydantic_json_mode():
+    row = {
+        "amount": Decimal("12.50"),
+        "id": uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        "date": datetime(2024, 3, 10, 10, 0, tzinfo=timezone.utc),
+        "created_at": datetime(2024, 3, 10, 10, 0, 0, 123456),
+    }
+    assert FastJSONResponse(row).body == (
+        b'{"amount":"12.50","id":"123e4567-e89b-12d3-a456-426614174000",'
+        b'"date":"2024-03-10T10:00:00Z","created_at":"2024-03-10T10:00:00.123456"}'
+    )
+
+@pytest.mark.asyncio
+async def test_list_payloads_match_response_models(client: AsyncClient, auth_headers, db_session):
+    cat_res = await client.post("/expenses/categories", json={"name": "Rows", "type": "expense"}, headers=auth_headers)
+    income_cat = await client.post("/expenses/categories", json={"name": "Pay", "type": "income"}, headers=auth_headers)
+    await client.post(
+        "/expenses/",
+        json={"amount": 12.5, "category_id": cat_res.json()["id"], "date": "2024-03-10T10:00:00", "description": "Row"},
+        headers=auth_headers
+    )
+    db_session.add(Income(
+        user_id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        amount=Decimal("900.00"),
+        source="Salary",
+        date=datetime(2024, 3, 1, 9, 0),
+        category_id=income_cat.json()["id"]
+    ))
+    await db_session.commit()
+
+    expenses = await client.get("/expenses/", headers=auth_headers)
+    assert "etag" in expenses.headers
+    assert expenses.json() == PaginatedExpenseResponse.model_validate(expenses.json()).model_dump(mode="json")
+
+    incomes = (await client.get("/incomes/", headers=auth_headers)).json()
+    assert incomes == IncomeListResponse.model_validate(incomes).model_dump(mode="json")
+    assert incomes["data"][0]["category"]["name"] == "Pay"
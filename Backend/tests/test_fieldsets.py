@@ -0,0 +1,72 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+import uuid
+
+from app.core.security import get_current_user
+from app.db.session import get_session_factory
+from app.models.user import User
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_session_factory]
+
+async def seed(client, headers):
+    cat_res = await client.post("/expenses/categories", json={"name": "Fields", "type": "expense"}, headers=headers)
+    await client.post(
+        "/expenses/",
+        json={"amount": 20.0, "category_id": cat_res.json()["id"], "date": "2024-05-02T09:00:00", "description": "Lunch"},
+        headers=headers
+    )
+    await client.post("/incomes/", json={"amount": 500.0, "source": "Salary", "date": "2024-05-01T09:00:00"}, headers=headers)
+
+@pytest.mark.asyncio
+async def test_list_endpoints_return_only_requested_fields(client: AsyncClient, auth_headers):
+    await seed(client, auth_headers)
+
+    expenses = (await client.get("/expenses/?fields=date,amount", headers=auth_headers)).json()
+    assert expenses["total"] == 1
+    assert expenses["data"] == [{"amount": "20.00", "date": "2024-05-02T09:00:00"}]
+
+    incomes = (await client.get("/incomes/?fields=source,amount", headers=auth_headers)).json()
+    assert incomes["data"] == [{"amount": 500.0, "source": "Salary"}]
+
+    timeline = (await client.get("/transactions/?fields=type,amount&with_balance=true", headers=auth_headers)).json()
+    assert [set(t) for t in timeline["data"]] == [{"type", "amount"}] * 2
+
+    balance = (await client.get("/transactions/?fields=running_balance&with_balance=true", headers=auth_headers)).json()
+    assert [float(t["running_balance"]) for t in balance["data"]] == [480.0, 500.0]
+
+@pytest.mark.asyncio
+async def test_export_columns_follow_fields(client: AsyncClient, auth_headers):
+    await seed(client, auth_headers)
+
+    response = await client.get("/transactions/export?fields=type,amount", headers=auth_headers)
+    assert response.text.strip().splitlines() == ["Type,Amount", "expense,20.00", "income,500.00"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", [
+    "/expenses/?fields=amount,password_hash",
+    "/incomes/?fields=",
+    "/transactions/?fields=signed_amount",
+    "/transactions/export?fields=running_balance",
+])
+async def test_unknown_fields_are_rejected(client: AsyncClient, auth_headers, url):
+    response = await client.get(url, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "BAD_REQUEST"
+    assert response.json()["details"]["allowed"]
@@ -0,0 +1,88 @@
+import logging
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.db.instrumentation import QueryStats, current_query_stats
+from app.middleware.logging_middleware import LoggingMiddleware
+from app.models.user import User
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_query_count(client: AsyncClient, auth_headers):
+    response = await client.get("/expenses/", headers=auth_headers)
+    assert response.status_code == 200
+    # One COUNT(*) and one page query
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+def test_repeated_statements_flagged():
+    stats = QueryStats()
+    for _ in range(6):
+        stats.record("SELECT * FROM categories WHERE id = ?", 0.001)
+    stats.record("SELECT * FROM expenses", 0.002)
+
+    assert stats.count == 7
+    assert stats.repeated(5) == [("SELECT * FROM categories WHERE id = ?", 6)]
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_timing_state(db_session):
+    for _ in range(3):
+        with pytest.raises(Exception):
+            await db_session.execute(text("SELECT * FROM no_such_table"))
+        await db_session.rollback()
+
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        await db_session.execute(text("SELECT 1"))
+        connection = await db_session.connection()
+    finally:
+        current_query_stats.reset(token)
+    assert stats.count == 1
+    assert "query_start_time" not in connection.info
+
+@pytest.mark.asyncio
+async def test_streamed_bodies_are_scanned_for_n_plus_one(caplog):
+    rows = settings.N_PLUS_ONE_THRESHOLD + 1
+    export_app = FastAPI()
+    export_app.add_middleware(LoggingMiddleware)
+
+    @export_app.get("/export")
+    async def export():
+        async def lines():
+            async with TestingSessionLocal() as db:
+                for i in range(rows):
+                    # One lookup per row, run after the headers have gone out
+                    yield f"{await db.scalar(text('SELECT :i'), {'i': i})}\n"
+        return StreamingResponse(lines(), media_type="text/csv")
+
+    with caplog.at_level(logging.INFO, logger="expense_app"):
+        async with AsyncClient(transport=ASGITransport(app=export_app), base_url="http://test") as ac:
+            response = await ac.get("/export")
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == rows
+    messages = [r.message for r in caplog.records]
+    assert any(m.startswith("RESPONSE: GET /export") and f"Queries: {rows}" in m for m in messages)
+    assert any(m.startswith("N+1 SUSPECT: GET /export") and f"{rows} times" in m for m in messages)
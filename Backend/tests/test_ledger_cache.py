@@ -0,0 +1,148 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services import ledger_service as ledger_module
+from app.services.budget_service import budget_service
+from app.services.data_version_service import data_version_service
+from app.services.expense_service import expense_service
+from app.services.ledger_service import ledger_service
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+needs_numpy = pytest.mark.skipif(ledger_module.np is None, reason="NumPy is not installed")
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        return await db_session.get(User, USER_ID)
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.fixture
+def ledger_enabled():
+    settings.LEDGER_CACHE_ENABLED = True
+    yield
+    settings.LEDGER_CACHE_ENABLED = False
+
+async def seed(client, headers):
+    now = datetime.now()
+    last_month = now.replace(day=1) - timedelta(days=1)
+    categories = []
+    for name in ["Food", "Travel"]:
+        res = await client.post("/expenses/categories", json={"name": name, "type": "expense"}, headers=headers)
+        categories.append(res.json()["id"])
+    expenses = []
+    for amount, category_id, day in [
+        ("12.34", categories[0], now), ("0.10", categories[0], now.replace(day=1)),
+        ("0.20", categories[1], now.replace(day=1)), ("99.99", categories[1], last_month),
+    ]:
+        res = await client.post("/expenses/", json={
+            "amount": amount, "category_id": category_id, "date": day.replace(hour=12).isoformat()
+        }, headers=headers)
+        expenses.append(res.json()["id"])
+    incomes = []
+    for amount, day in [(1000.5, now.replace(day=1)), (250.25, last_month)]:
+        res = await client.post("/incomes/", json={
+            "amount": amount, "source": "Salary", "date": day.replace(hour=9).isoformat()
+        }, headers=headers)
+        incomes.append(res.json()["id"])
+    await client.post("/budgets/", json={"amount": 50, "month": now.month, "year": now.year}, headers=headers)
+    await client.post("/budgets/", json={
+        "amount": 20, "month": now.month, "year": now.year, "category_id": categories[0]
+    }, headers=headers)
+    return categories, expenses, incomes
+
+async def aggregates():
+    now = datetime.now()
+    async with TestingSessionLocal() as db:
+        summary = await expense_service.get_monthly_summary(db, USER_ID)
+        summary["by_category"].sort(key=lambda c: c["category_id"])
+        analytics = await expense_service.get_analytics_data(db, USER_ID)
+        budgets = [b.model_dump() for b in await budget_service.get_budget_progress(db, USER_ID, now.month, now.year)]
+        return summary, analytics, budgets
+
+async def assert_ledger_matches_sql():
+    settings.LEDGER_CACHE_ENABLED = False
+    expected = await aggregates()
+    settings.LEDGER_CACHE_ENABLED = True
+    assert await aggregates() == expected
+    return expected
+
+@needs_numpy
+@pytest.mark.asyncio
+async def test_ledger_aggregates_match_sql(client: AsyncClient, auth_headers, ledger_enabled):
+    await seed(client, auth_headers)
+    summary, _, budgets = await assert_ledger_matches_sql()
+    assert summary["total_month"] == Decimal("12.64")
+    assert [b["spent"] for b in budgets] == [Decimal("12.64"), Decimal("12.44")]
+
+    # Served from the cache until the next write
+    ledger = ledger_service._cache[USER_ID]
+    async with TestingSessionLocal() as db:
+        assert await ledger_service.get_ledger(db, USER_ID) is ledger
+
+@needs_numpy
+@pytest.mark.asyncio
+async def test_writes_are_applied_as_deltas(client: AsyncClient, auth_headers, ledger_enabled):
+    (food, travel), expenses, incomes = await seed(client, auth_headers)
+    await assert_ledger_matches_sql()
+    loaded_at = ledger_service._cache[USER_ID].loaded_at
+
+    await client.put(f"/expenses/{expenses[0]}", json={"amount": "20.00", "category_id": travel}, headers=auth_headers)
+    await client.delete(f"/expenses/{expenses[1]}", headers=auth_headers)
+    await client.delete(f"/incomes/{incomes[0]}", headers=auth_headers)
+    summary, _, _ = await assert_ledger_matches_sql()
+    assert summary["total_month"] == Decimal("20.20")
+    assert summary["total_income_month"] == 0
+
+    await client.patch(f"/expenses/{expenses[1]}/restore", headers=auth_headers)
+    await client.post("/expenses/bulk/recategorize", json={"ids": expenses, "target_category_id": food},
+                      headers=auth_headers)
+    summary, _, _ = await assert_ledger_matches_sql()
+    assert [c["category_id"] for c in summary["by_category"]] == [food]
+
+    ledger = ledger_service._cache[USER_ID]
+    assert ledger.loaded_at == loaded_at  # never reloaded in full
+    assert len(ledger) == 5
+
+@needs_numpy
+@pytest.mark.asyncio
+async def test_least_recently_used_ledgers_are_evicted(db_session, ledger_enabled):
+    users = [User(id=uuid.uuid4(), email=f"ledger{i}@example.com") for i in range(3)]
+    db_session.add_all(users)
+    await db_session.commit()
+
+    max_users = settings.LEDGER_CACHE_MAX_USERS
+    settings.LEDGER_CACHE_MAX_USERS = 2
+    try:
+        for user in users:
+            await ledger_service.get_ledger(db_session, user.id)
+        assert list(ledger_service._cache) == [user.id for user in users[1:]]
+    finally:
+        settings.LEDGER_CACHE_MAX_USERS = max_users
+
+@pytest.mark.asyncio
+async def test_falls_back_to_sql_without_numpy(db_session, ledger_enabled, monkeypatch):
+    monkeypatch.setattr(ledger_module, "np", None)
+    assert await ledger_service.get_ledger(db_session, USER_ID) is None
+    assert not ledger_service._cache
+
+@needs_numpy
+@pytest.mark.asyncio
+async def test_ledgers_read_inside_an_uncommitted_write_are_not_cached(db_session, ledger_enabled):
+    async with TestingSessionLocal() as db:
+        await data_version_service.bump(db, USER_ID)
+        assert await ledger_service.get_ledger(db, USER_ID) is not None
+        await db.rollback()
+    assert USER_ID not in ledger_service._cache
@@ -0,0 +1,31 @@
+import asyncio
+import time
+import pytest
+
+from app.core.loop_monitor import LoopLagMonitor
+
+def blocking_call():
+    time.sleep(0.3)
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_caught_with_its_stack():
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    blocking_call()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(monitor.stalls) == 1
+    assert "blocking_call" in monitor.stalls[0].stack
+    assert monitor.stalls[0].duration >= 0.1
+
+@pytest.mark.asyncio
+async def test_awaiting_does_not_count_as_a_stall():
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    await asyncio.sleep(0.3)
+    await monitor.stop()
+
+    assert len(monitor.stalls) == 0
@@ -0,0 +1,51 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models.user import User
+import uuid
+from app.main import app
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_metrics_disabled_by_default(client: AsyncClient):
+    response = await client.get("/metrics")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_route_series(client: AsyncClient, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.0/8"])
+
+    await client.get("/expenses/summary/monthly?month=1&year=2020", headers=auth_headers)
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    # Labelled by route template, not the raw URL
+    assert 'http_requests_total{method="GET",route="/expenses/summary/monthly",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/expenses/summary/monthly"}' in body
+    assert 'cache_requests_total{cache="snapshot",result="miss"}' in body
+
+@pytest.mark.asyncio
+async def test_metrics_rejects_addresses_outside_allowlist(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_ALLOWED_IPS", ["10.0.0.0/8"])
+
+    response = await client.get("/metrics")
+    assert response.status_code == 403
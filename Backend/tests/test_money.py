@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, select
+
+from app.db.money import Money, from_cents, to_cents
+from app.schemas.expense import ExpenseCreate
+
+def cents_table():
+    metadata = MetaData()
+    table = Table("ledger", metadata, Column("id", Integer, primary_key=True),
+                  Column("amount", Money(10, cents=True), nullable=False))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    return engine, table
+
+def test_conversion_rounds_half_up_to_the_cent():
+    assert to_cents(Decimal("12.345")) == 1235
+    assert to_cents(12.1) == 1210  # floats go through str(), not their binary value
+    assert to_cents(Decimal("-0.005")) == -1
+    assert from_cents(1235) == Decimal("12.35")
+    assert from_cents(Decimal("100")) == Decimal("1.00")
+
+def test_cents_storage_round_trips_and_aggregates_exactly():
+    engine, table = cents_table()
+    amounts = [Decimal("0.10"), Decimal("0.20"), Decimal("12.345"), Decimal("7")]
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": i, "amount": a} for i, a in enumerate(amounts)])
+
+        assert conn.exec_driver_sql("SELECT amount FROM ledger ORDER BY id").scalars().all() == [10, 20, 1235, 700]
+        assert conn.scalars(select(table.c.amount).order_by(table.c.id)).all() == [
+            Decimal("0.10"), Decimal("0.20"), Decimal("12.35"), Decimal("7.00")
+        ]
+        # Sums stay in cents in the database and come back as exact Decimals
+        assert conn.scalar(select(func.sum(table.c.amount))) == Decimal("19.65")
+        assert conn.scalar(select(func.sum(table.c.amount)).where(table.c.id < 2)) == Decimal("0.30")
+        # Literals compared against the column are converted too
+        assert conn.scalar(select(func.count()).where(table.c.amount > Decimal("7.00"))) == 1
+        assert conn.scalar(select(func.count()).where(table.c.amount == 12.35)) == 1
+
+def test_schemas_round_amounts_to_the_cent():
+    expense = ExpenseCreate(amount="12.345", category_id=1, date="2024-03-01T12:00:00")
+    assert expense.amount == Decimal("12.35")
+    # Rounded before the positivity check
+    with pytest.raises(ValueError):
+        ExpenseCreate(amount="0.004", category_id=1, date="2024-03-01T12:00:00")
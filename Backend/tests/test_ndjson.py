@@ -0,0 +1,67 @@
+import json
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+import uuid
+
+from app.core.responses import NDJSON_MEDIA_TYPE
+from app.core.security import get_current_user
+from app.db.session import get_session_factory
+from app.models.user import User
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_session_factory]
+
+@pytest.mark.asyncio
+async def test_ndjson_streams_every_row(client: AsyncClient, auth_headers):
+    cat_res = await client.post("/expenses/categories", json={"name": "Stream", "type": "expense"}, headers=auth_headers)
+    for day in range(1, 4):
+        await client.post(
+            "/expenses/",
+            json={"amount": float(day), "category_id": cat_res.json()["id"], "date": f"2024-04-0{day}T09:00:00"},
+            headers=auth_headers
+        )
+
+    headers = {**auth_headers, "Accept": NDJSON_MEDIA_TYPE}
+    response = await client.get("/expenses/?limit=1&fields=amount,date&sort=date_asc", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [
+        {"amount": "1.00", "date": "2024-04-01T09:00:00"},
+        {"amount": "2.00", "date": "2024-04-02T09:00:00"},
+        {"amount": "3.00", "date": "2024-04-03T09:00:00"},
+    ]
+
+    # The paged and streamed representations are cached separately
+    paged = await client.get("/expenses/?limit=1&fields=amount,date&sort=date_asc", headers=auth_headers)
+    assert paged.headers["etag"] != response.headers["etag"]
+    assert response.headers["vary"] == "Accept"
+
+@pytest.mark.asyncio
+async def test_income_ndjson(client: AsyncClient, auth_headers):
+    await client.post("/incomes/", json={"amount": 10.0, "source": "Gift", "date": "2024-04-01T09:00:00"}, headers=auth_headers)
+
+    response = await client.get("/incomes/", headers={**auth_headers, "Accept": NDJSON_MEDIA_TYPE})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["source"], r["amount"], r["category"]) for r in rows] == [("Gift", 10.0, None)]
+
+@pytest.mark.asyncio
+async def test_paged_limit_is_capped(client: AsyncClient, auth_headers):
+    response = await client.get("/expenses/?limit=1000000", headers=auth_headers)
+    assert response.status_code == 422
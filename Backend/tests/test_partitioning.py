@@ -0,0 +1,24 @@
+import pytest
+from datetime import date
+
+from app.db import partitioning
+from conftest import engine
+
+def test_partition_names_cover_consecutive_ranges():
+    start = date(2024, 11, 1)
+    names = []
+    for _ in range(3):
+        names.append(partitioning.partition_name("expenses", start, "month"))
+        start = partitioning._next(start, "month")
+    assert names == ["expenses_y2024m11", "expenses_y2024m12", "expenses_y2025m01"]
+    assert partitioning.partition_name("incomes", date(2024, 1, 1), "year") == "incomes_y2024"
+    assert partitioning._floor(date(2024, 7, 19), "year") == date(2024, 1, 1)
+
+def test_names_parse_back_to_bounds():
+    match = partitioning._NAME.match("expenses_y2024m02")
+    assert (match.group("table"), match.group("year"), match.group("month")) == ("expenses", "2024", "02")
+    assert partitioning._NAME.match("expenses_default") is None
+
+@pytest.mark.asyncio
+async def test_maintenance_is_a_no_op_outside_postgres():
+    await partitioning.maintain_partitions(engine)
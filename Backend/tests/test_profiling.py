@@ -0,0 +1,69 @@
+import json
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core import profiling
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models.user import User
+import uuid
+from app.main import app
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, monkeypatch, tmp_path):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    monkeypatch.setattr(settings, "PROFILING_SECRET", "profiling-secret")
+    monkeypatch.setattr(profiling, "PROFILES_DIR", str(tmp_path))
+    app.dependency_overrides[get_current_user] = mock_get_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_signed_request_is_profiled(client: AsyncClient, auth_headers, tmp_path):
+    path = "/expenses/summary/monthly"
+    response = await client.get(
+        f"{path}?month=1&year=2024",
+        headers={**auth_headers, "X-Profile": profiling.sign("GET", path)}
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    speedscope = json.loads((tmp_path / f"{profile_id}.speedscope.json").read_text())
+    assert speedscope["$schema"].startswith("https://www.speedscope.app")
+
+    phases = json.loads((tmp_path / f"{profile_id}.phases.json").read_text())["phases_ms"]
+    assert phases["db"] > 0
+    assert phases["total"] >= phases["db"]
+    assert phases["total"] >= phases["app"] > 0
+    assert {"middleware", "auth", "serialization"} <= set(phases)
+
+@pytest.mark.asyncio
+async def test_bad_signature_is_not_profiled(client: AsyncClient, auth_headers, tmp_path):
+    path = "/expenses/summary/monthly"
+    token = profiling.sign("GET", "/expenses/analytics")  # signed for another path
+    response = await client.get(f"{path}?month=1&year=2024", headers={**auth_headers, "X-Profile": token})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_failed_profile_write_keeps_the_response(client: AsyncClient, auth_headers, tmp_path, monkeypatch):
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_text("")
+    monkeypatch.setattr(profiling, "PROFILES_DIR", str(blocked))
+
+    path = "/expenses/summary/monthly"
+    response = await client.get(
+        f"{path}?month=1&year=2024",
+        headers={**auth_headers, "X-Profile": profiling.sign("GET", path)}
+    )
+    assert response.status_code == 200
+    assert "x-profile-id" in response.headers
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.user import User
+from app.services.category_service import category_service
+from app.services.provisioning_service import provisioning_service
+import uuid
+from conftest import TestingSessionLocal
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+async def category_names(db, user_id):
+    return set((await db.scalars(select(Category.name).where(Category.user_id == user_id))).all())
+
+@pytest.mark.asyncio
+async def test_seeding_skips_categories_the_user_already_has(db_session):
+    db_session.add(Category(name="food", type="expense", user_id=USER_ID))
+    await db_session.commit()
+
+    await category_service.seed_user_categories(db_session, USER_ID)
+    await category_service.seed_user_categories(db_session, USER_ID)  # idempotent
+
+    names = await category_names(db_session, USER_ID)
+    assert names == {"food"} | set(settings.DEFAULT_CATEGORIES["expense"][1:])
+
+@pytest.mark.asyncio
+async def test_provision_creates_new_users_with_categories(db_session):
+    accounts = [{"email": f"user{i}@example.com", "full_name": f"User {i}"} for i in range(25)]
+    accounts.append({"email": "test@example.com", "full_name": "Already here"})
+
+    created = await provisioning_service.provision(TestingSessionLocal, accounts, batch_size=10)
+
+    assert created == 25
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 26
+    existing = await db_session.get(User, USER_ID)
+    assert existing.full_name == "Test User"
+    assert await category_names(db_session, USER_ID) == set()
+
+    user = await db_session.scalar(select(User).where(User.email == "user7@example.com"))
+    assert user.is_verified is True
+    assert await category_names(db_session, user.id) == set(settings.DEFAULT_CATEGORIES["expense"])
+
+    # Rerunning the same import is a no-op
+    assert await provisioning_service.provision(TestingSessionLocal, accounts, batch_size=10) == 0
+
+@pytest.mark.asyncio
+async def test_provision_accepts_rows_with_different_columns(db_session):
+    # As read from a CSV with empty cells
+    accounts = [
+        {"email": "a@x.com", "full_name": "A", "auth_provider": "google"},
+        {"email": "b@x.com"},
+        {"email": "c@x.com", "password_hash": "$2b$12$hash", "is_verified": False},
+    ]
+
+    assert await provisioning_service.provision(TestingSessionLocal, accounts) == 3
+
+    users = {
+        user.email: user
+        for user in await db_session.scalars(select(User).where(User.email.in_([a["email"] for a in accounts])))
+    }
+    assert (users["a@x.com"].full_name, users["a@x.com"].auth_provider) == ("A", "google")
+    assert (users["b@x.com"].full_name, users["b@x.com"].auth_provider) == (None, "email")
+    assert users["b@x.com"].is_verified is True
+    assert (users["c@x.com"].password_hash, users["c@x.com"].is_verified) == ("$2b$12$hash", False)
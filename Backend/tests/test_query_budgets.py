@@ -0,0 +1,114 @@
+import re
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_current_user
+from app.db.session import get_session_factory
+from app.models.user import User
+from app.services.data_version_service import data_version_service
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+# Maximum SQL statements per endpoint, as reported in Server-Timing. The
+# count includes the user lookup that stands in for get_current_user's
+# SELECT. Closed-period reads include the snapshot lookup and store. CSV
+# exports that stream from the database run their query after the headers
+# are sent, so they are not budgeted here. A write is the user lookup, the
+# data version bump and one INSERT/UPDATE/DELETE ... RETURNING, plus the
+# snapshot invalidation since the seeded rows are in a closed year. Raise
+# a budget only with a reason; an unexpected increase is usually an N+1.
+QUERY_BUDGETS = {
+    "GET /expenses/": 3,
+    "GET /expenses/?search=lunch": 3,
+    "GET /expenses/categories": 1,
+    "GET /expenses/summary/monthly?month=3&year=2024": 11,
+    "GET /expenses/analytics?year=2024": 6,
+    "GET /incomes/": 3,
+    "GET /incomes/export/csv": 2,
+    "GET /budgets/progress?month=3&year=2024": 3,
+    "GET /transactions/": 2,
+    "GET /transactions/?with_balance=true": 2,
+    "GET /dashboard?month=3&year=2024": 14,
+    "GET /sync": 5,
+    "POST /expenses/categories": 3,
+    "PUT /expenses/categories/{category_id}": 4,
+    "POST /expenses/": 6,
+    "PUT /expenses/{expense_id}": 4,
+    "DELETE /expenses/{expense_id}": 4,
+    "PATCH /expenses/{expense_id}/restore": 4,
+    "POST /incomes/": 4,
+    "PUT /incomes/{income_id}": 4,
+    "DELETE /incomes/{income_id}": 5,
+    "PUT /budgets/{budget_id}": 3,
+    "DELETE /budgets/{budget_id}": 4,
+}
+
+BODIES = {
+    "POST /expenses/categories": lambda ids: {"name": "Gifts", "type": "expense"},
+    "PUT /expenses/categories/{category_id}": lambda ids: {"name": "Groceries"},
+    "POST /expenses/": lambda ids: {"amount": 20.0, "category_id": ids["category_id"], "date": "2024-03-15T10:00:00"},
+    "PUT /expenses/{expense_id}": lambda ids: {"amount": 30.0},
+    "POST /incomes/": lambda ids: {"amount": 500.0, "source": "Salary", "date": "2024-03-01T09:00:00"},
+    "PUT /incomes/{income_id}": lambda ids: {"amount": 1200.0},
+    "PUT /budgets/{budget_id}": lambda ids: {"amount": 450.0, "month": 3, "year": 2024, "category_id": ids["category_id"]},
+}
+
+@pytest_asyncio.fixture
+async def seeded(client: AsyncClient, db_session):
+    async def get_seeded_user():
+        user = await db_session.get(User, uuid.UUID("123e4567-e89b-12d3-a456-426614174000"))
+        data_version_service.remember(db_session, user)
+        return user
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    headers = {"Authorization": "Bearer mock_token"}
+
+    # Enough rows across categories and months for an N+1 to show up
+    category_ids = []
+    for name in ["Food", "Travel", "Books"]:
+        res = await client.post("/expenses/categories", json={"name": name, "type": "expense"}, headers=headers)
+        category_ids.append(res.json()["id"])
+    expense_ids = []
+    for i in range(9):
+        res = await client.post("/expenses/", headers=headers, json={
+            "amount": 10.0 + i,
+            "category_id": category_ids[i % 3],
+            "date": f"2024-0{1 + i % 3}-1{i}T12:00:00",
+            "description": "lunch" if i % 2 else "train"
+        })
+        expense_ids.append(res.json()["id"])
+    for month in (2, 3):
+        res = await client.post("/incomes/", headers=headers, json={
+            "amount": 1000.0, "source": "Salary", "date": f"2024-0{month}-01T09:00:00"
+        })
+    income_id = res.json()["id"]
+    await client.post("/budgets/", json={"amount": 300.0, "month": 3, "year": 2024}, headers=headers)
+    res = await client.post(
+        "/budgets/", json={"amount": 50.0, "month": 3, "year": 2024, "category_id": category_ids[0]}, headers=headers
+    )
+
+    # Budgets are for the steady state, where the category cache is warm
+    await client.get("/expenses/categories", headers=headers)
+
+    ids = {"category_id": category_ids[0], "expense_id": expense_ids[0], "income_id": income_id, "budget_id": res.json()["id"]}
+    yield headers, ids
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_session_factory]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", list(QUERY_BUDGETS))
+async def test_query_budget(client: AsyncClient, seeded, endpoint):
+    headers, ids = seeded
+    method, path = endpoint.split(" ", 1)
+    body = BODIES[endpoint](ids) if endpoint in BODIES else None
+
+    response = await client.request(method, path.format(**ids), json=body, headers=headers)
+    assert response.status_code < 400, response.text
+
+    queries = int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+    assert queries <= QUERY_BUDGETS[endpoint], (
+        f"{endpoint} ran {queries} SQL statements, budget is {QUERY_BUDGETS[endpoint]}"
+    )
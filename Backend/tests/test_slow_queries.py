@@ -0,0 +1,49 @@
+import json
+import logging
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.logging import slow_query_logger
+from app.db.slow_queries import fingerprint, top_offenders
+
+@pytest_asyncio.fixture
+async def captured(monkeypatch):
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(json.loads(record.getMessage()))
+
+    # Capture everything, in memory instead of logs/slow_queries.log
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    monkeypatch.setattr(slow_query_logger, "handlers", [ListHandler()])
+    yield records
+
+@pytest.mark.asyncio
+async def test_slow_query_records_route_and_parameter_shape(client: AsyncClient, captured):
+    await client.post("/auth/login", json={"email": "nobody@example.com", "password": "secret"})
+
+    lookup = next(r for r in captured if "FROM users" in r["statement"])
+    assert lookup["route"] == "POST /auth/login"
+    assert lookup["duration_ms"] >= 0
+    assert "nobody@example.com" not in json.dumps(lookup["parameters"])
+    assert "str" in json.dumps(lookup["parameters"])
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    a = "SELECT * FROM expenses WHERE user_id = $1 AND id IN ($2, $3) AND amount > 10"
+    b = "select *  from expenses where user_id = $1 and id in ($2, $3, $4, $5) and amount > 250.5"
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint("SELECT * FROM incomes WHERE user_id = $1")
+
+def test_top_offenders_ranked_by_total_time():
+    records = [
+        {"fingerprint": "a", "statement": "SELECT 1", "duration_ms": 600.0, "route": "GET /expenses/"},
+        {"fingerprint": "b", "statement": "SELECT 2", "duration_ms": 900.0, "route": "GET /incomes/"},
+        {"fingerprint": "a", "statement": "SELECT 1", "duration_ms": 700.0, "route": "GET /dashboard"},
+    ]
+    top = top_offenders(records)
+    assert [t["fingerprint"] for t in top] == ["a", "b"]
+    assert top[0]["count"] == 2 and top[0]["total_ms"] == 1300.0
+    assert top[0]["routes"] == ["GET /dashboard", "GET /expenses/"]
@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_current_user
+from app.models.user import User
+from app.models.snapshot import PeriodSnapshot
+import uuid
+from app.main import app
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=USER_ID,
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_closed_period_served_from_snapshot(client: AsyncClient, auth_headers, db_session):
+    payload = {"category_breakdown": [], "monthly_trend": [{"month": "2020-05", "expense": "10.00", "income": "0"}]}
+    db_session.add(PeriodSnapshot(user_id=USER_ID, kind="analytics", year=2020, month=0, payload=payload, etag="abc"))
+    await db_session.commit()
+
+    response = await client.get("/expenses/analytics?year=2020", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == payload
+    assert response.headers["etag"] == '"abc"'
+    assert "max-age" in response.headers["cache-control"]
+
+    cached = await client.get("/expenses/analytics?year=2020", headers={**auth_headers, "If-None-Match": '"abc"'})
+    assert cached.status_code == 304
+
+@pytest.mark.asyncio
+async def test_backdated_write_invalidates_snapshot(client: AsyncClient, auth_headers, db_session):
+    db_session.add(PeriodSnapshot(user_id=USER_ID, kind="analytics", year=2020, month=0, payload={}, etag="abc"))
+    db_session.add(PeriodSnapshot(user_id=USER_ID, kind="analytics", year=2019, month=0, payload={}, etag="def"))
+    await db_session.commit()
+
+    cat_res = await client.post(
+        "/expenses/categories",
+        json={"name": "Snapshot Cat", "type": "expense"},
+        headers=auth_headers
+    )
+    await client.post(
+        "/expenses/",
+        json={"amount": 25.0, "category_id": cat_res.json()["id"], "date": "2020-03-01T12:00:00"},
+        headers=auth_headers
+    )
+
+    db_session.expunge_all()
+    assert await db_session.get(PeriodSnapshot, (USER_ID, "analytics", 2020, 0)) is None
+    assert await db_session.get(PeriodSnapshot, (USER_ID, "analytics", 2019, 0)) is not None
@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import get_current_user
+from app.models.user import User
+import uuid
+from app.main import app
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient, db_session):
+    # Load the seeded user so data_version bumps are visible to later requests
+    async def get_seeded_user():
+        return await db_session.get(User, uuid.UUID("123e4567-e89b-12d3-a456-426614174000"))
+
+    app.dependency_overrides[get_current_user] = get_seeded_user
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes_since_token(client: AsyncClient, auth_headers):
+    cat_res = await client.post(
+        "/expenses/categories",
+        json={"name": "Sync Cat", "type": "expense"},
+        headers=auth_headers
+    )
+    category_id = cat_res.json()["id"]
+    await client.post(
+        "/expenses/",
+        json={"amount": 12.5, "category_id": category_id, "date": "2024-05-01T08:00:00"},
+        headers=auth_headers
+    )
+    income_res = await client.post(
+        "/incomes/",
+        json={"amount": 100.0, "source": "Gift", "date": "2024-05-02T08:00:00"},
+        headers=auth_headers
+    )
+
+    initial = (await client.get("/sync", headers=auth_headers)).json()
+    assert initial["has_more"] is False
+    assert len(initial["categories"]) == 1
+    assert len(initial["expenses"]) == 1
+    assert len(initial["incomes"]) == 1
+
+    await client.delete(f"/incomes/{income_res.json()['id']}", headers=auth_headers)
+
+    delta = (await client.get(f"/sync?since={initial['token']}", headers=auth_headers)).json()
+    assert int(delta["token"]) == int(initial["token"]) + 1
+    assert delta["expenses"] == [] and delta["categories"] == [] and delta["incomes"] == []
+    assert delta["deleted"] == [
+        {"entity": "income", "id": income_res.json()["id"], "change_seq": int(delta["token"])}
+    ]
+
+@pytest.mark.asyncio
+async def test_sync_pages_by_change_sequence(client: AsyncClient, auth_headers):
+    for name in ["A", "B", "C"]:
+        await client.post("/expenses/categories", json={"name": name, "type": "expense"}, headers=auth_headers)
+
+    first = (await client.get("/sync?since=0&limit=2", headers=auth_headers)).json()
+    assert first["has_more"] is True
+    assert [c["name"] for c in first["categories"]] == ["A", "B"]
+
+    second = (await client.get(f"/sync?since={first['token']}&limit=2", headers=auth_headers)).json()
+    assert second["has_more"] is False
+    assert [c["name"] for c in second["categories"]] == ["C"]
+
+@pytest.mark.asyncio
+async def test_sync_pages_through_rows_of_a_single_write(client: AsyncClient, auth_headers):
+    categories = []
+    for name in ["From", "To"]:
+        res = await client.post("/expenses/categories", json={"name": name, "type": "expense"}, headers=auth_headers)
+        categories.append(res.json()["id"])
+    ids = []
+    for day in range(1, 4):
+        res = await client.post("/expenses/", json={
+            "amount": 5, "category_id": categories[0], "date": f"2024-05-0{day}T08:00:00"
+        }, headers=auth_headers)
+        ids.append(res.json()["id"])
+    token = (await client.get("/sync", headers=auth_headers)).json()["token"]
+
+    # One write stamps all three rows with the same change_seq
+    await client.post("/expenses/bulk/recategorize", json={"ids": ids, "target_category_id": categories[1]},
+                      headers=auth_headers)
+
+    first = (await client.get(f"/sync?since={token}&limit=2", headers=auth_headers)).json()
+    assert first["has_more"] is True
+    assert len(first["expenses"]) == 2
+    second = (await client.get(f"/sync?since={first['token']}&limit=2", headers=auth_headers)).json()
+    assert second["has_more"] is False
+    assert second["token"] == str(int(token) + 1)
+    assert sorted(e["id"] for e in first["expenses"] + second["expenses"]) == sorted(ids)
+
+@pytest.mark.asyncio
+async def test_sync_rejects_a_malformed_token(client: AsyncClient, auth_headers):
+    response = await client.get("/sync?since=1.x", headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from decimal import Decimal
+
+from app.core.security import get_current_user
+from app.db.session import get_session_factory
+from app.models.user import User
+import uuid
+from app.main import app
+from conftest import TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def auth_headers(client: AsyncClient):
+    mock_user = User(
+        id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        email="test@example.com",
+        full_name="Test User"
+    )
+    async def mock_get_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = mock_get_user
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    yield {"Authorization": "Bearer mock_token"}
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_session_factory]
+
+async def seed_timeline(client, headers):
+    cat_res = await client.post(
+        "/expenses/categories",
+        json={"name": "Timeline Cat", "type": "expense"},
+        headers=headers
+    )
+    category_id = cat_res.json()["id"]
+    await client.post("/incomes/", json={"amount": 1000.0, "source": "Salary", "date": "2024-06-01T09:00:00"}, headers=headers)
+    await client.post("/expenses/", json={"amount": 200.0, "category_id": category_id, "date": "2024-06-02T09:00:00"}, headers=headers)
+    await client.post("/expenses/", json={"amount": 50.0, "category_id": category_id, "date": "2024-06-03T09:00:00"}, headers=headers)
+
+@pytest.mark.asyncio
+async def test_timeline_merges_and_pages(client: AsyncClient, auth_headers):
+    await seed_timeline(client, auth_headers)
+
+    first = (await client.get("/transactions/?limit=2&with_balance=true", headers=auth_headers)).json()
+    assert [t["type"] for t in first["data"]] == ["expense", "expense"]
+    assert [Decimal(t["running_balance"]) for t in first["data"]] == [Decimal("750"), Decimal("800")]
+    assert first["next_cursor"]
+
+    second = (await client.get(f"/transactions/?limit=2&cursor={first['next_cursor']}", headers=auth_headers)).json()
+    assert [t["type"] for t in second["data"]] == ["income"]
+    assert second["next_cursor"] is None
+
+@pytest.mark.asyncio
+async def test_timeline_export_is_merged_newest_first(client: AsyncClient, auth_headers):
+    await seed_timeline(client, auth_headers)
+
+    response = await client.get("/transactions/export", headers=auth_headers)
+    assert response.status_code == 200
+    lines = response.text.strip().splitlines()
+    assert [line.split(",")[:2] for line in lines[1:]] == [
+        ["2024-06-03", "expense"], ["2024-06-02", "expense"], ["2024-06-01", "income"]
+    ]
@@ -0,0 +1,77 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event
+
+from app.db.writes import insert_returning, update_owned, delete_owned
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.user import User
+import uuid
+from conftest import engine
+
+USER_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+@contextmanager
+def statements():
+    seen = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement.split()[0].upper())
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+async def add_expense(db):
+    category = await insert_returning(db, Category, {"name": "Food", "type": "expense", "user_id": USER_ID})
+    return await insert_returning(db, Expense, {
+        "user_id": USER_ID, "amount": Decimal("12.50"), "category_id": category.id, "date": datetime(2024, 3, 1)
+    })
+
+@pytest.mark.asyncio
+async def test_insert_returns_server_defaults_in_one_statement(db_session):
+    category = await insert_returning(db_session, Category, {"name": "Food", "type": "expense", "user_id": USER_ID})
+    with statements() as seen:
+        expense = await insert_returning(db_session, Expense, {
+            "user_id": USER_ID, "amount": Decimal("12.50"), "category_id": category.id, "date": datetime(2024, 3, 1)
+        })
+
+    assert seen == ["INSERT"]
+    assert expense.id is not None
+    assert expense.created_at is not None
+    assert expense.is_deleted is False
+
+@pytest.mark.asyncio
+async def test_update_owned_is_one_statement(db_session):
+    expense = await add_expense(db_session)
+    with statements() as seen:
+        updated = await update_owned(db_session, Expense, expense.id, USER_ID, {"is_deleted": True, "change_seq": 7})
+
+    assert seen == ["UPDATE"]
+    assert updated.is_deleted is True
+    assert updated.change_seq == 7
+    assert updated.amount == Decimal("12.50")
+
+@pytest.mark.asyncio
+async def test_other_users_rows_are_not_touched(db_session):
+    expense = await add_expense(db_session)
+    other = await insert_returning(db_session, User, {"email": "other@example.com"})
+
+    assert await update_owned(db_session, Expense, expense.id, other.id, {"is_deleted": True}) is None
+    assert await delete_owned(db_session, Expense, expense.id, other.id) is None
+    assert await update_owned(db_session, Expense, uuid.uuid4(), USER_ID, {"is_deleted": True}) is None
+
+    await db_session.refresh(expense)
+    assert expense.is_deleted is False
+
+@pytest.mark.asyncio
+async def test_delete_owned_returns_the_deleted_row(db_session):
+    expense = await add_expense(db_session)
+    with statements() as seen:
+        deleted = await delete_owned(db_session, Expense, expense.id, USER_ID)
+
+    assert seen == ["DELETE"]
+    assert deleted.date.year == 2024
+    assert await delete_owned(db_session, Expense, expense.id, USER_ID) is None
@@ -138,6 +138,7 @@ export function BudgetContent() {
             setSelectedCategoryId('global');
             setEditingId(null);
             queryClient.invalidateQueries({ queryKey: ['budgetsList'] });
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
         },
@@ -152,6 +153,7 @@ export function BudgetContent() {
             toast.success(t.budget.budgetDeleted);
             setDeletingId(null);
             queryClient.invalidateQueries({ queryKey: ['budgetsList'] });
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
         },
@@ -185,6 +187,7 @@ export function BudgetContent() {
         onSuccess: (count, variables) => {
             toast.success(`${t.budget.copiedFrom.replace('{count}', String(count))} ${monthName(variables.prevM, variables.prevY)}`);
             queryClient.invalidateQueries({ queryKey: ['budgetsList'] });
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
         },
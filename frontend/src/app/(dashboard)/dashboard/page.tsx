@@ -82,36 +82,19 @@ export default function DashboardPage() {
     const months = Array.from({ length: 12 }, (_, i) => i + 1);
 
     // ─── Queries ─────────────────────────────────────────────────────────────
-    const { data: summaryRes, isLoading: isLoadingSummary } = useQuery({
-        queryKey: ['dashboardSummary', selectedMonth, selectedYear],
-        queryFn: () => expenseApi.getMonthlySummary({ month: selectedMonth, year: selectedYear })
+    // Summary, recent expenses, categories and budget progress in one request
+    const { data: dashboardRes, isLoading: loading } = useQuery({
+        queryKey: ['dashboard', selectedMonth, selectedYear],
+        queryFn: () => expenseApi.getDashboard({ month: selectedMonth, year: selectedYear, recent_limit: 5 })
     });
 
-    const { data: txRes, isLoading: isLoadingTx } = useQuery({
-        queryKey: ['recentExpenses'],
-        queryFn: () => expenseApi.getExpenses({ limit: 5, sort: 'date_desc' })
-    });
-
-    const { data: catsRes, isLoading: isLoadingCats } = useQuery({
-        queryKey: ['categories', 'expense'],
-        queryFn: () => expenseApi.getCategories({ type: 'expense' })
-    });
-
-    const { data: budgetRes, isLoading: isLoadingBudget } = useQuery({
-        queryKey: ['budgetProgress', selectedMonth, selectedYear],
-        queryFn: () => expenseApi.getBudgetProgress({ month: selectedMonth, year: selectedYear }),
-        retry: false
-    });
-
-    const loading = isLoadingSummary || isLoadingTx || isLoadingCats || isLoadingBudget;
-
-    const summary = summaryRes?.data || null;
-    const recentTransactions = txRes?.data?.data || [];
-    const categories = catsRes?.data || [];
+    const summary: DashboardSummary | null = dashboardRes?.data?.summary || null;
+    const recentTransactions: Expense[] = dashboardRes?.data?.recent_expenses || [];
+    const categories: Category[] = dashboardRes?.data?.categories || [];
 
     let budgetInfo = null;
-    if (budgetRes?.data) {
-        const global = (budgetRes.data as any[]).find(
+    if (dashboardRes?.data?.budgets) {
+        const global = (dashboardRes.data.budgets as any[]).find(
             (b: any) => b.category_id === null || b.category_name === 'Global'
         );
         if (global) budgetInfo = { budget: global.budget, spent: global.spent, percent_used: global.percent_used };
@@ -145,6 +128,7 @@ export default function DashboardPage() {
             setQuickCategoryId('');
             setQuickDesc('');
             // Invalidate queries so the UI immediately refreshes
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['recentExpenses'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
@@ -117,6 +117,7 @@ export default function ExpensesContent() {
             setIsDialogOpen(false);
             setEditingExpense(null);
             queryClient.invalidateQueries({ queryKey: ['expensesList'] });
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
             queryClient.invalidateQueries({ queryKey: ['recentExpenses'] });
@@ -133,6 +134,7 @@ export default function ExpensesContent() {
             setIsDeleteDialogOpen(false);
             setExpenseToDelete(null);
             queryClient.invalidateQueries({ queryKey: ['expensesList'] });
+            queryClient.invalidateQueries({ queryKey: ['dashboard'] });
             queryClient.invalidateQueries({ queryKey: ['dashboardSummary'] });
             queryClient.invalidateQueries({ queryKey: ['budgetProgress'] });
             queryClient.invalidateQueries({ queryKey: ['recentExpenses'] });
@@ -173,6 +173,7 @@ export const expenseApi = {
   deleteBudget: (id: number) => api.delete(`/budgets/${id}`),
   getBudgetProgress: (params?: any) => api.get('/budgets/progress', { params }),
   getAnalytics: (params?: { year?: number }) => api.get('/expenses/analytics', { params }),
+  getDashboard: (params?: { month?: number; year?: number; recent_limit?: number }) => api.get('/dashboard', { params }),
 };
 
 export const authApi = {